@@ -0,0 +1,6 @@
+"""
+Coffee benchmarks
+
+Synthetic plugin repositories and a runner that times the CLI and the TUI
+against them. See ``python -m benchmarks.run --help``.
+"""
@@ -0,0 +1,83 @@
+"""
+Time TUI frames off-screen; prints JSON with the seconds per frame.
+
+Runs in its own process so the plugin paths pick up the benchmark's HOME.
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+
+from core import PluginRemover, PluginUpdater
+from ui.constants import PLUGINS_DIR, TABS
+from ui.state import AppState
+from ui.tabs.base import Tab
+from ui.tabs.home import HomeTab
+from ui.tabs.install import InstallTab
+from ui.tabs.remove import RemoveTab
+from ui.tabs.update import UpdateTab
+
+
+def visible_items(tab: Any, app_state: AppState) -> List[Dict[str, Any]]:
+    if isinstance(tab, HomeTab):
+        return tab.get_display_list(app_state)
+    return tab.get_visible_list(app_state)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=20, help="Frames per tab")
+    args = parser.parse_args()
+
+    updater = PluginUpdater(PLUGINS_DIR)
+    remover = PluginRemover(PLUGINS_DIR)
+    app_state = AppState(updater, remover)
+    tabs: Dict[str, Any] = {
+        "Home": HomeTab(),
+        "Install": InstallTab(),
+        "Update": UpdateTab(),
+        "Remove": RemoveTab(),
+    }
+    app_state.update_data = updater.check_for_updates()
+    app_state.remove_data = remover.get_installed_plugins()
+    app_state.install_data = tabs["Install"]._get_installable_plugins(app_state)
+
+    console = Console(file=io.StringIO(), width=160, height=48, force_terminal=True)
+    base = Tab("base")
+    cold = 0.0
+    warm: List[float] = []
+    for name in TABS:
+        tab = tabs[name]
+        app_state.current_tab = name
+        layout = base.build_layout(name)
+        for frame in range(args.frames):
+            start = time.perf_counter()
+            items = visible_items(tab, app_state)
+            # Move the cursor down one row per frame, like holding `j`
+            app_state.set_selection(name, frame, len(items))
+            layout["body"].update(tab.build_panel(app_state))
+            console.print(layout)
+            elapsed = time.perf_counter() - start
+            if frame == 0:
+                cold += elapsed
+            else:
+                warm.append(elapsed)
+
+    json.dump(
+        {"render_cold": cold, "render": statistics.median(warm) if warm else 0.0},
+        sys.stdout,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
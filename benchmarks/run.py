@@ -0,0 +1,266 @@
+"""
+Time coffee against synthetic local plugin repositories.
+
+For every plugin count, the runner generates bare repositories, points
+coffee at them through ``COFFEE_GIT_BASE_URL=file://...`` inside a
+throwaway HOME, and times install, update, upgrade, list, info, remove,
+--source-plugins and TUI rendering. Results are written as JSON; with
+--baseline, the run fails when an operation got slower than the threshold.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import (
+    advance_remotes,
+    create_remotes,
+    plugin_names,
+    write_configs,
+)
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COFFEE: List[str] = [sys.executable, os.path.join(ROOT, "bin", "coffee")]
+DEFAULT_SCALES: str = "10,100,1000"
+DEFAULT_THRESHOLD: float = 0.25
+# Differences below this many seconds are noise, whatever the ratio
+MIN_REGRESSION: float = 0.05
+RESULTS_VERSION: int = 1
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class Sandbox:
+    """A HOME, remotes directory and tmux server of its own for one scale."""
+
+    def __init__(self, work_dir: str) -> None:
+        self.home = os.path.join(work_dir, "home")
+        self.remotes = os.path.join(work_dir, "remotes")
+        self.config_dir = os.path.join(
+            self.home, ".config", "tmux", "coffee", "plugins"
+        )
+        os.makedirs(self.home)
+        os.makedirs(self.remotes)
+        self.env = dict(os.environ)
+        for key in ("TMUX", "TMUX_PANE", "COFFEE_OBJECT_STORE"):
+            self.env.pop(key, None)
+        self.env.update(
+            {
+                "HOME": self.home,
+                "COFFEE_GIT_BASE_URL": f"file://{self.remotes}",
+                "TMUX_TMPDIR": work_dir,
+                "GIT_CONFIG_NOSYSTEM": "1",
+            }
+        )
+        self.tmux = shutil.which("tmux") is not None
+
+    def run(self, args: List[str], check: bool = True) -> str:
+        result = subprocess.run(
+            args,
+            cwd=ROOT,
+            env=self.env,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+        )
+        if check and result.returncode != 0:
+            raise BenchmarkError(
+                f"{' '.join(args[1:])} exited with {result.returncode}: "
+                f"{(result.stderr or result.stdout).strip()[-500:]}"
+            )
+        return result.stdout
+
+    def coffee(self, *args: str) -> str:
+        return self.run(COFFEE + list(args))
+
+    def start_tmux(self) -> None:
+        if self.tmux:
+            self.run(["tmux", "new-session", "-d", "-s", "bench"])
+
+    def stop_tmux(self) -> None:
+        if self.tmux:
+            self.run(["tmux", "kill-server"], check=False)
+
+
+def timed(fn: Callable[[], Any], repeat: int = 1) -> float:
+    """Median wall time of ``repeat`` calls, in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_scale(count: int, args: argparse.Namespace) -> Dict[str, float]:
+    work_dir = tempfile.mkdtemp(prefix=f"coffee-bench-{count}-")
+    sandbox = Sandbox(work_dir)
+    results: Dict[str, float] = {}
+    repeat = args.repeat
+    names = plugin_names(count)
+
+    def step(name: str, fn: Callable[[], Any], times: int = 1) -> None:
+        results[name] = timed(fn, times)
+        print(f"  {name:<16} {results[name]:8.3f}s", flush=True)
+
+    try:
+        print(f"{count} plugins", flush=True)
+        step(
+            "setup",
+            lambda: create_remotes(
+                sandbox.remotes, count, args.depth, args.tags, args.file_size
+            ),
+        )
+        write_configs(sandbox.config_dir, names)
+        sandbox.start_tmux()
+
+        step("install", lambda: sandbox.coffee("-q", "install"))
+        step("list", lambda: sandbox.coffee("list"), repeat)
+        step("info", lambda: sandbox.coffee("info", names[0]), repeat)
+        if sandbox.tmux:
+            step("source_plugins", lambda: sandbox.coffee("--source-plugins"), repeat)
+
+        advance_remotes(sandbox.remotes, names, 0)
+        step("update", lambda: sandbox.coffee("-q", "update"), repeat)
+        render = json.loads(sandbox.run([sys.executable, "-m", "benchmarks.render"]))
+        for key, seconds in render.items():
+            results[key] = seconds
+            print(f"  {key:<16} {seconds:8.3f}s", flush=True)
+        step("upgrade", lambda: sandbox.coffee("-q", "upgrade", "--all"))
+        step("remove", lambda: sandbox.coffee("-q", "remove", names[0], "--force"))
+    finally:
+        sandbox.stop_tmux()
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        else:
+            print(f"  kept {work_dir}")
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Describe every operation that got slower than the baseline allows."""
+    regressions = []
+    for scale, timings in results.items():
+        for name, seconds in timings.items():
+            before = baseline.get(scale, {}).get(name)
+            if before is None or name == "setup":
+                continue
+            if seconds > before * (1 + threshold) and seconds - before > MIN_REGRESSION:
+                regressions.append(
+                    f"{name} at {scale} plugins: {before:.3f}s → {seconds:.3f}s "
+                    f"(+{(seconds / before - 1) * 100 if before else 0:.0f}%)"
+                )
+    return regressions
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--plugins",
+        default=DEFAULT_SCALES,
+        help=f"Comma-separated plugin counts (default: {DEFAULT_SCALES})",
+    )
+    parser.add_argument(
+        "--depth", type=int, default=20, help="Commits per repository (default: 20)"
+    )
+    parser.add_argument(
+        "--tags", type=int, default=5, help="Tags per repository (default: 5)"
+    )
+    parser.add_argument(
+        "--file-size",
+        type=int,
+        default=4096,
+        help="Bytes in each repository's data file (default: 4096)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs of each read-only operation; the median is kept (default: 3)",
+    )
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown over the baseline (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the generated directories"
+    )
+    args = parser.parse_args()
+
+    scales = [int(count) for count in args.plugins.split(",") if count.strip()]
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for count in scales:
+            results[str(count)] = bench_scale(count, args)
+    except BenchmarkError as e:
+        print(f"Benchmark failed: {e}", file=sys.stderr)
+        return 2
+
+    report = {
+        "version": RESULTS_VERSION,
+        "commit": git_commit(),
+        "created": datetime.datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "params": {
+            "depth": args.depth,
+            "tags": args.tags,
+            "file_size": args.file_size,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if baseline.get("params") != report["params"]:
+            print("Warning: the baseline was run with different parameters")
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import os
+import random
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+# Config URLs are "<OWNER>/<name>", served from "<remotes>/<OWNER>/<name>"
+OWNER: str = "bench"
+SCRIPT_MODE: str = "100755"
+FILE_MODE: str = "100644"
+# Fixed dates keep the generated hashes identical from run to run
+EPOCH: int = 1_600_000_000
+# Releases added by advance_remote are dated after any generated history
+RELEASE_EPOCH: int = EPOCH + 100_000_000
+
+
+def plugin_names(count: int) -> List[str]:
+    return [f"plugin-{i:04d}" for i in range(count)]
+
+
+def _data(payload: bytes) -> bytes:
+    return b"data %d\n" % len(payload) + payload + b"\n"
+
+
+def _script(name: str) -> bytes:
+    return f"#!/bin/sh\ntmux set-option -gq @{name} loaded\n".encode()
+
+
+def _commit(
+    mark: int, when: int, message: str, files: List[bytes], parent: bool
+) -> bytes:
+    stream = [
+        b"commit refs/heads/main\n",
+        b"mark :%d\n" % mark,
+        b"committer Bench <bench@example.com> %d +0000\n" % when,
+        _data(message.encode()),
+    ]
+    if parent:
+        stream.append(b"from refs/heads/main^0\n")
+    return b"".join(stream + files)
+
+
+def _inline(mode: str, path: str, payload: bytes) -> bytes:
+    return f"M {mode} inline {path}\n".encode() + _data(payload)
+
+
+def _fast_import(repo: str, stream: bytes) -> None:
+    subprocess.run(
+        ["git", "fast-import", "--quiet", "--force"],
+        cwd=repo,
+        input=stream + b"done\n",
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def create_remote(
+    remotes_dir: str, name: str, depth: int, tags: int, file_size: int
+) -> None:
+    """
+    Create a bare plugin repository with ``depth`` commits and ``tags`` tags
+    (at most one per commit).
+
+    Every commit rewrites a slice of a ``file_size`` byte data file, the way
+    real plugins change a little at a time. Tags ``v1.0.0`` .. are spread
+    evenly over the history, with the newest on the tip.
+    """
+    repo = os.path.join(remotes_dir, OWNER, name)
+    os.makedirs(repo, exist_ok=True)
+    subprocess.run(["git", "init", "-q", "--bare", repo], check=True)
+    subprocess.run(
+        ["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=repo, check=True
+    )
+
+    rng = random.Random(name)
+    data = bytearray(rng.getrandbits(8 * file_size).to_bytes(file_size, "little"))
+    tags = min(tags, depth)
+    tag_at = {(t + 1) * depth // tags - 1: t for t in range(tags)}
+    stream: List[bytes] = [b"feature done\n"]
+    chunk = min(64, file_size)
+    for index in range(depth):
+        start = rng.randrange(file_size - chunk + 1)
+        data[start : start + chunk] = rng.getrandbits(8 * chunk).to_bytes(
+            chunk, "little"
+        )
+        files = [_inline(FILE_MODE, "data.bin", bytes(data))]
+        if index == 0:
+            files.append(_inline(SCRIPT_MODE, f"{name}.tmux", _script(name)))
+        stream.append(
+            _commit(
+                index + 1,
+                EPOCH + index * 3600,
+                f"{name}: change {index}",
+                files,
+                parent=False,
+            )
+        )
+        if index in tag_at:
+            stream.append(
+                f"reset refs/tags/v1.{tag_at[index]}.0\nfrom :{index + 1}\n".encode()
+            )
+    _fast_import(repo, b"".join(stream))
+
+
+def advance_remote(remotes_dir: str, name: str, generation: int) -> None:
+    """Add one commit and a newer tag (``v2.<generation>.0``) to a remote."""
+    repo = os.path.join(remotes_dir, OWNER, name)
+    payload = f"{name} release {generation}\n".encode()
+    stream = [
+        b"feature done\n",
+        _commit(
+            1,
+            RELEASE_EPOCH + generation * 3600,
+            f"{name}: release {generation}",
+            [_inline(FILE_MODE, "CHANGES", payload)],
+            parent=True,
+        ),
+        f"reset refs/tags/v2.{generation}.0\nfrom :1\n".encode(),
+    ]
+    _fast_import(repo, b"".join(stream))
+
+
+def create_remotes(
+    remotes_dir: str,
+    count: int,
+    depth: int,
+    tags: int,
+    file_size: int,
+    jobs: int = 8,
+) -> List[str]:
+    names = plugin_names(count)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(
+            executor.map(
+                lambda name: create_remote(remotes_dir, name, depth, tags, file_size),
+                names,
+            )
+        )
+    return names
+
+
+def advance_remotes(
+    remotes_dir: str, names: List[str], generation: int, jobs: int = 8
+) -> None:
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(
+            executor.map(
+                lambda name: advance_remote(remotes_dir, name, generation), names
+            )
+        )
+
+
+def write_configs(config_dir: str, names: List[str]) -> None:
+    os.makedirs(config_dir, exist_ok=True)
+    for name in names:
+        with open(os.path.join(config_dir, f"{name}.yaml"), "w") as f:
+            f.write(
+                f'name: "{name}"\n'
+                f'url: "{OWNER}/{name}"\n'
+                f'source: ["{name}.tmux"]\n'
+                "env:\n"
+                f'  BENCH_{name.replace("-", "_").upper()}: "1"\n'
+            )
@@ -0,0 +1,79 @@
+"""
+Bundle command implementation
+"""
+
+import os
+from typing import List
+
+from core import PluginBundler
+from core.pluginBundler import FAILED, IMPORTED, SKIPPED
+
+from ..utils import (
+    ACCENT_COLOR,
+    COFFEE_PLUGINS_DIR,
+    console,
+    print_error,
+    print_info,
+    print_success,
+)
+
+
+class Args:
+    bundle_command: str
+    file: str
+    plugins: List[str]
+    git_bundles: bool
+    force: bool
+    jobs: int
+    quiet: bool
+
+
+def run(args: Args) -> int:
+    """Run bundle command"""
+    try:
+        bundler = PluginBundler(COFFEE_PLUGINS_DIR, args.jobs)
+        archive_path = os.path.abspath(os.path.expanduser(args.file))
+
+        if args.bundle_command == "export":
+            if not args.quiet:
+                print_info(f"Packing plugins into {archive_path}...")
+            exported = bundler.export_bundle(
+                archive_path, args.plugins or None, args.git_bundles
+            )
+            if not exported:
+                print_error("No installed plugins to export")
+                os.remove(archive_path)
+                return 1
+            if not args.quiet:
+                size_mb = os.path.getsize(archive_path) / (1024 * 1024)
+                print_success(
+                    f"Exported {len(exported)} plugin(s) ({size_mb:.1f} MB) to {archive_path}"
+                )
+            return 0
+
+        if not os.path.exists(archive_path):
+            print_error(f"Bundle '{archive_path}' not found")
+            return 1
+
+        if not args.quiet:
+            print_info(f"Unpacking {archive_path}...")
+        results = bundler.import_bundle(archive_path, args.force)
+
+        for name, status in results.items():
+            if status == FAILED:
+                print_error(f"Failed to import {name}")
+            elif status == SKIPPED and not args.quiet:
+                console.print(
+                    f"[bold {ACCENT_COLOR}]SKIP[/] {name} (already installed, use --force)"
+                )
+
+        if FAILED in results.values():
+            return 1
+        if not args.quiet:
+            imported = list(results.values()).count(IMPORTED)
+            print_success(f"Imported {imported} plugin(s)")
+        return 0
+
+    except Exception as e:
+        print_error(f"Bundle {args.bundle_command} failed: {e}")
+        return 1
@@ -0,0 +1,47 @@
+"""
+Compile command implementation
+"""
+
+from core import ConfigValidationError, PluginLoader
+
+from ..utils import COFFEE_CONFIG_DIR, print_error, print_info, print_success
+
+
+class Args:
+    remove: bool
+    quiet: bool
+
+
+def run(args: Args) -> int:
+    """Run compile command"""
+    try:
+        plugin_loader = PluginLoader(COFFEE_CONFIG_DIR)
+
+        if args.remove:
+            if plugin_loader.remove_snapshot():
+                if not args.quiet:
+                    print_success("Removed compiled config snapshot")
+            elif not args.quiet:
+                print_info("No compiled config snapshot to remove")
+            return 0
+
+        # Always compile from the YAML sources, never from an older snapshot
+        count = plugin_loader.compile_snapshot()
+        if not args.quiet:
+            print_success(
+                f"Compiled {count} plugin(s) into {plugin_loader.snapshot_path}"
+            )
+            print_info(
+                "Coffee now loads this snapshot instead of the YAML files "
+                "until one of them changes. Re-run 'coffee compile' after editing."
+            )
+        return 0
+
+    except ConfigValidationError as e:
+        for error in e.errors:
+            print_error(str(error))
+        return 1
+
+    except Exception as e:
+        print_error(f"Compile failed: {e}")
+        return 1
@@ -0,0 +1,91 @@
+"""
+Doctor command implementation
+"""
+
+import json
+import os
+
+from rich.table import Table
+
+from core import PluginDoctor, PluginLoader
+from core.pluginDoctor import NOT_CONFIGURED, NOT_INSTALLED
+
+from ..utils import (
+    ACCENT_COLOR,
+    COFFEE_CONFIG_DIR,
+    COFFEE_PLUGINS_DIR,
+    ERROR_COLOR,
+    SECTION_COLOR,
+    console,
+    print_error,
+    print_success,
+    print_warning,
+)
+
+
+class Args:
+    fix: bool
+    json: bool
+    jobs: int
+    quiet: bool
+
+
+def run(args: Args) -> int:
+    """Run doctor command"""
+    try:
+        plugin_loader = PluginLoader(COFFEE_CONFIG_DIR)
+        plugins = (
+            [config.to_dict() for config in plugin_loader.load_configs()]
+            if os.path.exists(COFFEE_CONFIG_DIR)
+            else None
+        )
+        doctor = PluginDoctor(
+            COFFEE_PLUGINS_DIR, plugins, plugin_loader.errors, args.jobs
+        )
+        issues = doctor.diagnose()
+        fixed = 0
+        if args.fix and issues:
+            remaining = doctor.fix(issues)
+            fixed = len(issues) - len(remaining)
+            # Fixes can resolve more than their own issue, so look again
+            issues = doctor.diagnose()
+
+        if args.json:
+            print(
+                json.dumps(
+                    {"fixed": fixed, "issues": [issue.to_dict() for issue in issues]},
+                    indent=2,
+                )
+            )
+            return 1 if issues else 0
+
+        if fixed and not args.quiet:
+            print_success(f"Fixed {fixed} issue(s)")
+
+        if not issues:
+            if not args.quiet:
+                print_success("No problems found")
+            return 0
+
+        table = Table(border_style=ACCENT_COLOR)
+        table.add_column("Problem", style=f"bold {ERROR_COLOR}")
+        table.add_column("Plugin", style="bold white")
+        table.add_column("Details", style="white")
+        table.add_column("Fix", style=SECTION_COLOR)
+        for issue in issues:
+            if issue.fix:
+                fix = issue.fix
+            elif issue.kind in (NOT_INSTALLED, NOT_CONFIGURED):
+                fix = "run coffee sync"
+            else:
+                fix = "edit the config"
+            table.add_row(issue.kind, issue.name, issue.message, fix)
+        console.print(table)
+
+        if not args.fix and any(issue.fix for issue in issues):
+            print_warning("Run 'coffee doctor --fix' to repair the fixable problems")
+        return 1
+
+    except Exception as e:
+        print_error(f"Doctor failed: {e}")
+        return 1
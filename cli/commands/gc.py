@@ -0,0 +1,71 @@
+"""
+Gc command implementation
+"""
+
+from typing import List
+
+from rich.table import Table
+
+from core import PluginCompactor
+from core.pluginCompactor import gc_due
+
+from ..utils import (
+    ACCENT_COLOR,
+    COFFEE_PLUGINS_DIR,
+    HIGHLIGHT_COLOR,
+    SECTION_COLOR,
+    console,
+    format_size,
+    print_error,
+    print_info,
+    print_success,
+)
+
+
+class Args:
+    plugins: List[str]
+    shallow: bool
+    auto: bool
+    jobs: int
+    quiet: bool
+
+
+def run(args: Args) -> int:
+    """Run gc command"""
+    try:
+        if args.auto and not gc_due():
+            return 0
+
+        compactor = PluginCompactor(COFFEE_PLUGINS_DIR, args.jobs)
+        if not args.quiet:
+            print_info("Compacting plugin repositories...")
+        results = compactor.compact_plugins(args.plugins or None, args.shallow)
+
+        failed = [result for result in results if not result.ok]
+        for result in failed:
+            print_error(f"Failed to compact {result.name}")
+
+        if not args.quiet and results:
+            table = Table(border_style=ACCENT_COLOR)
+            table.add_column("Name", style="bold white")
+            table.add_column("Before", style=SECTION_COLOR, justify="right")
+            table.add_column("After", style=SECTION_COLOR, justify="right")
+            table.add_column("Reclaimed", style=HIGHLIGHT_COLOR, justify="right")
+            for result in results:
+                table.add_row(
+                    result.name,
+                    format_size(result.before),
+                    format_size(result.after),
+                    format_size(result.reclaimed),
+                )
+            console.print(table)
+            total = sum(result.reclaimed for result in results)
+            print_success(f"Reclaimed {format_size(total)}")
+        elif not args.quiet:
+            print_info("No installed plugins to compact")
+
+        return 1 if failed else 0
+
+    except Exception as e:
+        print_error(f"Gc failed: {e}")
+        return 1
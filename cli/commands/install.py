@@ -3,11 +3,11 @@ Install command implementation
 """
 
 import os
-from typing import Any, Callable, Optional
+from typing import Any, Optional
 
 from rich.progress import TaskID
 
-from core import PluginInstaller, PluginLoader
+from core import ConfigValidationError, PluginInstaller, PluginLoader
 
 from ..utils import (
     ACCENT_COLOR,
@@ -16,6 +16,7 @@ from ..utils import (
     HIGHLIGHT_COLOR,
     console,
     create_progress,
+    create_progress_bus,
     print_error,
     print_info,
     print_success,
@@ -33,7 +34,13 @@ def run(args: Args) -> int:
     try:
         # Load plugin configurations
         plugin_loader = PluginLoader(COFFEE_CONFIG_DIR)
-        plugins: list[dict[str, Any]] = plugin_loader.load_plugins()
+        try:
+            plugins: list[dict[str, Any]] = plugin_loader.load_plugins(strict=True)
+        except ConfigValidationError as e:
+            # Report every config problem before touching the network
+            for error in e.errors:
+                print_error(str(error))
+            return 1
 
         if not plugins:
             if not args.quiet:
@@ -91,14 +98,16 @@ def run(args: Args) -> int:
         else:
             # Normal mode with progress bars
             with create_progress() as progress:
+                task_ids: dict[str, TaskID] = {}
+                progress_bus = create_progress_bus(progress, task_ids)
                 for plugin in plugins_to_install:
-                    task_id: TaskID = progress.add_task(
-                        f"Installing {plugin['name']}", total=100
+                    plugin_name = plugin["name"]
+                    task_ids[plugin_name] = progress.add_task(
+                        f"Installing {plugin_name}", total=100
                     )
 
-                    # Fixed callback - only expects percent argument
-                    def callback(percent: int, task_id: TaskID = task_id) -> None:
-                        progress.update(task_id, completed=percent)
+                    def callback(percent: int, plugin_name: str = plugin_name) -> None:
+                        progress_bus.publish(plugin_name, percent)
 
                     success, used_tag = installer._install_git_plugin_with_progress(
                         plugin, callback
@@ -106,14 +115,16 @@ def run(args: Args) -> int:
 
                     if success:
                         installer._update_lock_file(plugin, used_tag)
-                        progress.update(task_id, completed=100)
+                        progress_bus.publish(plugin_name, 100)
+                        progress_bus.flush()
                         console.print(
-                            f"[bold {HIGHLIGHT_COLOR}]SUCCESS[/] Installed {plugin['name']} @ [bold white]{used_tag or 'latest'}[/]"
+                            f"[bold {HIGHLIGHT_COLOR}]SUCCESS[/] Installed {plugin_name} @ [bold white]{used_tag or 'latest'}[/]"
                         )
 
                     else:
-                        progress.update(task_id, completed=0)
-                        print_error(f"Failed to install {plugin['name']}")
+                        progress_bus.publish(plugin_name, 0)
+                        progress_bus.flush()
+                        print_error(f"Failed to install {plugin_name}")
 
         if not args.quiet:
             console.print(f"[bold {HIGHLIGHT_COLOR}]SUCCESS[/] Installation complete!")
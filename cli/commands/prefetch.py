@@ -0,0 +1,80 @@
+"""
+Prefetch command implementation
+"""
+
+import fcntl
+import os
+import time
+from typing import List
+
+from core import PluginPrefetcher
+from core import lock_file_manager as lfm
+from core.pluginPrefetcher import FAILED, FETCHED, prefetch_due, tmux_idle_seconds
+
+from ..utils import COFFEE_PLUGINS_DIR, print_error, print_info, print_success
+
+WATCH_LOCK_PATH: str = os.path.join(lfm.COFFEE_DIR, "prefetch.lock")
+WATCH_POLL: float = 60
+
+
+class Args:
+    plugins: List[str]
+    auto: bool
+    watch: bool
+    interval: float
+    idle: float
+    jobs: int
+    quiet: bool
+
+
+def prefetch(args: Args) -> int:
+    prefetcher = PluginPrefetcher(COFFEE_PLUGINS_DIR, args.jobs)
+    if not args.quiet:
+        print_info("Prefetching plugin updates...")
+    results = prefetcher.prefetch_plugins(args.plugins or None)
+
+    failed = [name for name, status in results.items() if status == FAILED]
+    for name in failed:
+        print_error(f"Failed to prefetch {name}")
+    if not args.quiet:
+        fetched = list(results.values()).count(FETCHED)
+        print_success(f"Prefetched {fetched} plugin(s)")
+    return 1 if failed else 0
+
+
+def ready(args: Args) -> bool:
+    """Whether a prefetch is due and tmux has been idle long enough."""
+    if not prefetch_due(args.interval):
+        return False
+    idle = tmux_idle_seconds()
+    return idle is None or idle >= args.idle
+
+
+def watch(args: Args) -> int:
+    # One watcher per machine; later `run-shell -b` starts just exit
+    with open(WATCH_LOCK_PATH, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return 0
+        while True:
+            if ready(args):
+                prefetch(args)
+            time.sleep(min(WATCH_POLL, args.interval))
+            if tmux_idle_seconds() is None:
+                # The tmux server is gone
+                return 0
+
+
+def run(args: Args) -> int:
+    """Run prefetch command"""
+    try:
+        if args.watch:
+            return watch(args)
+        if args.auto and not ready(args):
+            return 0
+        return prefetch(args)
+
+    except Exception as e:
+        print_error(f"Prefetch failed: {e}")
+        return 1
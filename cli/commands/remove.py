@@ -2,7 +2,7 @@
 Remove command implementation
 """
 
-from typing import Callable, Optional
+from typing import Optional
 
 from rich.progress import TaskID
 
@@ -14,6 +14,7 @@ from ..utils import (
     confirm_action,
     console,
     create_progress,
+    create_progress_bus,
     print_error,
     print_info,
     print_success,
@@ -62,19 +63,15 @@ def run(args: Args) -> int:
         else:
             # Normal mode with progress bar
             with create_progress() as progress:
-                task_id: TaskID = progress.add_task(
-                    f"Removing {args.plugin}", total=100
-                )
-
-                # Callback to update progress
-                def callback(
-                    plugin_name: str, percent: int, task_id: TaskID = task_id
-                ) -> None:
-                    progress.update(task_id, completed=percent)
+                task_ids: dict[str, TaskID] = {
+                    args.plugin: progress.add_task(f"Removing {args.plugin}", total=100)
+                }
+                progress_bus = create_progress_bus(progress, task_ids)
 
-                success = remover.remove_plugin(args.plugin, callback)
+                success = remover.remove_plugin(args.plugin, progress_bus.publish)
                 if success:
-                    progress.update(task_id, completed=100)
+                    progress_bus.publish(args.plugin, 100)
+                progress_bus.flush()
 
         if success:
             if not args.quiet:
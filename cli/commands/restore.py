@@ -0,0 +1,86 @@
+"""
+Restore command implementation
+"""
+
+from typing import Optional
+
+from rich.progress import TaskID
+
+from core import PluginRestorer
+from core import lock_file_manager as lfm
+from core.pluginRestorer import FAILED, NOT_LOCKED, RESTORED, UP_TO_DATE
+
+from ..utils import (
+    ACCENT_COLOR,
+    COFFEE_PLUGINS_DIR,
+    console,
+    create_progress,
+    create_progress_bus,
+    print_error,
+    print_info,
+    print_success,
+    print_warning,
+)
+
+
+class Args:
+    plugin: Optional[str]
+    jobs: int
+    quiet: bool
+
+
+def run(args: Args) -> int:
+    """Run restore command"""
+    try:
+        lock_data: lfm.LockData = lfm.read_lock_file()
+        names = [p["name"] for p in lock_data.get("plugins", [])]
+
+        if args.plugin:
+            if args.plugin not in names:
+                print_error(f"Plugin '{args.plugin}' is not in the lock file")
+                return 1
+            names = [args.plugin]
+
+        if not names:
+            if not args.quiet:
+                print_info("Lock file is empty, nothing to restore")
+            return 0
+
+        restorer = PluginRestorer(COFFEE_PLUGINS_DIR, args.jobs)
+
+        if args.quiet:
+            results = restorer.restore_plugins(names)
+        else:
+            print_info(f"Restoring {len(names)} plugin(s) from the lock file...")
+            with create_progress() as progress:
+                task_ids: dict[str, TaskID] = {
+                    name: progress.add_task(f"Restoring {name}", total=100)
+                    for name in names
+                }
+                progress_bus = create_progress_bus(progress, task_ids)
+                results = restorer.restore_plugins(names, progress_bus.publish)
+                progress_bus.flush()
+
+        failed = [name for name, status in results.items() if status == FAILED]
+        for name, status in results.items():
+            if status == FAILED:
+                print_error(f"Failed to restore {name}")
+            elif status == NOT_LOCKED:
+                print_warning(f"{name} has no locked commit, skipped")
+
+        if failed:
+            return 1
+        if not args.quiet:
+            statuses = list(results.values())
+            up_to_date = statuses.count(UP_TO_DATE)
+            if up_to_date:
+                console.print(
+                    f"[bold {ACCENT_COLOR}]SKIP[/] {up_to_date} plugin(s) already at the locked commit",
+                    highlight=False,
+                )
+            print_success(f"Restored {statuses.count(RESTORED)} plugin(s)")
+        return 0
+
+    except Exception as e:
+        print_error(f"Restore failed: {e}")
+        return 1
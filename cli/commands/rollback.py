@@ -0,0 +1,109 @@
+"""
+Rollback command implementation
+"""
+
+import os
+from typing import Optional
+
+from rich.progress import TaskID
+from rich.table import Table
+
+from core import PluginRestorer
+from core.generations import list_generations, read_generation
+from core.pluginRestorer import FAILED, RESTORED
+
+from ..utils import (
+    ACCENT_COLOR,
+    COFFEE_PLUGINS_DIR,
+    SECTION_COLOR,
+    console,
+    create_progress,
+    create_progress_bus,
+    print_error,
+    print_info,
+    print_success,
+)
+
+
+class Args:
+    to: Optional[int]
+    list: bool
+    jobs: int
+    quiet: bool
+
+
+def print_generations() -> None:
+    generations = list_generations()
+    if not generations:
+        print_info("No generations recorded yet")
+        return
+    table = Table(border_style=ACCENT_COLOR)
+    table.add_column("Generation", style=f"bold {SECTION_COLOR}", justify="right")
+    table.add_column("Created (UTC)", style="white")
+    table.add_column("Recorded before", style="white")
+    table.add_column("Plugins", style="white", justify="right")
+    for record in reversed(generations):
+        table.add_row(
+            str(record["generation"]),
+            record.get("created", "")[:19].replace("T", " "),
+            record.get("reason", ""),
+            str(len(record.get("lock", {}).get("plugins", []))),
+        )
+    console.print(table)
+
+
+def run(args: Args) -> int:
+    """Run rollback command"""
+    try:
+        if args.list:
+            print_generations()
+            return 0
+
+        record = read_generation(args.to)
+        if record is None:
+            if args.to is None:
+                print_error("No generations recorded yet")
+            else:
+                print_error(f"Generation {args.to} does not exist")
+            return 1
+
+        restorer = PluginRestorer(COFFEE_PLUGINS_DIR, args.jobs)
+        # Plugins removed since the generation can't be rolled back offline
+        names = [
+            p["name"]
+            for p in record["lock"].get("plugins", [])
+            if os.path.isdir(os.path.join(COFFEE_PLUGINS_DIR, p["name"]))
+        ]
+
+        if args.quiet:
+            generation, results = restorer.rollback(record["generation"])
+        else:
+            print_info(
+                f"Rolling back to generation {record['generation']} "
+                f"(before {record.get('reason', 'unknown')})..."
+            )
+            with create_progress() as progress:
+                task_ids: dict[str, TaskID] = {
+                    name: progress.add_task(f"Rolling back {name}", total=100)
+                    for name in names
+                }
+                progress_bus = create_progress_bus(progress, task_ids)
+                generation, results = restorer.rollback(
+                    record["generation"], progress_bus.publish
+                )
+                progress_bus.flush()
+
+        failed = [name for name, status in results.items() if status == FAILED]
+        for name in failed:
+            print_error(f"Failed to roll back {name}: commit is not available locally")
+
+        if not args.quiet:
+            print_success(
+                f"Rolled back {list(results.values()).count(RESTORED)} plugin(s) "
+                f"to generation {generation}"
+            )
+        return 1 if failed else 0
+
+    except Exception as e:
+        print_error(f"Rollback failed: {e}")
+        return 1
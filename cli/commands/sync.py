@@ -0,0 +1,106 @@
+"""
+Sync command implementation
+"""
+
+from typing import Any, List
+
+from rich.progress import TaskID
+
+from core import ConfigValidationError, PluginLoader, PluginSyncer
+from core.pluginSyncer import GIT_ACTIONS, SyncAction
+
+from ..utils import (
+    ACCENT_COLOR,
+    COFFEE_CONFIG_DIR,
+    COFFEE_PLUGINS_DIR,
+    ERROR_COLOR,
+    HIGHLIGHT_COLOR,
+    SECTION_COLOR,
+    console,
+    create_progress,
+    create_progress_bus,
+    print_error,
+    print_info,
+    print_success,
+)
+
+PLAN_STYLES = {
+    "install": ("+", HIGHLIGHT_COLOR),
+    "retag": ("~", SECTION_COLOR),
+    "configure": ("~", SECTION_COLOR),
+    "enable": ("●", ACCENT_COLOR),
+    "disable": ("○", ACCENT_COLOR),
+    "remove": ("-", ERROR_COLOR),
+}
+
+
+class Args:
+    dry_run: bool
+    jobs: int
+    quiet: bool
+
+
+def print_plan(actions: List[SyncAction]) -> None:
+    """Print a sync plan, one action per line"""
+    for action in actions:
+        symbol, color = PLAN_STYLES[action.kind]
+        detail = f" [dim]({action.detail})[/]" if action.detail else ""
+        console.print(
+            f"  [bold {color}]{symbol} {action.kind:<9}[/] {action.name}{detail}",
+            highlight=False,
+        )
+
+
+def run(args: Args) -> int:
+    """Run sync command"""
+    try:
+        plugin_loader = PluginLoader(COFFEE_CONFIG_DIR)
+        try:
+            plugins: list[dict[str, Any]] = plugin_loader.load_plugins(strict=True)
+        except ConfigValidationError as e:
+            for error in e.errors:
+                print_error(str(error))
+            return 1
+
+        syncer = PluginSyncer(plugins, COFFEE_PLUGINS_DIR, args.jobs)
+        actions = syncer.plan()
+
+        if not actions:
+            if not args.quiet:
+                print_success("Everything is already in sync")
+            return 0
+
+        if not args.quiet or args.dry_run:
+            print_info(f"Sync plan ({len(actions)} action(s)):")
+            print_plan(actions)
+
+        if args.dry_run:
+            return 0
+
+        if args.quiet:
+            results = syncer.apply(actions)
+        else:
+            with create_progress() as progress:
+                task_ids: dict[str, TaskID] = {}
+                progress_bus = create_progress_bus(progress, task_ids)
+                for action in actions:
+                    if action.kind in GIT_ACTIONS:
+                        task_ids[action.name] = progress.add_task(
+                            f"{action.kind.capitalize()} {action.name}", total=100
+                        )
+                results = syncer.apply(actions, progress_bus.publish)
+                progress_bus.flush()
+
+        failed = [action for action, success in results if not success]
+        for action in failed:
+            print_error(f"Failed to {action.kind} {action.name}")
+
+        if failed:
+            return 1
+        if not args.quiet:
+            print_success(f"Sync complete ({len(actions)} action(s) applied)")
+        return 0
+
+    except Exception as e:
+        print_error(f"Sync failed: {e}")
+        return 1
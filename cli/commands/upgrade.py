@@ -14,6 +14,7 @@ from ..utils import (
     confirm_action,
     console,
     create_progress,
+    create_progress_bus,
     print_error,
     print_info,
 )
@@ -22,12 +23,13 @@ from ..utils import (
 class Args:
     plugin: Optional[str]
     quiet: bool
+    jobs: int
 
 
 def run(args: Args) -> int:
     """Run upgrade command"""
     try:
-        updater = PluginUpdater(COFFEE_PLUGINS_DIR)
+        updater = PluginUpdater(COFFEE_PLUGINS_DIR, args.jobs)
         updates: List[dict[str, Any]] = updater.check_for_updates()
 
         # Filter plugins with available updates
@@ -67,36 +69,36 @@ def run(args: Args) -> int:
 
         if args.quiet:
             # Quiet mode - no progress bars
-            for update in available_updates:
-                success = updater.update_plugin(update)
-                if success:
+            for job in updater.update_plugins(available_updates):
+                job.join()
+                if job.result:
                     success_count += 1
         else:
             # Normal mode with progress bars
             with create_progress() as progress:
+                task_ids: dict[str, TaskID] = {}
+                progress_bus = create_progress_bus(progress, task_ids)
                 for update in available_updates:
-                    task_id: TaskID = progress.add_task(
-                        f"Upgrading {update.get('name', 'Unknown')}", total=100
+                    plugin_name = update.get("name", "Unknown")
+                    task_ids[plugin_name] = progress.add_task(
+                        f"Upgrading {plugin_name}", total=100
                     )
 
-                    # Callback for progress update
-                    def callback(
-                        plugin_name: str, percent: int, task_id: TaskID = task_id
-                    ) -> None:
-                        progress.update(task_id, completed=percent)
-
-                    success = updater.update_plugin(update, callback)
-                    if success:
+                jobs = updater.update_plugins(available_updates, progress_bus.publish)
+                for update, job in zip(available_updates, jobs):
+                    job.join()
+                    plugin_name = update.get("name", "Unknown")
+                    if job.result:
                         success_count += 1
-                        progress.update(task_id, completed=100)
+                        progress_bus.publish(plugin_name, 100)
+                        progress_bus.flush()
                         console.print(
-                            f"[bold {HIGHLIGHT_COLOR}]UPGRADED[/] {update.get('name', 'Unknown')} to [bold white]{update.get('new_version', 'N/A')}[/]"
+                            f"[bold {HIGHLIGHT_COLOR}]UPGRADED[/] {plugin_name} to [bold white]{update.get('new_version', 'N/A')}[/]"
                         )
                     else:
-                        progress.update(task_id, completed=0)
-                        print_error(
-                            f"Failed to upgrade {update.get('name', 'Unknown')}"
-                        )
+                        progress_bus.publish(plugin_name, 0)
+                        progress_bus.flush()
+                        print_error(f"Failed to upgrade {plugin_name}")
 
         if not args.quiet:
             if success_count == len(available_updates):
@@ -2,6 +2,7 @@
 """
 Coffee CLI - Main entry point
 """
+
 import argparse
 import os
 import sys
@@ -12,17 +13,27 @@ current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, current_dir)
 
 from cli.commands import (
+    bundle,
+    compile_configs,
     disable,
+    doctor,
     enable,
+    gc,
     info,
     install,
     list_plugins,
+    prefetch,
     remove,
+    restore,
+    rollback,
+    sync,
     update,
     upgrade,
 )
-from cli.utils import print_version, setup_directories
-from core import PluginSourcer
+from cli.utils import print_info, print_version, setup_directories
+from core import PluginSourcer, metrics, tracing
+from core.git_utils import DEFAULT_GIT_JOBS
+from core.pluginPrefetcher import PREFETCH_INTERVAL
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -37,11 +48,21 @@ Examples:
   coffee update               Check for plugin updates
   coffee upgrade              Upgrade all plugins with updates
   coffee upgrade tmux-sensible  Upgrade specific plugin
+  coffee rollback             Undo the last upgrade
   coffee remove tmux-sensible   Remove plugin
   coffee list                 List installed plugins
   coffee info tmux-sensible   Show plugin information
   coffee enable tmux-sensible Enable plugin
   coffee disable tmux-sensible Disable plugin
+  coffee compile              Compile YAML configs into one snapshot
+  coffee sync --dry-run       Show what sync would change
+  coffee restore              Check out the exact commits in the lock file
+  coffee bundle export f.tar  Pack installed plugins into one archive
+  coffee bundle import f.tar  Install plugins from an exported archive
+  coffee gc                   Compact plugin repositories
+  coffee prefetch --auto      Fetch updates in the background when due
+  coffee doctor --fix         Find and repair lock file/disk/config drift
+  coffee --trace t.json upgrade  Trace where an upgrade spends its time
         """,
     )
     # Global flags
@@ -53,6 +74,11 @@ Examples:
     )
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
     parser.add_argument("-q", "--quiet", action="store_true", help="Quiet output")
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Write subprocess and file I/O spans to FILE (Chrome trace format)",
+    )
 
     # Create subcommands
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
@@ -73,6 +99,13 @@ Examples:
     upgrade_parser.add_argument(
         "--all", action="store_true", help="Upgrade all plugins"
     )
+    upgrade_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_GIT_JOBS,
+        help=f"Parallel upgrades (default: {DEFAULT_GIT_JOBS})",
+    )
     upgrade_parser.set_defaults(func=upgrade.run)
 
     # Remove command
@@ -110,6 +143,186 @@ Examples:
     )
     disable_parser.set_defaults(func=disable.run)
 
+    # Sync command
+    sync_parser = subparsers.add_parser(
+        "sync", help="Bring installed plugins in line with the configs"
+    )
+    sync_parser.add_argument(
+        "--dry-run", action="store_true", help="Print the plan without applying it"
+    )
+    sync_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_GIT_JOBS,
+        help=f"Parallel git operations (default: {DEFAULT_GIT_JOBS})",
+    )
+    sync_parser.set_defaults(func=sync.run)
+
+    # Restore command
+    restore_parser = subparsers.add_parser(
+        "restore", help="Restore plugins at the commits in the lock file"
+    )
+    restore_parser.add_argument("plugin", nargs="?", help="Specific plugin to restore")
+    restore_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_GIT_JOBS,
+        help=f"Parallel git operations (default: {DEFAULT_GIT_JOBS})",
+    )
+    restore_parser.set_defaults(func=restore.run)
+
+    # Rollback command
+    rollback_parser = subparsers.add_parser(
+        "rollback", help="Go back to the plugin commits before an upgrade"
+    )
+    rollback_parser.add_argument(
+        "--to",
+        type=int,
+        metavar="N",
+        help="Generation to roll back to (default: the latest)",
+    )
+    rollback_parser.add_argument(
+        "--list", action="store_true", help="List recorded generations"
+    )
+    rollback_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_GIT_JOBS,
+        help=f"Parallel git operations (default: {DEFAULT_GIT_JOBS})",
+    )
+    rollback_parser.set_defaults(func=rollback.run)
+
+    # Bundle command
+    bundle_parser = subparsers.add_parser(
+        "bundle", help="Export or import a portable plugin bundle"
+    )
+    bundle_subparsers = bundle_parser.add_subparsers(
+        dest="bundle_command", required=True
+    )
+    bundle_export_parser = bundle_subparsers.add_parser(
+        "export", help="Pack installed plugins and their lock entries"
+    )
+    bundle_export_parser.add_argument("file", help="Archive to write")
+    bundle_export_parser.add_argument(
+        "plugins", nargs="*", help="Plugins to export (default: all)"
+    )
+    bundle_export_parser.add_argument(
+        "--git-bundles",
+        action="store_true",
+        help="Store git bundles instead of checkout trees",
+    )
+    bundle_import_parser = bundle_subparsers.add_parser(
+        "import", help="Install plugins from a bundle"
+    )
+    bundle_import_parser.add_argument("file", help="Archive to read")
+    bundle_import_parser.add_argument(
+        "--force", action="store_true", help="Replace plugins that are installed"
+    )
+    for subparser in (bundle_export_parser, bundle_import_parser):
+        subparser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=DEFAULT_GIT_JOBS,
+            help=f"Parallel workers (default: {DEFAULT_GIT_JOBS})",
+        )
+        subparser.set_defaults(
+            func=bundle.run, plugins=[], git_bundles=False, force=False
+        )
+
+    # Gc command
+    gc_parser = subparsers.add_parser("gc", help="Compact plugin repositories")
+    gc_parser.add_argument(
+        "plugins", nargs="*", help="Plugins to compact (default: all)"
+    )
+    gc_parser.add_argument(
+        "--shallow",
+        action="store_true",
+        help="Drop history behind each plugin's checked out commit",
+    )
+    gc_parser.add_argument(
+        "--auto",
+        action="store_true",
+        help="Only run if the last gc was more than a week ago",
+    )
+    gc_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_GIT_JOBS,
+        help=f"Parallel git operations (default: {DEFAULT_GIT_JOBS})",
+    )
+    gc_parser.set_defaults(func=gc.run)
+
+    # Prefetch command
+    prefetch_parser = subparsers.add_parser(
+        "prefetch", help="Fetch plugin updates without applying them"
+    )
+    prefetch_parser.add_argument(
+        "plugins", nargs="*", help="Plugins to prefetch (default: all)"
+    )
+    prefetch_parser.add_argument(
+        "--auto",
+        action="store_true",
+        help="Only run if the interval has passed and tmux is idle",
+    )
+    prefetch_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and prefetch whenever --auto would",
+    )
+    prefetch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=PREFETCH_INTERVAL,
+        help=f"Seconds between prefetches (default: {PREFETCH_INTERVAL:.0f})",
+    )
+    prefetch_parser.add_argument(
+        "--idle",
+        type=float,
+        default=0,
+        help="Seconds tmux must be idle before prefetching (default: 0)",
+    )
+    prefetch_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_GIT_JOBS,
+        help=f"Parallel git operations (default: {DEFAULT_GIT_JOBS})",
+    )
+    prefetch_parser.set_defaults(func=prefetch.run)
+
+    # Doctor command
+    doctor_parser = subparsers.add_parser(
+        "doctor", help="Check the lock file, plugins and configs for drift"
+    )
+    doctor_parser.add_argument(
+        "--fix", action="store_true", help="Repair the problems that can be fixed"
+    )
+    doctor_parser.add_argument(
+        "--json", action="store_true", help="Print the report as JSON"
+    )
+    doctor_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_GIT_JOBS,
+        help=f"Parallel checks (default: {DEFAULT_GIT_JOBS})",
+    )
+    doctor_parser.set_defaults(func=doctor.run)
+
+    # Compile command
+    compile_parser = subparsers.add_parser(
+        "compile", help="Compile plugin configs into a single snapshot"
+    )
+    compile_parser.add_argument(
+        "--remove", action="store_true", help="Remove the compiled snapshot"
+    )
+    compile_parser.set_defaults(func=compile_configs.run)
+
     return parser
 
 
@@ -118,6 +331,20 @@ def main() -> int:
     parser = create_parser()
     args: Any = parser.parse_args()
 
+    if metrics.METRICS_FORMAT:
+        metrics.enable(metrics.METRICS_FORMAT)
+    if not args.trace:
+        return run_command(parser, args)
+    tracing.enable()
+    try:
+        return run_command(parser, args)
+    finally:
+        count = tracing.write_chrome_trace(args.trace)
+        if not args.quiet:
+            print_info(f"Wrote {count} trace spans to {args.trace}")
+
+
+def run_command(parser: argparse.ArgumentParser, args: Any) -> int:
     # Handle global flags
     if getattr(args, "version", False):
         print_version()
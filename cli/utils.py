@@ -4,17 +4,21 @@ CLI utility functions
 
 import os
 from importlib.metadata import PackageNotFoundError, version
-from typing import Any, List
+from typing import Any, Dict, Hashable, List
 
 from rich.console import Console
 from rich.progress import (
     BarColumn,
     Progress,
     SpinnerColumn,
+    TaskID,
     TextColumn,
 )
 from rich.table import Table
 
+from core import ProgressBus
+from core.staging import clean_staging
+
 console: Console = Console()
 
 ACCENT_COLOR: str = "#7aa2f7"
@@ -37,6 +41,8 @@ def setup_directories() -> None:
     os.makedirs(COFFEE_PLUGINS_DIR, exist_ok=True)
     os.makedirs(COFFEE_BASE_DIR, exist_ok=True)
     os.makedirs(COFFEE_CONFIG_DIR, exist_ok=True)
+    # Drop half-finished installs left by interrupted runs
+    clean_staging(COFFEE_PLUGINS_DIR)
 
 
 def print_version() -> None:
@@ -101,6 +107,28 @@ def create_progress() -> Progress:
     )
 
 
+def create_progress_bus(progress: Progress, task_ids: Dict[str, TaskID]) -> ProgressBus:
+    """Create a throttled progress bus that drives the given progress bars"""
+
+    def flush(updates: Dict[Hashable, int]) -> None:
+        for plugin_name, percent in updates.items():
+            task_id = task_ids.get(str(plugin_name))
+            if task_id is not None:
+                progress.update(task_id, completed=percent)
+
+    return ProgressBus(flush)
+
+
+def format_size(size: int) -> str:
+    """Format a byte count for display"""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
 def format_plugin_table(plugins: List[dict[str, Any]], title: str = "Plugins") -> Table:
     """Format plugins as a rich table"""
     table: Table = Table(
@@ -4,24 +4,57 @@ Author: Praanesh S
 
 Modules:
 - pluginInstaller: Handles the installation of plugins.
+- pluginConfig: Validates plugin configs against the schema.
 - pluginLoader: Manages loading of plugins.
 - pluginSourcer: Handles sourcing and configuration.
 - pluginUpdater: Manages plugin updates.
+- pluginSyncer: Reconciles configs with the lock file and disk.
+- pluginRestorer: Restores plugins at their locked commits.
+- pluginPrefetcher: Fetches plugin updates ahead of time.
+- pluginBundler: Exports and imports portable plugin bundles.
+- pluginCompactor: Compacts plugin repositories.
+- pluginDoctor: Checks the lock file, disk and configs for drift.
 - pluginRemover: Manages plugin removals.
+- progressBus: Coalesces and rate-limits progress reports.
+- jobScheduler: Runs queued jobs on a bounded worker pool.
+- tracing: Records subprocess and file I/O spans.
+- metrics: Exports counters and histograms for Prometheus.
 """
 
-from . import lock_file_manager
+from . import lock_file_manager, metrics, tracing
+from .jobScheduler import JobScheduler
+from .pluginBundler import PluginBundler
+from .pluginCompactor import PluginCompactor
+from .pluginConfig import ConfigError, ConfigValidationError, PluginConfig
+from .pluginDoctor import PluginDoctor
 from .pluginInstaller import PluginInstaller
 from .pluginLoader import PluginLoader
+from .pluginPrefetcher import PluginPrefetcher
 from .pluginRemover import PluginRemover
+from .pluginRestorer import PluginRestorer
 from .pluginSourcer import PluginSourcer
+from .pluginSyncer import PluginSyncer
 from .pluginUpdater import PluginUpdater
+from .progressBus import ProgressBus
 
 __all__ = [
     "PluginSourcer",
     "PluginInstaller",
     "PluginRemover",
     "PluginUpdater",
+    "PluginSyncer",
+    "PluginRestorer",
+    "PluginPrefetcher",
+    "PluginBundler",
+    "PluginCompactor",
+    "PluginDoctor",
     "PluginLoader",
+    "PluginConfig",
+    "ConfigError",
+    "ConfigValidationError",
+    "ProgressBus",
+    "JobScheduler",
     "lock_file_manager",
+    "tracing",
+    "metrics",
 ]
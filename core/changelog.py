@@ -0,0 +1,79 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core import git_reader
+from core.git_utils import run_git
+
+# Commit subjects shown per update
+MAX_ENTRIES: int = 10
+
+
+@dataclass(frozen=True)
+class Changelog:
+    entries: List[str]
+    released: str
+    # Whether the range holds more commits than ``entries``
+    truncated: bool = False
+
+
+_cache: Dict[Tuple[str, Optional[str], str], Changelog] = {}
+_cache_lock = threading.Lock()
+
+
+def read_changelog(
+    plugin_path: str,
+    repo_url: str,
+    old_commit: Optional[str],
+    new_commit: str,
+    refspec: str,
+) -> Optional[Changelog]:
+    """
+    List the commit subjects between ``old_commit`` and ``new_commit``.
+
+    When the new commit isn't local yet it is fetched through ``refspec``,
+    and the upgrade then only needs a local checkout. Repositories that are
+    already partial clones skip the blobs (``--filter=blob:none``); others
+    fetch them too, since a filtered fetch would turn a full clone into a
+    partial one that lazily fetches blobs later. Results are cached per
+    commit range, since a range's history never changes. None if the commits
+    can't be fetched.
+    """
+    key = (repo_url, old_commit, new_commit)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    timestamp = git_reader.commit_time(plugin_path, new_commit)
+    if timestamp is None:
+        partial = run_git(plugin_path, "config", "--get", "extensions.partialClone")
+        fetch_args = ["fetch", "-q"]
+        if partial:
+            fetch_args.append("--filter=blob:none")
+        fetched = run_git(plugin_path, *fetch_args, repo_url, refspec)
+        if fetched is None:
+            return None
+        timestamp = git_reader.commit_time(plugin_path, new_commit)
+
+    # Without the old commit, only the newest history can be shown
+    rev = new_commit
+    if old_commit and git_reader.commit_time(plugin_path, old_commit) is not None:
+        rev = f"{old_commit}..{new_commit}"
+    log = run_git(
+        plugin_path, "log", "--format=%s", f"--max-count={MAX_ENTRIES + 1}", rev
+    )
+    if log is None:
+        return None
+    subjects = log.splitlines()
+
+    changelog = Changelog(
+        entries=subjects[:MAX_ENTRIES],
+        released=(
+            git_reader.relative_time(timestamp) if timestamp is not None else "Unknown"
+        ),
+        truncated=len(subjects) > MAX_ENTRIES,
+    )
+    with _cache_lock:
+        _cache[key] = changelog
+    return changelog
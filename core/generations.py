@@ -0,0 +1,87 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from core import lock_file_manager as lfm
+from core import tracing
+
+GENERATIONS_DIR: str = os.path.join(lfm.COFFEE_DIR, "generations")
+MAX_GENERATIONS: int = 20
+
+
+def _generation_path(generation: int) -> str:
+    return os.path.join(GENERATIONS_DIR, f"{generation}.json")
+
+
+def generation_ids() -> List[int]:
+    try:
+        entries = os.listdir(GENERATIONS_DIR)
+    except OSError:
+        return []
+    ids = []
+    for entry in entries:
+        stem, ext = os.path.splitext(entry)
+        if ext == ".json" and stem.isdigit():
+            ids.append(int(stem))
+    return sorted(ids)
+
+
+def record_generation(
+    reason: str, lock_data: Optional[lfm.LockData] = None
+) -> Optional[int]:
+    """
+    Save the lock file as a new generation before it gets changed.
+
+    The lock entries hold each plugin's commit, so a generation is enough to
+    check every plugin out again later. Only the newest ``MAX_GENERATIONS``
+    are kept.
+    """
+    if lock_data is None:
+        lock_data = lfm.read_lock_file()
+    ids = generation_ids()
+    generation = ids[-1] + 1 if ids else 1
+    record = {
+        "generation": generation,
+        "created": datetime.utcnow().isoformat(),
+        "reason": reason,
+        "lock": lock_data,
+    }
+    path = _generation_path(generation)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(GENERATIONS_DIR, exist_ok=True)
+        with tracing.traced_open(tmp_path, "w") as f:
+            json.dump(record, f, indent=4)
+        os.replace(tmp_path, path)
+    except OSError:
+        return None
+
+    for old in ids[: max(0, len(ids) + 1 - MAX_GENERATIONS)]:
+        try:
+            os.remove(_generation_path(old))
+        except OSError:
+            pass
+    return generation
+
+
+def read_generation(generation: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Return a generation record, or the newest one if none is given."""
+    if generation is None:
+        ids = generation_ids()
+        if not ids:
+            return None
+        generation = ids[-1]
+    try:
+        with tracing.traced_open(_generation_path(generation), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def list_generations() -> List[Dict[str, Any]]:
+    return [
+        record
+        for record in (read_generation(generation) for generation in generation_ids())
+        if record is not None
+    ]
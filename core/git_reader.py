@@ -0,0 +1,494 @@
+"""
+Read-only access to git metadata without spawning git.
+
+Covers HEAD, loose refs, packed-refs, tags and commit objects, whether loose
+or stored in packs (including deltas and alternates). Every function returns
+None when it can't answer so callers can fall back to the git CLI. Parsed
+objects are cached per repository; refs are re-read when their files change.
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from core import tracing
+
+OBJ_COMMIT = 1
+OBJ_TREE = 2
+OBJ_BLOB = 3
+OBJ_TAG = 4
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+TYPE_NAMES = {
+    b"commit": OBJ_COMMIT,
+    b"tree": OBJ_TREE,
+    b"blob": OBJ_BLOB,
+    b"tag": OBJ_TAG,
+}
+
+_repos: Dict[str, "_Repo"] = {}
+_repos_lock = threading.Lock()
+
+
+def git_dir(repo_path: str) -> Optional[str]:
+    """Return the git directory of a checkout, following ``.git`` files."""
+    dot_git = os.path.join(repo_path, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        with open(dot_git, "r") as f:
+            content = f.read().strip()
+    except OSError:
+        return None
+    if content.startswith("gitdir:"):
+        path = content[len("gitdir:") :].strip()
+        return os.path.normpath(os.path.join(repo_path, path))
+    return None
+
+
+def common_dir(path: str) -> str:
+    """Return the directory holding shared refs and objects for a git dir."""
+    try:
+        with open(os.path.join(path, "commondir"), "r") as f:
+            return os.path.normpath(os.path.join(path, f.read().strip()))
+    except OSError:
+        return path
+
+
+def read_packed_refs(path: str) -> Dict[str, str]:
+    refs: Dict[str, str] = {}
+    try:
+        with open(os.path.join(path, "packed-refs"), "r") as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                parts = line.split()
+                if len(parts) == 2:
+                    refs[parts[1]] = parts[0]
+    except OSError:
+        pass
+    return refs
+
+
+def resolve_ref(path: str, ref: str) -> Optional[str]:
+    """Resolve a ref name to a commit hash from loose refs or packed-refs."""
+    shared = common_dir(path)
+    for _ in range(5):  # symbolic refs can chain, but never deeply
+        value = None
+        # HEAD is per worktree; every other ref lives in the common dir
+        for base in (path, shared) if ref == "HEAD" else (shared,):
+            try:
+                with open(os.path.join(base, ref), "r") as f:
+                    value = f.read().strip()
+                break
+            except OSError:
+                continue
+        if value is None:
+            return read_packed_refs(shared).get(ref)
+        if not value.startswith("ref:"):
+            return value or None
+        ref = value[len("ref:") :].strip()
+    return None
+
+
+def read_head(repo_path: str) -> Optional[str]:
+    """Return the commit HEAD points at without running git."""
+    path = git_dir(repo_path)
+    if path is None:
+        return None
+    return resolve_ref(path, "HEAD")
+
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    def varint(pos: int) -> Tuple[int, int]:
+        value = shift = 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value, pos
+
+    _, pos = varint(0)  # base size
+    _, pos = varint(pos)  # result size
+    out = bytearray()
+    while pos < len(delta):
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            # Copy a range of the base; the op bits say which bytes follow
+            offset = size = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (1 << (4 + i)):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset : offset + (size or 0x10000)]
+        elif op:
+            out += delta[pos : pos + op]
+            pos += op
+        else:
+            raise ValueError("invalid delta opcode")
+    return bytes(out)
+
+
+class _PackIndex:
+    def __init__(self, idx_path: str) -> None:
+        with tracing.traced_open(idx_path, "rb") as f:
+            data = f.read()
+        self.pack_path = idx_path[: -len(".idx")] + ".pack"
+        if data[:4] == b"\xfftOc":
+            self.version = 2
+            self.fanout = struct.unpack(">256I", data[8 : 8 + 1024])
+            count = self.fanout[255]
+            self.shas_at = 8 + 1024
+            self.offsets_at = self.shas_at + count * 20 + count * 4
+            self.large_at = self.offsets_at + count * 4
+        else:
+            self.version = 1
+            self.fanout = struct.unpack(">256I", data[:1024])
+        self.data = data
+
+    def _sha(self, i: int) -> bytes:
+        if self.version == 2:
+            start = self.shas_at + i * 20
+        else:
+            start = 1024 + i * 24 + 4
+        return self.data[start : start + 20]
+
+    def _offset(self, i: int) -> int:
+        if self.version == 1:
+            return struct.unpack(">I", self.data[1024 + i * 24 : 1024 + i * 24 + 4])[0]
+        at = self.offsets_at + i * 4
+        offset = struct.unpack(">I", self.data[at : at + 4])[0]
+        if offset & 0x80000000:
+            at = self.large_at + (offset & 0x7FFFFFFF) * 8
+            offset = struct.unpack(">Q", self.data[at : at + 8])[0]
+        return offset
+
+    def find(self, sha: bytes) -> Optional[int]:
+        low = self.fanout[sha[0] - 1] if sha[0] else 0
+        high = self.fanout[sha[0]]
+        while low < high:
+            mid = (low + high) // 2
+            found = self._sha(mid)
+            if found == sha:
+                return self._offset(mid)
+            if found < sha:
+                low = mid + 1
+            else:
+                high = mid
+        return None
+
+
+class _Repo:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.common = common_dir(path)
+        self.object_dirs = self._object_dirs()
+        self.packs: Optional[List[_PackIndex]] = None
+        self.objects: Dict[str, Tuple[int, bytes]] = {}
+        self.tags: Optional[Dict[str, str]] = None
+        self.tags_signature: Optional[Tuple[int, ...]] = None
+        self.lock = threading.Lock()
+
+    def _object_dirs(self) -> List[str]:
+        dirs: List[str] = []
+        pending = [os.path.join(self.common, "objects")]
+        while pending and len(dirs) < 10:
+            objects = pending.pop(0)
+            if objects in dirs:
+                continue
+            dirs.append(objects)
+            try:
+                with open(os.path.join(objects, "info", "alternates"), "r") as f:
+                    for line in f:
+                        line = line.strip()
+                        if line and not line.startswith("#"):
+                            pending.append(
+                                os.path.normpath(os.path.join(objects, line))
+                            )
+            except OSError:
+                pass
+        return dirs
+
+    def _load_packs(self) -> List[_PackIndex]:
+        if self.packs is None:
+            packs: List[_PackIndex] = []
+            for objects in self.object_dirs:
+                pack_dir = os.path.join(objects, "pack")
+                try:
+                    names = os.listdir(pack_dir)
+                except OSError:
+                    continue
+                for name in names:
+                    if name.endswith(".idx"):
+                        packs.append(_PackIndex(os.path.join(pack_dir, name)))
+            self.packs = packs
+        return self.packs
+
+    def read_object(self, sha: str) -> Optional[Tuple[int, bytes]]:
+        cached = self.objects.get(sha)
+        if cached is not None:
+            return cached
+        result = self._read_loose(sha) or self._read_packed(bytes.fromhex(sha))
+        if result is None:
+            # A fetch or gc may have added packs, or a reinstall alternates,
+            # since they were listed
+            self.packs = None
+            self.object_dirs = self._object_dirs()
+            result = self._read_loose(sha) or self._read_packed(bytes.fromhex(sha))
+        if result is not None and result[0] in (OBJ_COMMIT, OBJ_TAG):
+            self.objects[sha] = result
+        return result
+
+    def _read_loose(self, sha: str) -> Optional[Tuple[int, bytes]]:
+        for objects in self.object_dirs:
+            try:
+                with open(os.path.join(objects, sha[:2], sha[2:]), "rb") as f:
+                    raw = zlib.decompress(f.read())
+            except (OSError, zlib.error):
+                # Missing here, or truncated; the git CLI can tell which
+                continue
+            header, _, body = raw.partition(b"\0")
+            kind = TYPE_NAMES.get(header.split(b" ")[0])
+            return (kind, body) if kind else None
+        return None
+
+    def _read_packed(
+        self, sha: bytes, retry: bool = True
+    ) -> Optional[Tuple[int, bytes]]:
+        try:
+            for pack in self._load_packs():
+                offset = pack.find(sha)
+                if offset is not None:
+                    with open(pack.pack_path, "rb") as f:
+                        return self._read_pack_entry(f, offset)
+        except OSError:
+            # A concurrent gc or repack deleted a pack we had listed
+            self.packs = None
+            self.object_dirs = self._object_dirs()
+            if retry:
+                return self._read_packed(sha, retry=False)
+        except (zlib.error, struct.error, IndexError, ValueError):
+            # A truncated or corrupt pack; callers fall back to the git CLI
+            pass
+        return None
+
+    def _read_pack_entry(self, f: BinaryIO, offset: int) -> Optional[Tuple[int, bytes]]:
+        f.seek(offset)
+        byte = f.read(1)[0]
+        kind = (byte >> 4) & 7
+        while byte & 0x80:
+            byte = f.read(1)[0]
+
+        base: Optional[Tuple[int, bytes]] = None
+        if kind == OBJ_OFS_DELTA:
+            byte = f.read(1)[0]
+            distance = byte & 0x7F
+            while byte & 0x80:
+                byte = f.read(1)[0]
+                distance = ((distance + 1) << 7) | (byte & 0x7F)
+            data_at = f.tell()
+            base = self._read_pack_entry(f, offset - distance)
+            f.seek(data_at)
+        elif kind == OBJ_REF_DELTA:
+            base_sha = f.read(20)
+            data_at = f.tell()
+            base = self.read_object(base_sha.hex())
+            f.seek(data_at)
+
+        decompressor = zlib.decompressobj()
+        chunks: List[bytes] = []
+        while not decompressor.eof:
+            chunk = f.read(8192)
+            if not chunk:
+                break
+            chunks.append(decompressor.decompress(chunk))
+        if not decompressor.eof:
+            # The pack ends mid-object
+            return None
+        data = b"".join(chunks)
+
+        if kind in (OBJ_OFS_DELTA, OBJ_REF_DELTA):
+            if base is None:
+                return None
+            return base[0], _apply_delta(base[1], data)
+        return kind, data
+
+    def read_tags(self) -> Dict[str, str]:
+        """Map tag names to the object each tag ref points at."""
+        tags_dir = os.path.join(self.common, "refs", "tags")
+        signature = tuple(
+            _mtime(p) for p in (os.path.join(self.common, "packed-refs"), tags_dir)
+        )
+        with self.lock:
+            if self.tags is not None and signature == self.tags_signature:
+                return self.tags
+            tags = {
+                ref[len("refs/tags/") :]: sha
+                for ref, sha in read_packed_refs(self.common).items()
+                if ref.startswith("refs/tags/")
+            }
+            for root, _, files in os.walk(tags_dir):
+                for file in files:
+                    path = os.path.join(root, file)
+                    try:
+                        with open(path, "r") as f:
+                            tags[os.path.relpath(path, tags_dir)] = f.read().strip()
+                    except OSError:
+                        pass
+            self.tags = tags
+            self.tags_signature = signature
+            return tags
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _repo(repo_path: str) -> Optional[_Repo]:
+    path = git_dir(repo_path)
+    if path is None:
+        return None
+    key = os.path.realpath(path)
+    with _repos_lock:
+        repo = _repos.get(key)
+        if repo is None:
+            repo = _repos[key] = _Repo(path)
+        return repo
+
+
+def _headers(body: bytes) -> Dict[bytes, bytes]:
+    headers: Dict[bytes, bytes] = {}
+    for line in body.split(b"\n\n", 1)[0].split(b"\n"):
+        key, _, value = line.partition(b" ")
+        headers.setdefault(key, value)
+    return headers
+
+
+def _timestamp(signature: bytes) -> Optional[int]:
+    # "Name <email> 1700000000 +0000"
+    parts = signature.rsplit(b" ", 2)
+    try:
+        return int(parts[-2])
+    except (IndexError, ValueError):
+        return None
+
+
+def _peel(repo: _Repo, sha: str) -> Tuple[Optional[str], Optional[int]]:
+    """Follow tag objects to a commit; return it and the outermost tag's date."""
+    tag_time: Optional[int] = None
+    for _ in range(10):
+        obj = repo.read_object(sha)
+        if obj is None:
+            return None, None
+        kind, body = obj
+        if kind != OBJ_TAG:
+            return (sha, tag_time) if kind == OBJ_COMMIT else (None, None)
+        headers = _headers(body)
+        if tag_time is None and b"tagger" in headers:
+            tag_time = _timestamp(headers[b"tagger"])
+        sha = headers.get(b"object", b"").decode()
+    return None, None
+
+
+def resolve_commit(repo_path: str, rev: str) -> Optional[str]:
+    """Resolve HEAD, a full hash, a tag or ``tags/<tag>`` to a commit hash."""
+    repo = _repo(repo_path)
+    if repo is None:
+        return None
+    if rev == "HEAD":
+        sha = resolve_ref(repo.path, "HEAD")
+    elif len(rev) == 40 and all(c in "0123456789abcdef" for c in rev):
+        sha = rev
+    else:
+        name = rev[len("tags/") :] if rev.startswith("tags/") else rev
+        sha = repo.read_tags().get(name)
+    if not sha:
+        return None
+    return _peel(repo, sha)[0]
+
+
+def commit_time(repo_path: str, rev: str) -> Optional[int]:
+    """Return the committer timestamp of a commit."""
+    repo = _repo(repo_path)
+    sha = resolve_commit(repo_path, rev)
+    if repo is None or sha is None:
+        return None
+    obj = repo.read_object(sha)
+    if obj is None:
+        return None
+    committer = _headers(obj[1]).get(b"committer")
+    return _timestamp(committer) if committer else None
+
+
+def read_tags(repo_path: str) -> Optional[Dict[str, str]]:
+    """Map tag names to the (possibly annotated) objects they point at."""
+    repo = _repo(repo_path)
+    return repo.read_tags() if repo is not None else None
+
+
+def list_tags(repo_path: str) -> Optional[List[str]]:
+    """
+    Return tag names newest first, like ``git tag --sort=-creatordate``.
+
+    Annotated tags are dated by their tagger, lightweight tags by the commit.
+    """
+    repo = _repo(repo_path)
+    if repo is None:
+        return None
+    dated: List[Tuple[int, str]] = []
+    for name, sha in repo.read_tags().items():
+        commit, tag_time = _peel(repo, sha)
+        if commit is None:
+            return None
+        if tag_time is None:
+            tag_time = commit_time(repo_path, commit)
+        if tag_time is None:
+            return None
+        dated.append((tag_time, name))
+    dated.sort(key=lambda item: (-item[0], item[1]))
+    return [name for _, name in dated]
+
+
+def _ago(count: int, unit: str) -> str:
+    return f"{count} {unit}{'' if count == 1 else 's'}"
+
+
+def relative_time(timestamp: int, now: Optional[float] = None) -> str:
+    """Format a timestamp the way ``git log --format=%cr`` does."""
+    diff = int((time.time() if now is None else now) - timestamp)
+    if diff < 0:
+        return "in the future"
+    if diff < 90:
+        return f"{_ago(diff, 'second')} ago"
+    diff = (diff + 30) // 60
+    if diff < 90:
+        return f"{_ago(diff, 'minute')} ago"
+    diff = (diff + 30) // 60
+    if diff < 36:
+        return f"{_ago(diff, 'hour')} ago"
+    diff = (diff + 12) // 24
+    if diff < 14:
+        return f"{_ago(diff, 'day')} ago"
+    if diff < 70:
+        return f"{_ago((diff + 3) // 7, 'week')} ago"
+    if diff < 365:
+        return f"{_ago((diff + 15) // 30, 'month')} ago"
+    if diff < 1825:
+        years, months = divmod((diff * 12 * 2 + 365) // (365 * 2), 12)
+        if months:
+            return f"{_ago(years, 'year')}, {_ago(months, 'month')} ago"
+        return f"{_ago(years, 'year')} ago"
+    return f"{_ago((diff + 183) // 365, 'year')} ago"
@@ -0,0 +1,25 @@
+import os
+import subprocess
+from typing import Optional
+
+DEFAULT_GIT_JOBS: int = 4
+# Serve ``<owner>/<repo>`` plugins from elsewhere, e.g. a mirror or local repos
+GITHUB_URL: str = os.environ.get("COFFEE_GIT_BASE_URL", "https://github.com")
+
+
+def repo_url(repo: str) -> str:
+    """Turn an ``<owner>/<repo>`` path into a clone URL; full URLs pass through."""
+    if "://" in repo or repo.startswith("git@") or repo.startswith("/"):
+        return repo
+    return f"{GITHUB_URL}/{repo}"
+
+
+def run_git(cwd: Optional[str], *args: str) -> Optional[str]:
+    """Run a git command quietly; return its stripped stdout, or None on failure."""
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
@@ -0,0 +1,171 @@
+import itertools
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from core.git_utils import DEFAULT_GIT_JOBS
+
+# Lower runs first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+
+# Job states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+def url_host(url: Optional[str]) -> str:
+    """Group jobs by the host they talk to; local repos share one group."""
+    if not url:
+        return "local"
+    if url.startswith("git@"):
+        return url[len("git@") :].split(":", 1)[0]
+    return urlparse(url).hostname or "local"
+
+
+class Job:
+    """Handle for a submitted job; ``join`` waits, ``cancel`` drops it if queued."""
+
+    def __init__(
+        self,
+        scheduler: "JobScheduler",
+        key: str,
+        fn: Callable[[], Any],
+        host: str,
+        priority: int,
+    ) -> None:
+        self.key = key
+        self.host = host
+        self.priority = priority
+        self.state = PENDING
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._fn = fn
+        self._scheduler = scheduler
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def cancel(self) -> bool:
+        return self._scheduler.cancel(self)
+
+    def _finish(self, state: str) -> None:
+        self.state = state
+        self._done.set()
+
+
+class JobScheduler:
+    """
+    Runs jobs on a bounded pool of worker threads.
+
+    Queued jobs are picked by priority; among equal priorities the job whose
+    host has the fewest running jobs goes first, then submission order, and
+    no more than ``per_host`` jobs talk to the same host at once, so one slow
+    or rate-limited remote can't hold every worker. Submitting a key that is
+    still queued or running returns the existing job. Workers are started on
+    demand and exit once the queue is empty.
+    """
+
+    def __init__(
+        self, max_workers: int = DEFAULT_GIT_JOBS, per_host: Optional[int] = None
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host or self.max_workers)
+        self._queue: List[Tuple[int, Job]] = []
+        self._jobs: Dict[str, Job] = {}
+        self._running_hosts: Dict[str, int] = {}
+        self._workers = 0
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+    def submit(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        host: str = "local",
+        priority: int = PRIORITY_NORMAL,
+    ) -> Job:
+        with self._cond:
+            job = self._jobs.get(key)
+            if job is not None and not job.finished:
+                job.priority = min(job.priority, priority)
+                return job
+
+            job = Job(self, key, fn, host, priority)
+            self._jobs[key] = job
+            self._queue.append((next(self._counter), job))
+            if self._workers < self.max_workers:
+                self._workers += 1
+                threading.Thread(target=self._work, daemon=True).start()
+            else:
+                self._cond.notify()
+            return job
+
+    def get(self, key: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(key)
+
+    def cancel(self, job: Job) -> bool:
+        """Cancel a queued job. Running jobs can't be interrupted."""
+        with self._cond:
+            if job.state != PENDING:
+                return job.state == CANCELLED
+            job._finish(CANCELLED)
+            self._queue = [entry for entry in self._queue if entry[1] is not job]
+            self._cond.notify_all()
+            return True
+
+    def join(self, jobs: Optional[List[Job]] = None) -> None:
+        with self._cond:
+            jobs = list(self._jobs.values()) if jobs is None else jobs
+        for job in jobs:
+            job.join()
+
+    def _next_job(self) -> Optional[Job]:
+        ready = [
+            entry
+            for entry in self._queue
+            if self._running_hosts.get(entry[1].host, 0) < self.per_host
+        ]
+        if not ready:
+            return None
+        entry = min(
+            ready,
+            key=lambda e: (e[1].priority, self._running_hosts.get(e[1].host, 0), e[0]),
+        )
+        self._queue.remove(entry)
+        return entry[1]
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if not self._queue:
+                        self._workers -= 1
+                        return
+                    # Everything left waits on a busy host
+                    self._cond.wait()
+                    job = self._next_job()
+                job.state = RUNNING
+                self._running_hosts[job.host] = self._running_hosts.get(job.host, 0) + 1
+
+            state = DONE
+            try:
+                job.result = job._fn()
+            except Exception as e:
+                job.error = e
+                state = FAILED
+
+            with self._cond:
+                self._running_hosts[job.host] -= 1
+                job._finish(state)
+                self._cond.notify_all()
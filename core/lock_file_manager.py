@@ -1,6 +1,9 @@
 import json
 import os
-from typing import Any, Dict, TypedDict
+import threading
+from typing import Any, Dict, Optional, Tuple, TypedDict
+
+from core import tracing
 
 COFFEE_DIR: str = os.path.expanduser("~/.tmux/coffee")
 LOCK_FILE_PATH: str = os.path.join(COFFEE_DIR, "caffeine-lock.json")
@@ -12,15 +15,32 @@ class LockData(TypedDict):
 
 def read_lock_file() -> LockData:
     try:
-        with open(LOCK_FILE_PATH, "r") as f:
+        with tracing.traced_open(LOCK_FILE_PATH, "r") as f:
             return json.load(f)
     except Exception:
         return {"plugins": []}
 
 
 def write_lock_file(data: LockData) -> None:
+    # Write a sibling file and rename it over the lock file so readers never
+    # see a partial write
+    tmp_path = f"{LOCK_FILE_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with open(LOCK_FILE_PATH, "w") as f:
+        with tracing.traced_open(tmp_path, "w") as f:
             json.dump(data, f, indent=4)
+        os.replace(tmp_path, LOCK_FILE_PATH)
     except Exception as e:
         print(f"Error writing lock file: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def get_lock_file_signature() -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of the lock file, or None if it doesn't exist."""
+    try:
+        st = os.stat(LOCK_FILE_PATH)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
@@ -0,0 +1,345 @@
+import atexit
+import fcntl
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from core import lock_file_manager as lfm
+from core import tracing
+
+METRICS_DIR: str = os.path.join(lfm.COFFEE_DIR, "metrics")
+# "openmetrics" for an OpenMetrics snapshot, any other value for a
+# Prometheus textfile-collector file; unset leaves metrics off
+METRICS_FORMAT: str = os.environ.get("COFFEE_METRICS", "")
+PROMETHEUS = "prometheus"
+OPENMETRICS = "openmetrics"
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = False
+_format = PROMETHEUS
+_lock = threading.Lock()
+_registry: Dict[str, "_Metric"] = {}
+# Size baseline and number of open count_growth blocks, per directory
+_growth: Dict[str, Tuple[int, int]] = {}
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self.samples: Dict[Labels, Any] = {}
+        _registry[name] = self
+
+    def _key(self, labels: Dict[str, Any]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if not _enabled:
+            return
+        key = self._key(labels)
+        with _lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels: Any) -> None:
+        if not _enabled:
+            return
+        key = self._key(labels)
+        with _lock:
+            # Per-bucket counts (not cumulative), then sum and count
+            sample = self.samples.setdefault(
+                key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample["buckets"][i] += 1
+                    break
+            sample["sum"] += value
+            sample["count"] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the block's duration with result="failure" if it raised."""
+        if not _enabled:
+            yield
+            return
+        start = time.perf_counter()
+        result = "failure"
+        try:
+            yield
+            result = "success"
+        finally:
+            self.observe(time.perf_counter() - start, result=result, **labels)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(fmt: str = PROMETHEUS) -> None:
+    """
+    Start collecting; the totals are merged into METRICS_DIR at exit.
+
+    Subprocesses are counted through the tracing hook, so a count per git
+    command and its failures come for free.
+    """
+    global _enabled, _format
+    if _enabled:
+        return
+    _format = OPENMETRICS if fmt == OPENMETRICS else PROMETHEUS
+    _enabled = True
+    tracing.add_listener(_count_command)
+    atexit.register(flush)
+
+
+def timed(histogram: Histogram, succeeded: Callable[[Any], bool] = bool) -> Callable:
+    """Observe how long each call takes, labelled by ``succeeded(result)``."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = succeeded(result)
+                return result
+            finally:
+                histogram.observe(
+                    time.perf_counter() - start, result="success" if ok else "failure"
+                )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+@contextmanager
+def count_growth(
+    counter: Counter, path: Optional[str], **labels: Any
+) -> Iterator[None]:
+    """
+    Add how many bytes ``path`` grew by while the block ran to ``counter``.
+
+    Used on object directories to approximate the bytes a fetch brought in.
+    Parallel jobs fetching into the same store share one baseline, so each
+    byte is counted once per batch, though not always for the job that
+    fetched it. Growth from other processes is counted too.
+    """
+    if not _enabled or not path:
+        yield
+        return
+    size = _dir_size(path)
+    with _lock:
+        baseline, active = _growth.get(path, (size, 0))
+        _growth[path] = (baseline, active + 1)
+    try:
+        yield
+    finally:
+        size = _dir_size(path)
+        with _lock:
+            baseline, active = _growth[path]
+            grown = max(0, size - baseline)
+            if active > 1:
+                _growth[path] = (max(baseline, size), active - 1)
+            else:
+                del _growth[path]
+        counter.inc(grown, **labels)
+
+
+INSTALL_SECONDS = Histogram(
+    "coffee_install_duration_seconds", "Time to clone and check out a plugin."
+)
+UPDATE_SECONDS = Histogram(
+    "coffee_update_duration_seconds", "Time to fetch and switch a plugin version."
+)
+REMOVE_SECONDS = Histogram("coffee_remove_duration_seconds", "Time to remove a plugin.")
+SOURCE_SECONDS = Histogram(
+    "coffee_source_duration_seconds", "Time to source a plugin, by plugin."
+)
+RETRIES = Counter("coffee_retries_total", "Operations retried another way.")
+FETCHED_BYTES = Counter(
+    "coffee_fetched_bytes_total",
+    "Approximate bytes fetched, from object growth per batch.",
+)
+COMMANDS = Counter("coffee_commands_total", "Subprocesses run, by command and result.")
+COMMAND_SECONDS = Histogram(
+    "coffee_command_duration_seconds", "Time spent in subprocesses, by command."
+)
+
+
+def _count_command(span: tracing.Span) -> None:
+    if span.category != tracing.SUBPROCESS:
+        return
+    result = "ok" if span.args.get("exit_code") == 0 else "error"
+    COMMANDS.inc(command=span.name, result=result)
+    COMMAND_SECONDS.observe(span.duration, command=span.name)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: List[List[str]], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [tuple(pair) for pair in labels] + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(state: Dict[str, Any], fmt: str = PROMETHEUS) -> str:
+    """Render merged totals as Prometheus text or OpenMetrics."""
+    lines: List[str] = []
+    for name in sorted(state):
+        metric = state[name]
+        family = name
+        if fmt == OPENMETRICS and metric["type"] == "counter":
+            # OpenMetrics names the family without the _total suffix
+            family = name[: -len("_total")] if name.endswith("_total") else name
+        lines.append(f"# HELP {family} {metric['help']}")
+        lines.append(f"# TYPE {family} {metric['type']}")
+        for labels, value in metric["samples"]:
+            if metric["type"] == "counter":
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric["buckets"], value["buckets"]):
+                cumulative += count
+                le = _labels(labels, ("le", _number(float(bound))))
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            le = _labels(labels, ("le", "+Inf"))
+            lines.append(f"{name}_bucket{le} {value['count']}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(value['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {value['count']}")
+    if fmt == OPENMETRICS:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def _merge(state: Dict[str, Any], metric: _Metric, samples: Dict[Labels, Any]) -> None:
+    entry = state.setdefault(
+        metric.name, {"type": metric.kind, "help": metric.help, "samples": []}
+    )
+    entry["help"] = metric.help
+    if isinstance(metric, Histogram):
+        if entry.get("buckets") != list(metric.buckets):
+            # Bucket bounds changed; old counts can't be carried over
+            entry["buckets"] = list(metric.buckets)
+            entry["samples"] = []
+    totals = {tuple(map(tuple, labels)): value for labels, value in entry["samples"]}
+    for key, value in samples.items():
+        if isinstance(metric, Counter):
+            totals[key] = totals.get(key, 0) + value
+            continue
+        if not isinstance(metric, Histogram):
+            continue
+        total = totals.setdefault(
+            key, {"buckets": [0] * len(metric.buckets), "sum": 0.0, "count": 0}
+        )
+        total["buckets"] = [a + b for a, b in zip(total["buckets"], value["buckets"])]
+        total["sum"] += value["sum"]
+        total["count"] += value["count"]
+    entry["samples"] = [
+        [[list(pair) for pair in key], value] for key, value in sorted(totals.items())
+    ]
+
+
+def flush() -> Optional[str]:
+    """
+    Add this process's samples to the totals in METRICS_DIR and rewrite the
+    exported file. Counters keep growing across runs, as Prometheus expects.
+    Returns the file written, or None when there was nothing to do.
+    """
+    if not _enabled:
+        return None
+    with _lock:
+        pending = {
+            metric: dict(metric.samples)
+            for metric in _registry.values()
+            if metric.samples
+        }
+        for metric in pending:
+            metric.samples.clear()
+    if not pending:
+        return None
+
+    out_path = os.path.join(
+        METRICS_DIR, "coffee.om" if _format == OPENMETRICS else "coffee.prom"
+    )
+    state_path = os.path.join(METRICS_DIR, "state.json")
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        # Every coffee process on the host merges into the same totals
+        with open(os.path.join(METRICS_DIR, "state.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(state_path, "r") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            for metric, samples in pending.items():
+                _merge(state, metric, samples)
+            for path, text in (
+                (state_path, json.dumps(state)),
+                (out_path, render(state, _format)),
+            ):
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+    except OSError:
+        return None
+    return out_path
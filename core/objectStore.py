@@ -0,0 +1,199 @@
+import os
+import re
+import subprocess
+import threading
+from typing import Dict, List, Optional, Set
+
+from core import lock_file_manager as lfm
+from core.git_reader import common_dir, git_dir
+from core.git_utils import run_git
+
+# Point several profiles at the same store to share objects between them
+OBJECT_STORE_PATH: str = os.environ.get(
+    "COFFEE_OBJECT_STORE", os.path.join(lfm.COFFEE_DIR, "objects.git")
+)
+
+_url_locks: Dict[str, threading.Lock] = {}
+_url_locks_guard = threading.Lock()
+
+
+def _namespace(url: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", url).strip("_")
+
+
+def _url_lock(url: str) -> threading.Lock:
+    with _url_locks_guard:
+        return _url_locks.setdefault(url, threading.Lock())
+
+
+class ObjectStore:
+    """
+    A bare repository that holds the objects of every plugin clone.
+
+    Each remote is fetched into its own ``refs/coffee/<remote>/`` namespace so
+    its objects stay reachable, and plugin checkouts borrow them through
+    ``objects/info/alternates`` instead of keeping a copy. Forks and repos
+    installed under several names only download and store shared history once.
+
+    Checkouts may still need commits a remote has since deleted or
+    force-pushed away, so the store is append-only: fetches never prune it,
+    and only ``coffee gc`` does, after pinning what every checkout uses (or
+    giving checkouts that can't be pinned their own copy).
+    """
+
+    def __init__(self, path: str = OBJECT_STORE_PATH) -> None:
+        self.path = path
+
+    @property
+    def objects_dir(self) -> str:
+        return os.path.join(self.path, "objects")
+
+    def ensure(self) -> bool:
+        if os.path.isdir(self.objects_dir):
+            return True
+        return run_git(None, "init", "-q", "--bare", self.path) is not None
+
+    def fetch(self, url: str) -> bool:
+        """Fetch every branch and tag of ``url`` into the store."""
+        if not self.ensure():
+            return False
+        namespace = f"refs/coffee/{_namespace(url)}"
+        # Fetches of one remote into the same refs must not race each other
+        with _url_lock(url):
+            return (
+                run_git(
+                    self.path,
+                    "-c",
+                    "gc.auto=0",
+                    "fetch",
+                    "-q",
+                    "--no-tags",
+                    url,
+                    f"+refs/heads/*:{namespace}/heads/*",
+                    f"+refs/tags/*:{namespace}/tags/*",
+                )
+                is not None
+            )
+
+    def clone(self, url: str, dest: str) -> bool:
+        """Clone ``url`` into ``dest`` borrowing objects from the store."""
+        if not self.fetch(url):
+            return False
+        return (
+            run_git(None, "clone", "-q", "--reference", self.path, url, dest)
+            is not None
+        )
+
+    def pin(self, name: str, repo_path: str) -> bool:
+        """
+        Keep everything a checkout borrows reachable in the store.
+
+        Each of its refs and worktree HEADs gets a ``refs/coffee/pins/<name>/``
+        ref in the store. That only works if the store has those objects
+        and the checkout isn't shallow. Otherwise False is returned and the
+        checkout has to be made self-contained with ``release`` instead.
+        """
+        if run_git(repo_path, "rev-parse", "--is-shallow-repository") != "false":
+            return False
+        refs = run_git(repo_path, "for-each-ref", "--format=%(objectname)")
+        worktrees = run_git(repo_path, "worktree", "list", "--porcelain")
+        if refs is None or worktrees is None:
+            return False
+        ids = set(refs.split()) | {
+            line.split()[1]
+            for line in worktrees.splitlines()
+            if line.startswith("HEAD ")
+        }
+        if not self._has_objects(ids):
+            return False
+
+        prefix = f"refs/coffee/pins/{name}/"
+        pinned = run_git(self.path, "for-each-ref", "--format=%(refname)", prefix)
+        stale = {ref for ref in (pinned or "").splitlines()} - {
+            f"{prefix}{oid}" for oid in ids
+        }
+        commands = [f"delete {ref}" for ref in sorted(stale)] + [
+            f"update {prefix}{oid} {oid}" for oid in sorted(ids)
+        ]
+        return self._git_input(["update-ref", "--stdin"], commands) is not None
+
+    def release(self, repo_path: str) -> bool:
+        """Copy the objects a checkout borrows into it and stop borrowing."""
+        alternates = borrows_objects(repo_path)
+        if alternates is None:
+            return True
+        # Without -l, repack also packs the objects found through alternates
+        if run_git(repo_path, "repack", "-a", "-d", "-q") is None:
+            return False
+        try:
+            os.remove(alternates)
+        except OSError:
+            return False
+        return True
+
+    def _has_objects(self, ids: Set[str]) -> bool:
+        output = self._git_input(["cat-file", "--batch-check"], sorted(ids))
+        return output is not None and "missing" not in output
+
+    def _git_input(self, args: List[str], lines: List[str]) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.path,
+                input="".join(f"{line}\n" for line in lines),
+                capture_output=True,
+                text=True,
+            )
+        except OSError:
+            return None
+        return result.stdout if result.returncode == 0 else None
+
+    def unpin(self, name: str) -> None:
+        """Drop the pins of a plugin that is no longer installed."""
+        refs = run_git(
+            self.path,
+            "for-each-ref",
+            "--format=%(refname)",
+            f"refs/coffee/pins/{name}/",
+        )
+        for ref in (refs or "").splitlines():
+            run_git(self.path, "update-ref", "-d", ref)
+
+    def pinned_names(self) -> List[str]:
+        refs = run_git(
+            self.path, "for-each-ref", "--format=%(refname)", "refs/coffee/pins/"
+        )
+        prefix = "refs/coffee/pins/"
+        return sorted(
+            {ref[len(prefix) :].split("/", 1)[0] for ref in (refs or "").splitlines()}
+        )
+
+    def borrow(self, repo_path: str) -> bool:
+        """Make an existing repository read objects from the store."""
+        if not self.ensure():
+            return False
+        info_dir = _objects_info_dir(repo_path)
+        if info_dir is None:
+            return False
+        try:
+            os.makedirs(info_dir, exist_ok=True)
+            with open(os.path.join(info_dir, "alternates"), "w") as f:
+                f.write(f"{self.objects_dir}\n")
+        except OSError:
+            return False
+        return True
+
+
+def _objects_info_dir(repo_path: str) -> Optional[str]:
+    # Worktrees share the objects of their main repository
+    path = git_dir(repo_path)
+    return os.path.join(common_dir(path), "objects", "info") if path else None
+
+
+def borrows_objects(repo_path: str) -> Optional[str]:
+    """Return the alternates file of a checkout, if it borrows objects."""
+    info_dir = _objects_info_dir(repo_path)
+    if info_dir is None:
+        return None
+    alternates = os.path.join(info_dir, "alternates")
+    return alternates if os.path.exists(alternates) else None
@@ -0,0 +1,280 @@
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from core import lock_file_manager as lfm
+from core.git_reader import read_head
+from core.git_utils import DEFAULT_GIT_JOBS, repo_url, run_git
+from core.objectStore import borrows_objects
+from core.pluginConfig import PLUGIN_NAME_PATTERN
+from core.staging import commit_staged, staging_path
+from core.worktrees import uses_versions
+
+BUNDLE_VERSION: int = 1
+MANIFEST_NAME: str = "manifest.json"
+
+# Import outcomes
+IMPORTED = "imported"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+def _escapes(path: str) -> bool:
+    """Whether a relative path leaves the directory it is relative to."""
+    return os.path.isabs(path) or os.path.normpath(path).split(os.sep)[0] == ".."
+
+
+def _extract(archive: tarfile.TarFile, path: str) -> None:
+    if hasattr(tarfile, "data_filter"):
+        archive.extractall(path, filter="data")
+        return
+    # Without extraction filters, refuse members that would land outside path
+    for member in archive.getmembers():
+        if member.issym():
+            link = os.path.join(os.path.dirname(member.name), member.linkname)
+        else:
+            link = member.linkname if member.islnk() else ""
+        if _escapes(member.name) or _escapes(link):
+            raise ValueError(f"unsafe archive member {member.name!r}")
+    archive.extractall(path)
+
+
+def _check_entry(entry: Dict[str, Any]) -> None:
+    """
+    Reject manifest entries that would touch anything outside their plugin.
+
+    The manifest comes from the archive, so names, members and sources are
+    checked before any of them is joined into a path.
+    """
+    lock = entry.get("lock") if isinstance(entry, dict) else None
+    if not isinstance(lock, dict):
+        raise ValueError("bundle entry without a lock entry")
+    name = lock.get("name")
+    if not isinstance(name, str) or not PLUGIN_NAME_PATTERN.match(name):
+        raise ValueError(f"invalid plugin name {name!r}")
+    if entry.get("member") not in (f"{name}.bundle", f"{name}.tar.gz"):
+        raise ValueError(f"{name}: unexpected member {entry.get('member')!r}")
+    sources = lock.get("sources", [])
+    if not isinstance(sources, list):
+        raise ValueError(f"{name}: 'sources' must be a list")
+    for source in sources:
+        # Sources are stored relative to the plugins directory: "<name>/..."
+        if (
+            not isinstance(source, str)
+            or _escapes(source)
+            or not os.path.normpath(source).startswith(name + os.sep)
+        ):
+            raise ValueError(f"{name}: source {source!r} is outside the plugin")
+
+
+class PluginBundler:
+    """
+    Packs installed plugins and their lock entries into one portable archive.
+
+    The archive is an uncompressed tar holding a manifest and one member per
+    plugin: a gzipped tree of the checkout, or a git bundle. Members are
+    independent, so both export and import compress and extract in parallel.
+    Source paths are stored relative to the plugins directory and rebuilt
+    against the importing machine's directory.
+    """
+
+    def __init__(self, plugins_dir: str, max_workers: int = DEFAULT_GIT_JOBS) -> None:
+        self.plugins_dir = plugins_dir
+        self.max_workers = max(1, max_workers)
+
+    def export_bundle(
+        self,
+        archive_path: str,
+        names: Optional[List[str]] = None,
+        git_bundles: bool = False,
+    ) -> List[str]:
+        """Write the installed plugins to ``archive_path``; return their names."""
+        lock_data = lfm.read_lock_file()
+        plugins = [
+            plugin
+            for plugin in lock_data.get("plugins", [])
+            if (names is None or plugin.get("name") in names)
+            and os.path.isdir(os.path.join(self.plugins_dir, plugin.get("name", "")))
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                members = list(
+                    executor.map(
+                        lambda plugin: self._pack_plugin(plugin, tmp_dir, git_bundles),
+                        plugins,
+                    )
+                )
+
+            manifest = {
+                "version": BUNDLE_VERSION,
+                "plugins": [
+                    {"member": member, "lock": self._relative_entry(plugin)}
+                    for plugin, member in zip(plugins, members)
+                ],
+            }
+            tmp_archive = f"{archive_path}.tmp"
+            with tarfile.open(tmp_archive, "w") as archive:
+                data = json.dumps(manifest, indent=2).encode()
+                info = tarfile.TarInfo(MANIFEST_NAME)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+                for member in members:
+                    archive.add(os.path.join(tmp_dir, member), arcname=member)
+            os.replace(tmp_archive, archive_path)
+
+        return [plugin["name"] for plugin in plugins]
+
+    def import_bundle(self, archive_path: str, force: bool = False) -> Dict[str, str]:
+        """Unpack a bundle and merge its lock entries; return each plugin's outcome."""
+        os.makedirs(self.plugins_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with tarfile.open(archive_path, "r") as archive:
+                _extract(archive, tmp_dir)
+            with open(os.path.join(tmp_dir, MANIFEST_NAME), "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != BUNDLE_VERSION:
+                raise ValueError(
+                    f"Unsupported bundle version {manifest.get('version')!r}"
+                )
+
+            entries: List[Dict[str, Any]] = manifest.get("plugins", [])
+            for entry in entries:
+                _check_entry(entry)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                outcomes = list(
+                    executor.map(
+                        lambda entry: self._unpack_plugin(entry, tmp_dir, force),
+                        entries,
+                    )
+                )
+
+        results: Dict[str, str] = {}
+        imported: List[Dict[str, Any]] = []
+        for entry, outcome in zip(entries, outcomes):
+            name = entry["lock"]["name"]
+            results[name] = outcome
+            if outcome == IMPORTED:
+                imported.append(self._absolute_entry(entry["lock"]))
+
+        if imported:
+            lock_data = lfm.read_lock_file()
+            names = {plugin["name"] for plugin in imported}
+            lock_data["plugins"] = [
+                p for p in lock_data.get("plugins", []) if p.get("name") not in names
+            ] + imported
+            lfm.write_lock_file(lock_data)
+        return results
+
+    def _pack_plugin(
+        self, plugin: Dict[str, Any], tmp_dir: str, git_bundles: bool
+    ) -> str:
+        name = plugin["name"]
+        plugin_path = os.path.join(self.plugins_dir, name)
+        # Shallow clones can't be bundled without their missing history, and
+        # anything that isn't a git checkout has nothing to bundle. Checkouts
+        # borrowing from the object store are always bundled, since their
+        # tree alone is missing the borrowed objects, and so are versioned
+        # plugins, whose repository lives outside the tree.
+        shallow = run_git(plugin_path, "rev-parse", "--is-shallow-repository")
+        borrowed = borrows_objects(plugin_path) is not None
+        versioned = uses_versions(plugin_path)
+        if (git_bundles or borrowed or versioned) and shallow == "false":
+            member = f"{name}.bundle"
+            bundle_path = os.path.join(tmp_dir, member)
+            if (
+                run_git(plugin_path, "bundle", "create", bundle_path, "--all")
+                is not None
+            ):
+                return member
+        if versioned:
+            # The worktree's .git file points outside the archive, so pack a
+            # standalone clone of the active version instead
+            plugin_path = self._standalone_copy(plugin, plugin_path, tmp_dir)
+        member = f"{name}.tar.gz"
+        with tarfile.open(os.path.join(tmp_dir, member), "w:gz") as archive:
+            archive.add(plugin_path, arcname=name)
+        return member
+
+    def _standalone_copy(
+        self, plugin: Dict[str, Any], plugin_path: str, tmp_dir: str
+    ) -> str:
+        copy_path = os.path.join(tmp_dir, f"{plugin['name']}.checkout")
+        source = f"file://{os.path.realpath(plugin_path)}"
+        head = read_head(plugin_path) or "HEAD"
+        if (
+            run_git(None, "clone", "-q", "--no-checkout", source, copy_path) is None
+            or run_git(copy_path, "checkout", "-q", "--detach", head) is None
+        ):
+            shutil.rmtree(copy_path, ignore_errors=True)
+            return os.path.realpath(plugin_path)
+        repo = plugin.get("git", {}).get("repo")
+        if repo:
+            run_git(copy_path, "remote", "set-url", "origin", repo_url(repo))
+        return copy_path
+
+    def _unpack_plugin(self, entry: Dict[str, Any], tmp_dir: str, force: bool) -> str:
+        lock = entry["lock"]
+        name = lock["name"]
+        plugin_path = os.path.join(self.plugins_dir, name)
+        if os.path.exists(plugin_path) and not force:
+            return SKIPPED
+
+        staging_root = staging_path(self.plugins_dir, name)
+        staged_path = os.path.join(staging_root, name)
+        member_path = os.path.join(tmp_dir, entry["member"])
+        try:
+            if entry["member"].endswith(".bundle"):
+                if not self._clone_bundle(member_path, staged_path, lock):
+                    return FAILED
+            else:
+                with tarfile.open(member_path, "r:gz") as archive:
+                    _extract(archive, staging_root)
+
+            if not commit_staged(staged_path, plugin_path, replace=True):
+                return FAILED
+            return IMPORTED
+        except Exception:
+            return FAILED
+        finally:
+            shutil.rmtree(staging_root, ignore_errors=True)
+
+    def _clone_bundle(
+        self, bundle_path: str, staging_path: str, lock: Dict[str, Any]
+    ) -> bool:
+        git_info = lock.get("git", {})
+        if (
+            run_git(None, "clone", "-q", "--no-checkout", bundle_path, staging_path)
+            is None
+        ):
+            return False
+        target = git_info.get("commit_hash") or "HEAD"
+        if run_git(staging_path, "checkout", "-q", "--detach", target) is None:
+            return False
+        if git_info.get("repo"):
+            # Point origin back at the real remote rather than the bundle file
+            run_git(
+                staging_path, "remote", "set-url", "origin", repo_url(git_info["repo"])
+            )
+        return True
+
+    def _relative_entry(self, plugin: Dict[str, Any]) -> Dict[str, Any]:
+        entry = dict(plugin)
+        entry["sources"] = [
+            os.path.relpath(source, self.plugins_dir)
+            for source in plugin.get("sources", [])
+        ]
+        return entry
+
+    def _absolute_entry(self, plugin: Dict[str, Any]) -> Dict[str, Any]:
+        entry = dict(plugin)
+        entry["sources"] = [
+            os.path.join(self.plugins_dir, source)
+            for source in plugin.get("sources", [])
+        ]
+        return entry
@@ -0,0 +1,216 @@
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from core import lock_file_manager as lfm
+from core.generations import list_generations
+from core.git_reader import common_dir, git_dir
+from core.git_utils import DEFAULT_GIT_JOBS, run_git
+from core.objectStore import ObjectStore, borrows_objects
+from core.pluginPrefetcher import forget_prefetched
+
+KEEP_REFS: str = "refs/coffee/keep/"
+
+GC_STAMP_PATH: str = os.path.join(lfm.COFFEE_DIR, "gc.stamp")
+GC_INTERVAL: float = 7 * 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class CompactResult:
+    name: str
+    before: int
+    after: int
+    ok: bool
+
+    @property
+    def reclaimed(self) -> int:
+        return max(0, self.before - self.after)
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            try:
+                total += os.lstat(os.path.join(root, file)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def generation_commits() -> Dict[str, Set[str]]:
+    """The commit of every plugin in every recorded generation, by plugin."""
+    commits: Dict[str, Set[str]] = {}
+    for record in list_generations():
+        for plugin in record.get("lock", {}).get("plugins", []):
+            commit = plugin.get("git", {}).get("commit_hash")
+            if plugin.get("name") and commit:
+                commits.setdefault(plugin["name"], set()).add(commit)
+    return commits
+
+
+def gc_due(interval: float = GC_INTERVAL) -> bool:
+    """Whether the last gc ran longer than ``interval`` seconds ago."""
+    try:
+        return time.time() - os.stat(GC_STAMP_PATH).st_mtime >= interval
+    except OSError:
+        return True
+
+
+class PluginCompactor:
+    """
+    Compacts the git repositories of installed plugins.
+
+    Every plugin drops its reflogs and any tags other than the locked one, then
+    repacks and prunes unreachable objects. Commits named in recorded
+    generations are kept under ``refs/coffee/keep/`` so rollbacks still work
+    offline. With ``shallow`` the history behind the locked commit is cut off
+    as well, except where a generation needs it. Plugins run in parallel and
+    the shared object store is repacked last, once every checkout has pinned
+    the commits it borrows.
+    """
+
+    def __init__(self, plugins_dir: str, max_workers: int = DEFAULT_GIT_JOBS) -> None:
+        self.plugins_dir = plugins_dir
+        self.max_workers = max(1, max_workers)
+
+    def compact_plugins(
+        self, names: Optional[List[str]] = None, shallow: bool = False
+    ) -> List[CompactResult]:
+        lock_data = lfm.read_lock_file()
+        plugins = [
+            plugin
+            for plugin in lock_data.get("plugins", [])
+            if (names is None or plugin.get("name") in names)
+            and git_dir(os.path.join(self.plugins_dir, plugin["name"])) is not None
+        ]
+
+        keep = generation_commits()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda p: self.compact_plugin(
+                        p, shallow, keep.get(p["name"], set())
+                    ),
+                    plugins,
+                )
+            )
+        # Compacting deleted the prefetched tags and refs the update check
+        # would otherwise trust
+        forget_prefetched([plugin["name"] for plugin in plugins])
+
+        store = ObjectStore()
+        if names is None and os.path.isdir(store.objects_dir):
+            results.append(self.compact_store(store))
+
+        try:
+            with open(GC_STAMP_PATH, "w") as f:
+                f.write(f"{time.time()}\n")
+        except OSError:
+            pass
+        return results
+
+    def compact_store(self, store: ObjectStore) -> CompactResult:
+        """
+        Pin what every checkout borrows, then repack the store.
+
+        Checkouts under the plugins directory are pinned whether or not they
+        are in the lock file. Shallow ones, or ones holding commits the store
+        lacks, get their own copy of the objects instead. If any checkout can
+        be neither pinned nor released, nothing is pruned.
+        """
+        before = dir_size(store.path)
+        try:
+            entries = os.listdir(self.plugins_dir)
+        except OSError:
+            entries = []
+        borrowers = [
+            entry
+            for entry in entries
+            if not entry.startswith(".")
+            and borrows_objects(os.path.join(self.plugins_dir, entry)) is not None
+        ]
+        ok = True
+        pinned: Set[str] = set()
+        for name in borrowers:
+            plugin_path = os.path.join(self.plugins_dir, name)
+            if store.pin(name, plugin_path):
+                pinned.add(name)
+            elif not store.release(plugin_path):
+                ok = False
+        if ok:
+            for name in set(store.pinned_names()) - pinned:
+                store.unpin(name)
+            ok = run_git(store.path, "gc", "-q", "--prune=now") is not None
+        return CompactResult("(object store)", before, dir_size(store.path), ok)
+
+    def compact_plugin(
+        self,
+        plugin: Dict[str, Any],
+        shallow: bool = False,
+        keep: Optional[Set[str]] = None,
+    ) -> CompactResult:
+        name = plugin["name"]
+        plugin_path = os.path.join(self.plugins_dir, name)
+        # Versioned plugins keep one repository for all their worktrees
+        repo_dir = common_dir(git_dir(plugin_path) or os.path.join(plugin_path, ".git"))
+        before = dir_size(repo_dir)
+
+        locked_tag = plugin.get("git", {}).get("tag")
+        for tag in (run_git(plugin_path, "tag", "-l") or "").splitlines():
+            if tag and tag != locked_tag:
+                run_git(plugin_path, "tag", "-d", tag)
+        self._write_keep_refs(plugin_path, keep or set())
+
+        if shallow:
+            self._make_shallow(plugin_path, repo_dir)
+
+        ok = (
+            run_git(plugin_path, "reflog", "expire", "--expire=now", "--all")
+            is not None
+            and run_git(plugin_path, "gc", "-q", "--prune=now") is not None
+        )
+        return CompactResult(name, before, dir_size(repo_dir), ok)
+
+    def _write_keep_refs(self, plugin_path: str, commits: Set[str]) -> None:
+        """Point ``refs/coffee/keep/<commit>`` at each commit still on disk."""
+        existing = run_git(
+            plugin_path, "for-each-ref", "--format=%(refname)", KEEP_REFS
+        )
+        for ref in (existing or "").splitlines():
+            if ref[len(KEEP_REFS) :] not in commits:
+                run_git(plugin_path, "update-ref", "-d", ref)
+        for commit in commits:
+            # Commits that were never fetched here can't be kept
+            if run_git(plugin_path, "cat-file", "-e", f"{commit}^{{commit}}") is None:
+                continue
+            run_git(plugin_path, "update-ref", f"{KEEP_REFS}{commit}", commit)
+
+    def _make_shallow(self, plugin_path: str, repo_dir: str) -> None:
+        head = run_git(plugin_path, "rev-parse", "HEAD")
+        if not head:
+            return
+        # Detach at the checked out commit and drop every ref that could keep
+        # older history reachable; the shallow file hides the parents
+        run_git(plugin_path, "checkout", "-q", "--detach", head)
+        refs = run_git(
+            plugin_path,
+            "for-each-ref",
+            "--format=%(refname)",
+            "refs/heads",
+            "refs/remotes",
+        )
+        for ref in (refs or "").splitlines():
+            run_git(plugin_path, "update-ref", "--no-deref", "-d", ref)
+        with open(os.path.join(repo_dir, "shallow"), "w") as f:
+            f.write(f"{head}\n")
+        # A commit-graph written before the cut still lists the pruned commits
+        info_dir = os.path.join(repo_dir, "objects", "info")
+        try:
+            os.remove(os.path.join(info_dir, "commit-graph"))
+        except OSError:
+            pass
+        shutil.rmtree(os.path.join(info_dir, "commit-graphs"), ignore_errors=True)
@@ -0,0 +1,226 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from core.tagIndex import is_constraint, parse_constraint
+
+ENV_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+PLUGIN_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_.-]*$")
+REPO_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$")
+
+
+@dataclass(frozen=True)
+class ConfigError:
+    file: str
+    line: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.file}:{self.line}: {self.message}"
+
+
+class ConfigValidationError(Exception):
+    def __init__(self, errors: List[ConfigError]) -> None:
+        self.errors = errors
+        super().__init__("\n".join(str(e) for e in errors))
+
+
+@dataclass(frozen=True)
+class PluginConfig:
+    __slots__ = (
+        "name",
+        "url",
+        "local",
+        "source",
+        "tag",
+        "skip_auto_update",
+        "enabled",
+        "env",
+        "file",
+        "line",
+    )
+
+    name: str
+    url: str
+    local: bool
+    source: List[str]
+    tag: Optional[str]
+    skip_auto_update: bool
+    enabled: Optional[bool]
+    env: Dict[str, str]
+    file: str
+    line: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "url": self.url,
+            "local": self.local,
+            "source": list(self.source),
+            "tag": self.tag,
+            "skip_auto_update": self.skip_auto_update,
+            "enabled": self.enabled,
+            "env": dict(self.env),
+        }
+
+
+# A checker returns an error message, or None if the value is valid
+Checker = Callable[[Any, Dict[str, Any]], Optional[str]]
+
+
+def _check_name(value: Any, entry: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(value, str) or not value:
+        return "'name' must be a non-empty string"
+    if not PLUGIN_NAME_PATTERN.match(value):
+        return f"'name' {value!r} may only contain letters, digits, '.', '_' and '-'"
+    return None
+
+
+def _check_url(value: Any, entry: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(value, str) or not value:
+        return "'url' must be a non-empty string"
+    if not entry.get("local", False) and not REPO_PATTERN.match(value):
+        return f"'url' {value!r} must look like '<owner>/<repo>'"
+    return None
+
+
+def _check_bool(field: str) -> Checker:
+    def check(value: Any, entry: Dict[str, Any]) -> Optional[str]:
+        if not isinstance(value, bool):
+            return f"'{field}' must be true or false, got {value!r}"
+        return None
+
+    return check
+
+
+def _check_optional_bool(field: str) -> Checker:
+    def check(value: Any, entry: Dict[str, Any]) -> Optional[str]:
+        if value is not None and not isinstance(value, bool):
+            return f"'{field}' must be true or false, got {value!r}"
+        return None
+
+    return check
+
+
+def _check_source(value: Any, entry: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(value, list) or not all(isinstance(s, str) and s for s in value):
+        return "'source' must be a list of script paths"
+    return None
+
+
+def _check_tag(value: Any, entry: Dict[str, Any]) -> Optional[str]:
+    if value is not None and not isinstance(value, str):
+        return (
+            f"'tag' must be a string, got {value!r} (quote it, e.g. tag: \"{value}\")"
+        )
+    if value is not None and is_constraint(value) and parse_constraint(value) is None:
+        return f'\'tag\' {value!r} is not a valid version range (e.g. "^1.2", "~2.0")'
+    return None
+
+
+def _check_env(value: Any, entry: Dict[str, Any]) -> Optional[str]:
+    if not isinstance(value, dict):
+        return "'env' must be a mapping of variable names to strings"
+    for key, env_value in value.items():
+        if not isinstance(key, str) or not ENV_NAME_PATTERN.match(key):
+            return f"'env' has an invalid variable name {key!r}"
+        if not isinstance(env_value, str):
+            return f"'env.{key}' must be a string (quote it)"
+    return None
+
+
+# (field, required, default, checker), compiled once into a lookup table
+_FIELD_SPECS: List[Tuple[str, bool, Any, Checker]] = [
+    ("name", True, "", _check_name),
+    ("url", True, "", _check_url),
+    ("local", False, False, _check_bool("local")),
+    ("source", False, [], _check_source),
+    ("tag", False, None, _check_tag),
+    ("skip_auto_update", False, False, _check_bool("skip_auto_update")),
+    # None leaves the enabled state in the lock file alone
+    ("enabled", False, None, _check_optional_bool("enabled")),
+    ("env", False, {}, _check_env),
+]
+_FIELDS: Dict[str, Tuple[bool, Any, Checker]] = {
+    field: (required, default, checker)
+    for field, required, default, checker in _FIELD_SPECS
+}
+# Keys that may appear next to plugin fields in a single-plugin file
+_FILE_KEYS = {"include"}
+
+
+def _key_lines(node: Optional[yaml.Node]) -> Dict[Any, int]:
+    """Map each key of a YAML mapping node to its 1-based line number."""
+    lines: Dict[Any, int] = {}
+    if isinstance(node, yaml.MappingNode):
+        for key_node, _ in node.value:
+            lines[key_node.value] = key_node.start_mark.line + 1
+    return lines
+
+
+def node_line(node: Optional[yaml.Node]) -> int:
+    return node.start_mark.line + 1 if node is not None else 1
+
+
+def mapping_value_node(node: Optional[yaml.Node], key: str) -> Optional[yaml.Node]:
+    if isinstance(node, yaml.MappingNode):
+        for key_node, value_node in node.value:
+            if key_node.value == key:
+                return value_node
+    return None
+
+
+def validate_plugin(
+    entry: Any, node: Optional[yaml.Node], file: str, allow_file_keys: bool = False
+) -> Tuple[Optional[PluginConfig], List[ConfigError]]:
+    """Validate one plugin entry against the config schema."""
+    line = node_line(node)
+    if not isinstance(entry, dict):
+        return None, [ConfigError(file, line, "plugin entry must be a mapping")]
+
+    errors: List[ConfigError] = []
+    lines = _key_lines(node)
+    values: Dict[str, Any] = {}
+
+    for key in entry:
+        if key not in _FIELDS and not (allow_file_keys and key in _FILE_KEYS):
+            errors.append(
+                ConfigError(file, lines.get(key, line), f"unknown field {key!r}")
+            )
+
+    for field, (required, default, checker) in _FIELDS.items():
+        if field not in entry:
+            if required:
+                errors.append(
+                    ConfigError(file, line, f"missing required field '{field}'")
+                )
+            values[field] = default
+            continue
+        value = entry[field]
+        message = checker(value, entry)
+        if message:
+            errors.append(ConfigError(file, lines.get(field, line), message))
+        values[field] = value
+
+    if errors:
+        return None, errors
+    return PluginConfig(file=file, line=line, **values), []
+
+
+def find_duplicates(configs: List[PluginConfig]) -> List[ConfigError]:
+    errors: List[ConfigError] = []
+    first_seen: Dict[str, PluginConfig] = {}
+    for config in configs:
+        first = first_seen.setdefault(config.name, config)
+        if first is not config:
+            errors.append(
+                ConfigError(
+                    config.file,
+                    config.line,
+                    f"duplicate plugin name {config.name!r} "
+                    f"(first defined at {first.file}:{first.line})",
+                )
+            )
+    return errors
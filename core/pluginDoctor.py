@@ -0,0 +1,218 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from core import lock_file_manager as lfm
+from core.git_reader import read_head
+from core.git_utils import DEFAULT_GIT_JOBS
+from core.pluginConfig import ConfigError
+from core.pluginInstaller import PluginInstaller
+from core.pluginRestorer import FAILED, PluginRestorer
+from core.staging import STAGING_DIRNAME
+from core.worktrees import VERSIONS_DIRNAME, remove_plugin_tree
+
+# Issue kinds, and how --fix repairs them
+UNTRACKED_DIR = "untracked-dir"  # adopt if configured, delete if configs all load
+MISSING_DIR = "missing-dir"  # restore at the locked commit, or drop the entry
+HEAD_MISMATCH = "head-mismatch"  # check out the locked commit
+MISSING_SOURCE = "missing-source"  # rebuild sources from the config
+NOT_INSTALLED = "not-installed"  # needs `coffee sync`
+NOT_CONFIGURED = "not-configured"  # needs `coffee sync`
+CONFIG_ERROR = "config-error"  # needs a config edit
+
+
+@dataclass(frozen=True)
+class DoctorIssue:
+    kind: str
+    name: str
+    message: str
+    fix: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PluginDoctor:
+    """
+    Cross-checks the lock file, the plugins directory and the configs.
+
+    Plugins are checked in parallel, and HEAD is read straight from each
+    checkout's ``.git`` rather than by running git. ``fix`` repairs what it
+    can in one batch, with a single lock file write.
+    """
+
+    def __init__(
+        self,
+        plugins_dir: str,
+        plugins_config: Optional[List[Dict[str, Any]]] = None,
+        config_errors: Optional[List[ConfigError]] = None,
+        max_workers: int = DEFAULT_GIT_JOBS,
+    ) -> None:
+        self.plugins_dir = plugins_dir
+        self.plugins_config = plugins_config
+        self.config_errors = config_errors or []
+        self.max_workers = max(1, max_workers)
+
+    def diagnose(self) -> List[DoctorIssue]:
+        lock_data = lfm.read_lock_file()
+        locked: Dict[str, Dict[str, Any]] = {
+            p["name"]: p for p in lock_data.get("plugins", []) if p.get("name")
+        }
+        try:
+            on_disk = {
+                entry
+                for entry in os.listdir(self.plugins_dir)
+                if entry not in (STAGING_DIRNAME, VERSIONS_DIRNAME)
+                and os.path.isdir(os.path.join(self.plugins_dir, entry))
+            }
+        except OSError:
+            on_disk = set()
+        configured = self._configured()
+
+        issues: List[DoctorIssue] = [
+            DoctorIssue(CONFIG_ERROR, f"{error.file}:{error.line}", error.message)
+            for error in self.config_errors
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for plugin_issues in executor.map(
+                lambda plugin: self._check_plugin(plugin, on_disk, configured),
+                locked.values(),
+            ):
+                issues.extend(plugin_issues)
+
+        for name in sorted(on_disk - set(locked)):
+            message = "directory is not in the lock file"
+            fix: Optional[str] = None
+            if name in configured:
+                fix = "adopt into the lock file"
+            elif self._configs_complete():
+                fix = "delete"
+            else:
+                message += " (kept until every config loads)"
+            issues.append(DoctorIssue(UNTRACKED_DIR, name, message, fix))
+
+        if self.plugins_config is not None:
+            for name in configured:
+                if name not in locked and name not in on_disk:
+                    issues.append(
+                        DoctorIssue(NOT_INSTALLED, name, "configured but not installed")
+                    )
+            for name in locked:
+                if name not in configured:
+                    issues.append(
+                        DoctorIssue(
+                            NOT_CONFIGURED, name, "installed but not configured"
+                        )
+                    )
+        return issues
+
+    def fix(self, issues: List[DoctorIssue]) -> List[DoctorIssue]:
+        """Repair every fixable issue; return the ones that could not be fixed."""
+        fixable = [issue for issue in issues if issue.fix]
+        configured = self._configured()
+        lock_data = lfm.read_lock_file()
+        plugins: Dict[str, Dict[str, Any]] = {
+            p["name"]: p for p in lock_data.get("plugins", []) if p.get("name")
+        }
+        unfixed = [issue for issue in issues if not issue.fix]
+
+        to_restore = [
+            plugins[issue.name]
+            for issue in fixable
+            if issue.kind in (MISSING_DIR, HEAD_MISMATCH)
+            and plugins[issue.name].get("git", {}).get("commit_hash")
+        ]
+        restorer = PluginRestorer(self.plugins_dir, self.max_workers)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            restored = dict(
+                zip(
+                    [plugin["name"] for plugin in to_restore],
+                    executor.map(restorer.restore_plugin, to_restore),
+                )
+            )
+
+        installer = PluginInstaller([], self.plugins_dir, "")
+        for issue in fixable:
+            if issue.kind in (MISSING_DIR, HEAD_MISMATCH):
+                status = restored.get(issue.name)
+                if status is None and issue.kind == MISSING_DIR:
+                    # Nothing to restore from; forget the plugin
+                    plugins.pop(issue.name, None)
+                elif status is None or status == FAILED:
+                    unfixed.append(issue)
+            elif issue.kind == UNTRACKED_DIR:
+                if issue.name in configured:
+                    plugin = configured[issue.name]
+                    plugins[issue.name] = installer._build_lock_entry(
+                        plugin, plugin.get("tag")
+                    )
+                elif not self._configs_complete():
+                    # The plugin may be configured in a file that failed to load
+                    unfixed.append(issue)
+                else:
+                    try:
+                        remove_plugin_tree(self.plugins_dir, issue.name)
+                    except OSError:
+                        unfixed.append(issue)
+            elif issue.kind == MISSING_SOURCE and issue.name in plugins:
+                entry = plugins[issue.name]
+                config = configured.get(issue.name)
+                plugin_path = os.path.join(self.plugins_dir, issue.name)
+                sources = (
+                    [os.path.join(plugin_path, s) for s in config.get("source", [])]
+                    if config
+                    else entry.get("sources", [])
+                )
+                entry["sources"] = [s for s in sources if os.path.exists(s)]
+
+        lock_data["plugins"] = list(plugins.values())
+        lfm.write_lock_file(lock_data)
+        return unfixed
+
+    def _configs_complete(self) -> bool:
+        """Whether every config loaded, so unconfigured plugins can be deleted."""
+        return self.plugins_config is not None and not self.config_errors
+
+    def _configured(self) -> Dict[str, Dict[str, Any]]:
+        return {plugin["name"]: plugin for plugin in self.plugins_config or []}
+
+    def _check_plugin(
+        self,
+        plugin: Dict[str, Any],
+        on_disk: Set[str],
+        configured: Dict[str, Dict[str, Any]],
+    ) -> List[DoctorIssue]:
+        name = plugin.get("name", "")
+        plugin_path = os.path.join(self.plugins_dir, name)
+        commit = plugin.get("git", {}).get("commit_hash")
+
+        if name not in on_disk:
+            fix = "restore at the locked commit" if commit else "drop the lock entry"
+            return [DoctorIssue(MISSING_DIR, name, "plugin directory is missing", fix)]
+
+        issues: List[DoctorIssue] = []
+        head = read_head(plugin_path)
+        if commit and head != commit:
+            found = head[:7] if head else "unreadable"
+            issues.append(
+                DoctorIssue(
+                    HEAD_MISMATCH,
+                    name,
+                    f"HEAD is {found}, lock file has {commit[:7]}",
+                    "check out the locked commit",
+                )
+            )
+
+        missing = [s for s in plugin.get("sources", []) if not os.path.exists(s)]
+        if missing:
+            fix = "rebuild from the config" if name in configured else "drop them"
+            issues.append(
+                DoctorIssue(
+                    MISSING_SOURCE,
+                    name,
+                    "missing source " + ", ".join(os.path.basename(s) for s in missing),
+                    fix,
+                )
+            )
+        return issues
@@ -1,9 +1,16 @@
 import datetime
 import os
+import shutil
 import subprocess
+import time
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+from core import git_reader, git_utils
 from core import lock_file_manager as lfm
+from core import metrics
+from core.objectStore import ObjectStore
+from core.staging import commit_staged, staging_path
+from core.tagIndex import TagIndex, is_constraint, local_tag_index
 
 
 class PluginInstaller:
@@ -32,40 +39,41 @@ class PluginInstaller:
         plugin_path = os.path.join(self.plugins_dir, plugin["name"])
 
         if os.path.exists(plugin_path):
-            return True, plugin.get("tag", None)
+            return True, self._installed_tag(plugin_path, plugin.get("tag"))
 
-        repo_url = f"https://github.com/{plugin['url']}"
+        repo_url = git_utils.repo_url(plugin["url"])
         used_tag = plugin.get("tag")
+        # Build the checkout out of sight and move it into place once complete
+        staged_path = staging_path(self.plugins_dir, plugin["name"])
+        started = time.perf_counter()
 
         try:
-            subprocess.run(
-                ["git", "clone", repo_url, plugin_path],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+            self._clone_repo(repo_url, staged_path)
             subprocess.run(
                 ["git", "fetch", "--tags"],
-                cwd=plugin_path,
+                cwd=staged_path,
                 check=True,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
 
-            if used_tag:
+            if used_tag and not is_constraint(used_tag):
                 subprocess.run(
                     ["git", "checkout", used_tag],
-                    cwd=plugin_path,
+                    cwd=staged_path,
                     check=True,
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL,
                 )
             else:
-                latest_tag = self._get_latest_tag(plugin_path)
+                # Pick the newest tag, or the newest one in the configured range
+                latest_tag = self._get_latest_tag(staged_path, used_tag)
+                if used_tag and not latest_tag:
+                    raise ValueError(f"no tag matches {used_tag}")
                 if latest_tag:
                     subprocess.run(
                         ["git", "checkout", f"tags/{latest_tag}"],
-                        cwd=plugin_path,
+                        cwd=staged_path,
                         check=True,
                         stdout=subprocess.DEVNULL,
                         stderr=subprocess.DEVNULL,
@@ -73,42 +81,59 @@ class PluginInstaller:
                     used_tag = latest_tag
 
         except Exception:
+            shutil.rmtree(staged_path, ignore_errors=True)
+            metrics.INSTALL_SECONDS.observe(
+                time.perf_counter() - started, result="failure"
+            )
             return False, None
 
+        # Losing the rename to a parallel install of the same plugin is fine
+        if not commit_staged(staged_path, plugin_path) and not os.path.isdir(
+            plugin_path
+        ):
+            metrics.INSTALL_SECONDS.observe(
+                time.perf_counter() - started, result="failure"
+            )
+            return False, None
+        metrics.INSTALL_SECONDS.observe(time.perf_counter() - started, result="success")
+
         return True, used_tag or None
 
     def _install_git_plugin_with_progress(
         self,
         plugin: Dict[str, Any],
         progress_callback: Optional[Callable[[int], None]] = None,
+        replace: bool = False,
     ) -> Tuple[bool, Optional[str]]:
+        """
+        Clone a plugin into staging and move it into place. With ``replace``
+        an existing tree is swapped out, but only once the new one is ready.
+        """
         plugin_path = os.path.join(self.plugins_dir, plugin["name"])
 
-        if os.path.exists(plugin_path):
+        if os.path.exists(plugin_path) and not replace:
             if progress_callback:
                 progress_callback(100)
-            return True, plugin.get("tag", None)
+            return True, self._installed_tag(plugin_path, plugin.get("tag"))
 
-        repo_url = f"https://github.com/{plugin['url']}"
+        repo_url = git_utils.repo_url(plugin["url"])
         used_tag = plugin.get("tag")
+        # Build the checkout out of sight and move it into place once complete
+        staged_path = staging_path(self.plugins_dir, plugin["name"])
+        started = time.perf_counter()
 
         try:
             if progress_callback:
                 progress_callback(5)
 
-            subprocess.run(
-                ["git", "clone", repo_url, plugin_path],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+            self._clone_repo(repo_url, staged_path)
 
             if progress_callback:
                 progress_callback(40)
 
             subprocess.run(
                 ["git", "fetch", "--tags"],
-                cwd=plugin_path,
+                cwd=staged_path,
                 check=True,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
@@ -117,10 +142,10 @@ class PluginInstaller:
             if progress_callback:
                 progress_callback(60)
 
-            if used_tag:
+            if used_tag and not is_constraint(used_tag):
                 subprocess.run(
                     ["git", "checkout", used_tag],
-                    cwd=plugin_path,
+                    cwd=staged_path,
                     check=True,
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL,
@@ -128,7 +153,10 @@ class PluginInstaller:
                 if progress_callback:
                     progress_callback(90)
             else:
-                latest_tag = self._get_latest_tag(plugin_path)
+                # Pick the newest tag, or the newest one in the configured range
+                latest_tag = self._get_latest_tag(staged_path, used_tag)
+                if used_tag and not latest_tag:
+                    raise ValueError(f"no tag matches {used_tag}")
 
                 if progress_callback:
                     progress_callback(70)
@@ -136,7 +164,7 @@ class PluginInstaller:
                 if latest_tag:
                     subprocess.run(
                         ["git", "checkout", f"tags/{latest_tag}"],
-                        cwd=plugin_path,
+                        cwd=staged_path,
                         check=True,
                         stdout=subprocess.DEVNULL,
                         stderr=subprocess.DEVNULL,
@@ -146,13 +174,56 @@ class PluginInstaller:
                 if progress_callback:
                     progress_callback(90)
         except Exception:
+            shutil.rmtree(staged_path, ignore_errors=True)
             if progress_callback:
                 progress_callback(0)
+            metrics.INSTALL_SECONDS.observe(
+                time.perf_counter() - started, result="failure"
+            )
             return False, None
 
+        if not commit_staged(staged_path, plugin_path, replace=replace) and (
+            replace or not os.path.isdir(plugin_path)
+        ):
+            if progress_callback:
+                progress_callback(0)
+            metrics.INSTALL_SECONDS.observe(
+                time.perf_counter() - started, result="failure"
+            )
+            return False, None
+        metrics.INSTALL_SECONDS.observe(time.perf_counter() - started, result="success")
+
         return True, used_tag or None
 
-    def _get_latest_tag(self, plugin_path: str) -> Optional[str]:
+    def _clone_repo(self, repo_url: str, plugin_path: str) -> None:
+        # Borrow objects from the shared store; fall back to a standalone clone
+        store = ObjectStore()
+        with metrics.count_growth(
+            metrics.FETCHED_BYTES, store.objects_dir, operation="install"
+        ):
+            if store.clone(repo_url, plugin_path):
+                return
+        metrics.RETRIES.inc(operation="clone")
+        shutil.rmtree(plugin_path, ignore_errors=True)
+        with metrics.count_growth(
+            metrics.FETCHED_BYTES,
+            os.path.join(plugin_path, ".git", "objects"),
+            operation="install",
+        ):
+            subprocess.run(
+                ["git", "clone", repo_url, plugin_path],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
+    def _get_latest_tag(
+        self, plugin_path: str, constraint: Optional[str] = None
+    ) -> Optional[str]:
+        index = local_tag_index(plugin_path)
+        if index is not None:
+            return index.latest(constraint)
+
         try:
             result = subprocess.run(
                 ["git", "tag", "--sort=-creatordate"],
@@ -162,38 +233,22 @@ class PluginInstaller:
                 check=True,
                 text=True,
             )
-            tags = result.stdout.strip().split("\n")
-
-            if tags and tags[0]:
-                return tags[0]
-            else:
-                return None
+            tags = [tag for tag in result.stdout.split("\n") if tag]
+            return TagIndex(dict.fromkeys(tags)).latest(constraint)
 
         except subprocess.CalledProcessError:
             return None
 
+    def _installed_tag(self, plugin_path: str, tag: Optional[str]) -> Optional[str]:
+        # A range in the config stands for the tag it resolved to
+        if is_constraint(tag):
+            return self._get_latest_tag(plugin_path, tag)
+        return tag
+
     def _update_lock_file(
         self, plugin: Dict[str, Any], used_tag: Optional[str]
     ) -> None:
-        sources: List[str] = []
-        plugin_path = os.path.join(self.plugins_dir, plugin["name"])
-
-        for source in plugin.get("source", []):
-            sources.append(os.path.join(plugin_path, source))
-
-        plugin_data: Dict[str, Any] = {
-            "name": plugin["name"],
-            "sources": sources,
-            "enabled": plugin.get("enabled", True),
-            "env": plugin.get("env", {}),
-            "skip_auto_update": plugin.get("skip_auto_update", False),
-            "git": {
-                "repo": plugin["url"],
-                "tag": used_tag,
-                "commit_hash": self._get_commit_hash(plugin),
-                "last_pull": self._get_current_timestamp(),
-            },
-        }
+        plugin_data = self._build_lock_entry(plugin, used_tag)
 
         lock_data = lfm.read_lock_file()
 
@@ -206,8 +261,39 @@ class PluginInstaller:
 
         lfm.write_lock_file(lock_data)
 
+    def _build_lock_entry(
+        self, plugin: Dict[str, Any], used_tag: Optional[str]
+    ) -> Dict[str, Any]:
+        sources: List[str] = []
+        plugin_path = os.path.join(self.plugins_dir, plugin["name"])
+
+        for source in plugin.get("source", []):
+            sources.append(os.path.join(plugin_path, source))
+
+        git_info: Dict[str, Any] = {
+            "repo": plugin["url"],
+            "tag": used_tag,
+            "commit_hash": self._get_commit_hash(plugin),
+            "last_pull": self._get_current_timestamp(),
+        }
+        if is_constraint(plugin.get("tag")):
+            git_info["constraint"] = plugin["tag"]
+
+        return {
+            "name": plugin["name"],
+            "sources": sources,
+            # Configs may leave "enabled" unset (None), which means enabled
+            "enabled": plugin.get("enabled") is not False,
+            "env": plugin.get("env", {}),
+            "skip_auto_update": plugin.get("skip_auto_update", False),
+            "git": git_info,
+        }
+
     def _get_commit_hash(self, plugin: Dict[str, Any]) -> Optional[str]:
         plugin_path = os.path.join(self.plugins_dir, plugin["name"])
+        head = git_reader.read_head(plugin_path)
+        if head:
+            return head
 
         try:
             result = subprocess.run(
@@ -1,40 +1,344 @@
+import json
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 
+from core import lock_file_manager as lfm
+from core import tracing
+from core.pluginConfig import (
+    ConfigError,
+    ConfigValidationError,
+    PluginConfig,
+    find_duplicates,
+    mapping_value_node,
+    node_line,
+    validate_plugin,
+)
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+CONFIG_CACHE_PATH: str = os.path.join(lfm.COFFEE_DIR, "config-cache.json")
+CONFIG_CACHE_VERSION: int = 4
+SNAPSHOT_FILENAME: str = "compiled.json"
+SNAPSHOT_VERSION: int = 3
+MANIFEST_KEYS = ("plugins", "include")
+
+# Parsed configs shared by every loader in the process, keyed by file path
+_memory_cache: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def _file_signature(file_path: str) -> List[int]:
+    st = os.stat(file_path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _load_yaml(file_path: str) -> Tuple[Any, Optional[yaml.Node]]:
+    """Parse a YAML file, keeping the node tree for line numbers."""
+    with tracing.traced_open(file_path, "r") as f:
+        loader = SafeLoader(f)
+        try:
+            node = loader.get_single_node()
+            data = loader.construct_document(node) if node is not None else None
+        finally:
+            loader.dispose()
+    return data, node
+
 
 class PluginLoader:
-    def __init__(self, path: str) -> None:
+    """
+    Loads plugin configs from the YAML files in a directory.
+
+    A file holds either a single plugin or a manifest with a ``plugins`` list,
+    and may pull in shared fragments with ``include``. If a compiled snapshot
+    exists in the directory and none of its YAML files changed since, it is
+    used instead of them.
+    """
+
+    def __init__(
+        self, path: str, cache_path: Optional[str] = CONFIG_CACHE_PATH
+    ) -> None:
         self.COFFEE_PLUGINS_LIST_DIR: str = path
+        self.cache_path = cache_path
+        self.snapshot_path: str = os.path.join(path, SNAPSHOT_FILENAME)
+        self.errors: List[ConfigError] = []
+
+    def load_plugins(self, strict: bool = False) -> List[Dict[str, Any]]:
+        """
+        Return the configured plugins as dicts.
 
-    def load_plugins(self) -> List[Dict[str, Any]]:
-        plugin_configs: List[Dict[str, Any]] = []
+        Invalid entries and duplicate names are reported up front. With
+        ``strict`` a ConfigValidationError listing every problem is raised,
+        otherwise the problems are printed and the valid plugins returned.
+        """
+        configs = self.load_configs()
+        if self.errors:
+            if strict:
+                raise ConfigValidationError(self.errors)
+            for error in self.errors:
+                print(f"Error Reading {error}")
+        return [config.to_dict() for config in configs]
 
+    def load_configs(self) -> List[PluginConfig]:
         if not os.path.exists(self.COFFEE_PLUGINS_LIST_DIR):
             raise FileNotFoundError(
                 f"The plugin directory '{self.COFFEE_PLUGINS_LIST_DIR}' doesn't exist."
             )
 
-        for file in os.listdir(self.COFFEE_PLUGINS_LIST_DIR):
-            if file.endswith(".yaml") or file.endswith(".yml"):
-                file_path = os.path.join(self.COFFEE_PLUGINS_LIST_DIR, file)
+        self.errors = []
+        snapshot = self._read_snapshot()
+        configs = snapshot if snapshot is not None else self._load_sources()
+
+        duplicate_errors = find_duplicates(configs)
+        if duplicate_errors:
+            self.errors.extend(duplicate_errors)
+            seen: Set[str] = set()
+            unique: List[PluginConfig] = []
+            for config in configs:
+                if config.name not in seen:
+                    seen.add(config.name)
+                    unique.append(config)
+            configs = unique
+        return configs
+
+    def compile_snapshot(self) -> int:
+        """Write every configured plugin to a single JSON snapshot."""
+        self.errors = []
+        sources: Dict[str, Dict[str, List[int]]] = {"files": {}, "deps": {}}
+        configs = self._load_sources(sources)
+        self.errors.extend(find_duplicates(configs))
+        if self.errors:
+            raise ConfigValidationError(self.errors)
+        plugins = [config.to_dict() for config in configs]
+        snapshot = {"version": SNAPSHOT_VERSION, "sources": sources, "plugins": plugins}
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with tracing.traced_open(tmp_path, "w") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_path, self.snapshot_path)
+        return len(plugins)
+
+    def remove_snapshot(self) -> bool:
+        try:
+            os.remove(self.snapshot_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _read_snapshot(self) -> Optional[List[PluginConfig]]:
+        try:
+            with tracing.traced_open(self.snapshot_path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error Reading {self.snapshot_path}: {e}")
+            return None
+        try:
+            if data.get("version") != SNAPSHOT_VERSION:
+                return None
+            if self._snapshot_fresh(data.get("sources", {})):
+                return [
+                    PluginConfig(file=self.snapshot_path, line=i + 1, **plugin)
+                    for i, plugin in enumerate(data.get("plugins", []))
+                ]
+        except Exception:
+            # Hand-edited or otherwise malformed; the YAML files still work
+            pass
+        print(
+            f"Warning: {self.snapshot_path} is out of date, reading the YAML "
+            "files instead. Re-run 'coffee compile' to refresh it."
+        )
+        return None
+
+    def _yaml_files(self) -> List[str]:
+        return [
+            os.path.join(self.COFFEE_PLUGINS_LIST_DIR, file)
+            for file in sorted(os.listdir(self.COFFEE_PLUGINS_LIST_DIR))
+            if file.endswith(".yaml") or file.endswith(".yml")
+        ]
+
+    def _snapshot_fresh(self, sources: Dict[str, Dict[str, List[int]]]) -> bool:
+        """Whether the YAML files (and includes) are those the snapshot saw."""
+        files = sources.get("files", {})
+        if set(self._yaml_files()) != set(files):
+            return False
+        return self._deps_fresh(files) and self._deps_fresh(sources.get("deps", {}))
+
+    def _load_sources(
+        self, sources: Optional[Dict[str, Dict[str, List[int]]]] = None
+    ) -> List[PluginConfig]:
+        """
+        Parse every YAML file, through the cache. The signature of each file
+        read is added to ``sources`` when given.
+        """
+        configs: List[PluginConfig] = []
+        cache = self._get_cache()
+        cache_changed = False
+        seen: Set[str] = set()
+
+        for file_path in self._yaml_files():
+            seen.add(file_path)
+            try:
+                entry, changed = self._get_cache_entry(file_path, cache)
+            except Exception as e:
+                self.errors.append(ConfigError(file_path, 1, str(e)))
+                if cache.pop(file_path, None) is not None:
+                    cache_changed = True
+                continue
+            cache_changed = cache_changed or changed
+            if sources is not None:
+                sources["files"][file_path] = entry["signature"]
+                sources["deps"].update(entry.get("deps", {}))
+            configs.extend(
+                PluginConfig(file=c["file"], line=c["line"], **c["plugin"])
+                for c in entry["configs"]
+            )
+            self.errors.extend(ConfigError(*error) for error in entry["errors"])
+
+        for file_path in list(cache):
+            in_dir = os.path.dirname(file_path) == self.COFFEE_PLUGINS_LIST_DIR
+            if in_dir and file_path not in seen:
+                del cache[file_path]
+                cache_changed = True
+
+        if cache_changed:
+            self._write_cache(cache)
+
+        return configs
+
+    def _get_cache_entry(
+        self, file_path: str, cache: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        signature = _file_signature(file_path)
+        entry = cache.get(file_path)
+        if (
+            entry is not None
+            and entry["signature"] == signature
+            and self._deps_fresh(entry.get("deps", {}))
+        ):
+            return entry, False
+
+        deps: Dict[str, List[int]] = {}
+        configs, errors = self._parse_file(file_path, deps, [file_path])
+        entry = {
+            "signature": signature,
+            "deps": deps,
+            "configs": [
+                {"plugin": c.to_dict(), "file": c.file, "line": c.line} for c in configs
+            ],
+            "errors": [[e.file, e.line, e.message] for e in errors],
+        }
+        cache[file_path] = entry
+        return entry, True
+
+    def _deps_fresh(self, deps: Dict[str, List[int]]) -> bool:
+        try:
+            return all(_file_signature(p) == sig for p, sig in deps.items())
+        except OSError:
+            return False
+
+    def _parse_file(
+        self, file_path: str, deps: Dict[str, List[int]], stack: List[str]
+    ) -> Tuple[List[PluginConfig], List[ConfigError]]:
+        try:
+            data, node = _load_yaml(file_path)
+        except yaml.MarkedYAMLError as e:
+            line = e.problem_mark.line + 1 if e.problem_mark else 1
+            return [], [ConfigError(file_path, line, f"invalid YAML: {e.problem}")]
+        if data is None:
+            return [], []
+        if not isinstance(data, dict):
+            message = "expected a mapping at the top level"
+            return [], [ConfigError(file_path, node_line(node), message)]
+
+        configs: List[PluginConfig] = []
+        errors: List[ConfigError] = []
+
+        include_node = mapping_value_node(node, "include")
+        includes = data.get("include") or []
+        if not isinstance(includes, list) or not all(
+            isinstance(i, str) for i in includes
+        ):
+            message = "'include' must be a list of file paths"
+            errors.append(ConfigError(file_path, node_line(include_node), message))
+            includes = []
+        base_dir = os.path.dirname(file_path)
+        for include in includes:
+            include_path = os.path.normpath(
+                os.path.join(base_dir, os.path.expanduser(include))
+            )
+            if include_path in stack:
+                message = f"include cycle through '{include}'"
+                errors.append(ConfigError(file_path, node_line(include_node), message))
+                continue
+            try:
+                deps[include_path] = _file_signature(include_path)
+            except OSError:
+                message = f"included file '{include}' not found"
+                errors.append(ConfigError(file_path, node_line(include_node), message))
+                continue
+            included = self._parse_file(include_path, deps, stack + [include_path])
+            configs.extend(included[0])
+            errors.extend(included[1])
+
+        if "plugins" in data:
+            for key in data:
+                if key not in MANIFEST_KEYS:
+                    message = f"unknown top-level field {key!r}"
+                    line = node_line(mapping_value_node(node, key))
+                    errors.append(ConfigError(file_path, line, message))
+            plugins_node = mapping_value_node(node, "plugins")
+            entries = data["plugins"] or []
+            if not isinstance(entries, list):
+                message = "'plugins' must be a list of plugin entries"
+                errors.append(ConfigError(file_path, node_line(plugins_node), message))
+                entries = []
+            entry_nodes: List[Optional[yaml.Node]] = (
+                list(plugins_node.value)
+                if isinstance(plugins_node, yaml.SequenceNode)
+                else [None] * len(entries)
+            )
+            for entry, entry_node in zip(entries, entry_nodes):
+                config, entry_errors = validate_plugin(entry, entry_node, file_path)
+                errors.extend(entry_errors)
+                if config:
+                    configs.append(config)
+        elif set(data) - set(MANIFEST_KEYS):
+            config, entry_errors = validate_plugin(
+                data, node, file_path, allow_file_keys=True
+            )
+            errors.extend(entry_errors)
+            if config:
+                configs.append(config)
+
+        return configs, errors
+
+    def _get_cache(self) -> Dict[str, Dict[str, Any]]:
+        global _memory_cache
+        if _memory_cache is None:
+            _memory_cache = {}
+            if self.cache_path:
                 try:
-                    with open(file_path, "r") as f:
-                        data = yaml.safe_load(f)
-                        if data:
-                            plugin_data: Dict[str, Any] = {
-                                "name": data.get("name", ""),
-                                "url": data.get("url", ""),
-                                "local": data.get("local", False),
-                                "source": data.get("source", []),
-                                "tag": data.get("tag", None),
-                                "skip_auto_update": data.get("skip_auto_update", False),
-                                "env": data.get("env", {}),
-                            }
-                            if plugin_data["name"] and plugin_data["url"]:
-                                plugin_configs.append(plugin_data)
-                except Exception as e:
-                    print(f"Error Reading {file_path}: {e}")
-
-        return plugin_configs
+                    with tracing.traced_open(self.cache_path, "r") as f:
+                        data = json.load(f)
+                    if data.get("version") == CONFIG_CACHE_VERSION:
+                        _memory_cache = data.get("files", {})
+                except Exception:
+                    pass
+        return _memory_cache
+
+    def _write_cache(self, cache: Dict[str, Dict[str, Any]]) -> None:
+        if not self.cache_path or not os.path.isdir(os.path.dirname(self.cache_path)):
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with tracing.traced_open(tmp_path, "w") as f:
+                json.dump(
+                    {"version": CONFIG_CACHE_VERSION, "files": cache}, f, default=str
+                )
+            os.replace(tmp_path, self.cache_path)
+        except Exception:
+            pass
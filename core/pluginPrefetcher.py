@@ -0,0 +1,154 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from core import lock_file_manager as lfm
+from core import tracing
+from core.git_reader import git_dir
+from core.git_utils import DEFAULT_GIT_JOBS, repo_url, run_git
+
+PREFETCH_STATE_PATH: str = os.path.join(lfm.COFFEE_DIR, "prefetch.json")
+PREFETCH_INTERVAL: float = 6 * 60 * 60
+# Where the remote's default branch is kept, for plugins that track commits
+PREFETCH_HEAD_REF: str = "refs/coffee/prefetch/HEAD"
+
+# Prefetch outcomes
+FETCHED = "fetched"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+_state_lock = threading.Lock()
+
+
+def read_prefetch_state() -> Dict[str, Dict[str, Any]]:
+    try:
+        with tracing.traced_open(PREFETCH_STATE_PATH, "r") as f:
+            return json.load(f).get("plugins", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def is_prefetched(
+    state: Dict[str, Dict[str, Any]],
+    name: str,
+    url: str,
+    max_age: float = PREFETCH_INTERVAL,
+) -> bool:
+    """Whether ``name`` was prefetched from ``url`` within ``max_age`` seconds."""
+    entry = state.get(name)
+    return (
+        entry is not None
+        and entry.get("url") == url
+        and time.time() - entry.get("fetched_at", 0) < max_age
+    )
+
+
+def forget_prefetched(names: List[str]) -> None:
+    """
+    Drop ``names`` from the prefetch state, so their next update check asks
+    the remote again. Used after something discards the prefetched refs.
+    """
+    with _state_lock:
+        state = read_prefetch_state()
+        if not any(name in state for name in names):
+            return
+        for name in names:
+            state.pop(name, None)
+        _write_prefetch_state(state)
+
+
+def _write_prefetch_state(state: Dict[str, Dict[str, Any]]) -> None:
+    try:
+        tmp_path = f"{PREFETCH_STATE_PATH}.{os.getpid()}.tmp"
+        with tracing.traced_open(tmp_path, "w") as f:
+            json.dump({"plugins": state}, f, indent=4)
+        os.replace(tmp_path, PREFETCH_STATE_PATH)
+    except OSError:
+        pass
+
+
+def prefetch_due(interval: float = PREFETCH_INTERVAL) -> bool:
+    """Whether the last prefetch ran longer than ``interval`` seconds ago."""
+    try:
+        return time.time() - os.stat(PREFETCH_STATE_PATH).st_mtime >= interval
+    except OSError:
+        return True
+
+
+def tmux_idle_seconds() -> Optional[float]:
+    """Seconds since any tmux client was last active, or None without a server."""
+    try:
+        result = subprocess.run(
+            ["tmux", "list-clients", "-F", "#{client_activity}"],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    activity = [int(line) for line in result.stdout.split() if line.isdigit()]
+    if not activity:
+        return float("inf")
+    return max(0.0, time.time() - max(activity))
+
+
+class PluginPrefetcher:
+    """
+    Fetches new tags, objects and the remote HEAD for installed plugins.
+
+    Nothing is checked out. Afterwards update checks can be answered from
+    local refs and upgrades only need a local checkout. Plugins marked
+    ``skip_auto_update`` are left alone. Fetches run in parallel and the
+    state file is written once at the end.
+    """
+
+    def __init__(self, plugins_dir: str, max_workers: int = DEFAULT_GIT_JOBS) -> None:
+        self.plugins_dir = plugins_dir
+        self.max_workers = max(1, max_workers)
+
+    def prefetch_plugins(self, names: Optional[List[str]] = None) -> Dict[str, str]:
+        lock_data = lfm.read_lock_file()
+        plugins = [
+            plugin
+            for plugin in lock_data.get("plugins", [])
+            if names is None or plugin.get("name") in names
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            statuses = list(executor.map(self.prefetch_plugin, plugins))
+        results = {plugin["name"]: status for plugin, status in zip(plugins, statuses)}
+
+        now = time.time()
+        with _state_lock:
+            state = read_prefetch_state()
+            for plugin in plugins:
+                if results[plugin["name"]] == FETCHED:
+                    state[plugin["name"]] = {
+                        "url": repo_url(plugin["git"]["repo"]),
+                        "fetched_at": now,
+                    }
+            _write_prefetch_state(state)
+        return results
+
+    def prefetch_plugin(self, plugin: Dict[str, Any]) -> str:
+        plugin_path = os.path.join(self.plugins_dir, plugin["name"])
+        repo = plugin.get("git", {}).get("repo")
+        if plugin.get("skip_auto_update", False) or not repo:
+            return SKIPPED
+        if git_dir(plugin_path) is None:
+            return SKIPPED
+        fetched = run_git(
+            plugin_path,
+            "fetch",
+            "-q",
+            "--force",
+            "--tags",
+            repo_url(repo),
+            f"+HEAD:{PREFETCH_HEAD_REF}",
+        )
+        return FETCHED if fetched is not None else FAILED
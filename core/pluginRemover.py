@@ -1,9 +1,10 @@
 import os
-import shutil
 import subprocess
 from typing import Any, Callable, Dict, List, Optional, Union
 
 from core import lock_file_manager as lfm
+from core import metrics
+from core.worktrees import remove_plugin_tree
 
 
 class PluginRemover:
@@ -60,11 +61,13 @@ class PluginRemover:
                     "installed": installed_time,
                     "enabled": plugin.get("enabled", False),
                     "env": plugin.get("env", {}),
+                    "repo": git_info.get("repo", ""),
                 }
             )
 
         return installed_plugins
 
+    @metrics.timed(metrics.REMOVE_SECONDS)
     def remove_plugin(
         self,
         plugin_name: str,
@@ -89,9 +92,9 @@ class PluginRemover:
             send_progress(30)
             plugin_path = os.path.join(self.plugin_base_dir, plugin_name)
 
-            if os.path.exists(plugin_path):
+            if os.path.lexists(plugin_path):
                 try:
-                    shutil.rmtree(plugin_path)
+                    remove_plugin_tree(self.plugin_base_dir, plugin_name)
                 except Exception:
                     send_progress(0)
                     return False
@@ -0,0 +1,209 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core import lock_file_manager as lfm
+from core.generations import read_generation, record_generation
+from core.git_reader import git_dir, read_head
+from core.git_utils import DEFAULT_GIT_JOBS, repo_url, run_git
+from core.objectStore import ObjectStore
+from core.staging import commit_staged, staging_path
+from core.worktrees import switch_version
+
+# Restore outcomes
+RESTORED = "restored"
+UP_TO_DATE = "up-to-date"
+NOT_LOCKED = "not locked"
+FAILED = "failed"
+
+
+class PluginRestorer:
+    """
+    Checks out exactly the commits recorded in the lock file.
+
+    Each plugin is fetched by commit hash with a depth of one. Servers that
+    refuse to serve unadvertised commits get a full clone instead, which is
+    then checked out at the locked commit. Fresh checkouts are built in the
+    staging area and moved into place only once they succeed. With
+    ``offline`` only commits already present locally are checked out.
+    """
+
+    def __init__(
+        self,
+        plugins_dir: str,
+        max_workers: int = DEFAULT_GIT_JOBS,
+        offline: bool = False,
+    ) -> None:
+        self.plugins_dir = plugins_dir
+        self.max_workers = max(1, max_workers)
+        self.offline = offline
+
+    def restore_plugins(
+        self,
+        names: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+    ) -> Dict[str, str]:
+        """Restore the locked plugins in parallel and return each one's outcome."""
+        lock_data = lfm.read_lock_file()
+        plugins = [
+            plugin
+            for plugin in lock_data.get("plugins", [])
+            if names is None or plugin.get("name") in names
+        ]
+        return self._restore_all(plugins, progress_callback)
+
+    def rollback(
+        self,
+        generation: Optional[int] = None,
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+    ) -> Tuple[Optional[int], Dict[str, str]]:
+        """
+        Go back to a recorded generation, the newest one by default.
+
+        Installed plugins are checked out at the generation's commits from
+        local objects only, then the lock file is replaced in one write.
+        Plugins that fail keep their current lock entry. The state being
+        left is recorded as a generation of its own, so a rollback can be
+        undone the same way.
+        """
+        record = read_generation(generation)
+        if record is None:
+            return None, {}
+        target = {p["name"]: p for p in record["lock"].get("plugins", [])}
+        plugins = [
+            plugin
+            for name, plugin in target.items()
+            if git_dir(os.path.join(self.plugins_dir, name)) is not None
+        ]
+
+        offline = PluginRestorer(self.plugins_dir, self.max_workers, offline=True)
+        results = offline._restore_all(plugins, progress_callback)
+
+        lock_data = lfm.read_lock_file()
+        record_generation(f"rollback to {record['generation']}", lock_data)
+        entries = {p["name"]: p for p in lock_data.get("plugins", [])}
+        for name, status in results.items():
+            if status != FAILED:
+                entries[name] = target[name]
+        lock_data["plugins"] = list(entries.values())
+        lfm.write_lock_file(lock_data)
+        return record["generation"], results
+
+    def _restore_all(
+        self,
+        plugins: List[Dict[str, Any]],
+        progress_callback: Optional[Callable[[str, int], None]],
+    ) -> Dict[str, str]:
+        results: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                plugin["name"]: executor.submit(
+                    self.restore_plugin, plugin, progress_callback
+                )
+                for plugin in plugins
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception:
+                    results[name] = FAILED
+        return results
+
+    def restore_plugin(
+        self,
+        plugin: Dict[str, Any],
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+    ) -> str:
+        name = plugin["name"]
+
+        def send_progress(progress: int) -> None:
+            if progress_callback:
+                progress_callback(name, progress)
+
+        git_info = plugin.get("git", {})
+        commit = git_info.get("commit_hash")
+        repo = git_info.get("repo")
+        if not commit or not repo:
+            send_progress(0)
+            return NOT_LOCKED
+
+        plugin_path = os.path.join(self.plugins_dir, name)
+        send_progress(10)
+
+        if git_dir(plugin_path) is not None:
+            if read_head(plugin_path) == commit:
+                send_progress(100)
+                return UP_TO_DATE
+            restored = self._checkout_in_place(plugin_path, commit, send_progress)
+        elif self.offline:
+            restored = False
+        else:
+            restored = self._restore_fresh(
+                plugin_path, repo_url(repo), commit, send_progress
+            )
+
+        if not restored:
+            send_progress(0)
+            return FAILED
+
+        tag = git_info.get("tag")
+        if tag:
+            # Keep the locked tag resolvable for update checks and details
+            run_git(plugin_path, "tag", "-f", tag, commit)
+        send_progress(100)
+        return RESTORED
+
+    def _checkout_in_place(
+        self, plugin_path: str, commit: str, send_progress: Callable[[int], None]
+    ) -> bool:
+        if not self._has_commit(plugin_path, commit):
+            if self.offline:
+                return False
+            fetched = run_git(plugin_path, "fetch", "--depth=1", "origin", commit)
+            if fetched is None:
+                fetched = run_git(plugin_path, "fetch", "--tags", "origin")
+            if fetched is None or not self._has_commit(plugin_path, commit):
+                return False
+        send_progress(70)
+        return switch_version(self.plugins_dir, os.path.basename(plugin_path), commit)
+
+    def _restore_fresh(
+        self,
+        plugin_path: str,
+        url: str,
+        commit: str,
+        send_progress: Callable[[int], None],
+    ) -> bool:
+        staged_path = staging_path(self.plugins_dir, os.path.basename(plugin_path))
+
+        try:
+            if not self._fetch_by_hash(staged_path, url, commit):
+                # The server won't serve the commit directly; clone everything,
+                # borrowing the full history from the shared object store
+                shutil.rmtree(staged_path, ignore_errors=True)
+                if not ObjectStore().clone(url, staged_path):
+                    shutil.rmtree(staged_path, ignore_errors=True)
+                    if run_git(None, "clone", "-q", url, staged_path) is None:
+                        return False
+            send_progress(70)
+
+            if run_git(staged_path, "checkout", "-q", "--detach", commit) is None:
+                return False
+            send_progress(90)
+
+            return commit_staged(staged_path, plugin_path, replace=True)
+        finally:
+            shutil.rmtree(staged_path, ignore_errors=True)
+
+    def _fetch_by_hash(self, path: str, url: str, commit: str) -> bool:
+        return (
+            run_git(None, "init", "-q", path) is not None
+            and run_git(path, "remote", "add", "origin", url) is not None
+            and run_git(path, "fetch", "-q", "--depth=1", "origin", commit) is not None
+        )
+
+    def _has_commit(self, plugin_path: str, commit: str) -> bool:
+        return (
+            run_git(plugin_path, "cat-file", "-e", f"{commit}^{{commit}}") is not None
+        )
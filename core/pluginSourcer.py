@@ -3,6 +3,7 @@ import subprocess
 from typing import Any, Dict, List, Optional
 
 from core import lock_file_manager as lfm
+from core import metrics
 
 
 class PluginSourcer:
@@ -23,10 +24,13 @@ class PluginSourcer:
         env_vars: Dict[str, str] = plugin.get("env", {})
         if not scripts or not plugin_dir:
             return
-        for script in scripts:
-            if plugin.get("enabled", True):
-                self._run_plugin_script(script, env_vars)
-                print(f"Executed {plugin_name} script from {script} with env vars")
+        with metrics.SOURCE_SECONDS.time(plugin=plugin_name):
+            for script in scripts:
+                if plugin.get("enabled", True):
+                    self._run_plugin_script(script, env_vars)
+                    print(f"Executed {plugin_name} script from {script} with env vars")
+                    # The environment is global; once per plugin is enough
+                    env_vars = {}
 
     def _run_plugin_script(
         self, script_path: str, env_vars: Optional[Dict[str, str]] = None
@@ -42,24 +46,49 @@ class PluginSourcer:
         except subprocess.CalledProcessError as e:
             print(f"Error running script {script_path}: {e}")
 
+    def _unset_plugin_env(self, plugin: Dict[str, Any]) -> None:
+        for key in plugin.get("env", {}):
+            try:
+                subprocess.run(["tmux", "set-environment", "-gu", key], check=True)
+            except subprocess.CalledProcessError as e:
+                print(f"Warning: Failed to unset env var {key}: {e}")
+
     def activate_plugin(self, plugin_name: str) -> None:
         self._set_plugin_enabled(plugin_name, True)
-        self.source_enabled_plugins()
 
     def deactivate_plugin(self, plugin_name: str) -> None:
-        # Will not be activated on the next run
+        # Its scripts stay loaded in the running server, but its environment
+        # goes and it won't be sourced on the next run
         self._set_plugin_enabled(plugin_name, False)
 
-    def _set_plugin_enabled(self, plugin_name: str, state: bool) -> None:
+    def toggle_plugin(self, plugin_name: str) -> Optional[bool]:
+        """Flip a plugin's enabled flag; returns the new state, or None."""
+        plugin = self._set_plugin_enabled(plugin_name, None)
+        return plugin.get("enabled") if plugin else None
+
+    def _set_plugin_enabled(
+        self, plugin_name: str, state: Optional[bool]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Set (or with None, flip) the flag in one lock-file write, then
+        source or tear down just this plugin.
+        """
         lock_data = lfm.read_lock_file()
         plugins: List[Dict[str, Any]] = lock_data.get("plugins", [])
         for plugin in plugins:
             if plugin.get("name") == plugin_name:
+                if state is None:
+                    state = not plugin.get("enabled", False)
                 plugin["enabled"] = state
                 status = "enabled" if state else "disabled"
                 print(f"Plugin '{plugin_name}' is now {status}.")
                 break
         else:
             print(f"Plugin '{plugin_name}' not found in the lock file.")
-            return
+            return None
         lfm.write_lock_file(lock_data)
+        if state:
+            self._source_plugin(plugin)
+        else:
+            self._unset_plugin_env(plugin)
+        return plugin
@@ -0,0 +1,260 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core import lock_file_manager as lfm
+from core.git_reader import resolve_commit
+from core.git_utils import DEFAULT_GIT_JOBS, run_git
+from core.pluginInstaller import PluginInstaller
+from core.tagIndex import is_constraint, local_tag_index
+from core.worktrees import remove_plugin_tree, switch_version
+
+# Actions that run git or touch the disk; the rest only edit the lock file
+GIT_ACTIONS = ("install", "retag", "remove")
+# Order the plan is printed and applied in
+ACTION_ORDER = ("remove", "install", "retag", "configure", "enable", "disable")
+
+
+@dataclass(frozen=True)
+class SyncAction:
+    kind: str
+    name: str
+    detail: str = ""
+    plugin: Optional[Dict[str, Any]] = field(default=None, compare=False)
+
+
+class PluginSyncer:
+    """
+    Reconciles the plugin configs with the lock file and the plugins directory.
+
+    ``plan`` diffs the desired state against one read of the lock file and one
+    listing of the plugins directory. ``apply`` runs the git work in parallel
+    and commits every change to the lock file in a single write.
+    """
+
+    def __init__(
+        self,
+        plugins_config: List[Dict[str, Any]],
+        plugins_dir: str,
+        max_workers: int = DEFAULT_GIT_JOBS,
+    ) -> None:
+        self.plugins_config = plugins_config
+        self.plugins_dir = plugins_dir
+        self.max_workers = max(1, max_workers)
+        self.installer = PluginInstaller(plugins_config, plugins_dir, "")
+
+    def plan(self) -> List[SyncAction]:
+        lock_data = lfm.read_lock_file()
+        locked: Dict[str, Dict[str, Any]] = {
+            p["name"]: p for p in lock_data.get("plugins", []) if p.get("name")
+        }
+        on_disk = (
+            set(os.listdir(self.plugins_dir))
+            if os.path.isdir(self.plugins_dir)
+            else set()
+        )
+
+        actions: List[SyncAction] = []
+        configured = {plugin["name"]: plugin for plugin in self.plugins_config}
+
+        for name, plugin in configured.items():
+            entry = locked.get(name)
+            tag = plugin.get("tag")
+            git_info = entry.get("git", {}) if entry else {}
+
+            if entry is None or name not in on_disk:
+                actions.append(SyncAction("install", name, tag or "latest", plugin))
+                continue
+            if git_info.get("repo") != plugin["url"]:
+                detail = f"{git_info.get('repo')} → {plugin['url']}"
+                actions.append(SyncAction("install", name, detail, plugin))
+                continue
+
+            if tag and self._needs_retag(tag, git_info):
+                current = git_info.get("constraint") or git_info.get("tag")
+                detail = f"{current or 'untagged'} → {tag}"
+                actions.append(SyncAction("retag", name, detail, plugin))
+
+            changed = [
+                key
+                for key, value in self._lock_fields(plugin).items()
+                if entry.get(key) != value
+            ]
+            if changed:
+                actions.append(
+                    SyncAction("configure", name, ", ".join(changed), plugin)
+                )
+
+            enabled = plugin.get("enabled")
+            if enabled is not None and enabled != entry.get("enabled", True):
+                actions.append(
+                    SyncAction("enable" if enabled else "disable", name, "", plugin)
+                )
+
+        for name, entry in locked.items():
+            if name not in configured:
+                actions.append(SyncAction("remove", name, "", entry))
+
+        actions.sort(key=lambda action: ACTION_ORDER.index(action.kind))
+        return actions
+
+    def _needs_retag(self, tag: str, git_info: Dict[str, Any]) -> bool:
+        if is_constraint(tag):
+            # Moving within an unchanged range is left to `coffee upgrade`
+            return tag != git_info.get("constraint")
+        return tag != git_info.get("tag") or bool(git_info.get("constraint"))
+
+    def apply(
+        self,
+        actions: List[SyncAction],
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+    ) -> List[Tuple[SyncAction, bool]]:
+        """Run a plan and return each action with whether it succeeded."""
+        git_actions = [a for a in actions if a.kind in GIT_ACTIONS]
+        results: Dict[SyncAction, Tuple[bool, Optional[Dict[str, Any]]]] = {}
+
+        if git_actions:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    action: executor.submit(self._run_action, action, progress_callback)
+                    for action in git_actions
+                }
+                for action, future in futures.items():
+                    try:
+                        results[action] = future.result()
+                    except Exception:
+                        results[action] = (False, None)
+
+        for action in actions:
+            if action.kind not in GIT_ACTIONS:
+                results[action] = (True, None)
+
+        self._commit_lock_file(actions, results)
+        return [(action, results[action][0]) for action in actions]
+
+    def _run_action(
+        self,
+        action: SyncAction,
+        progress_callback: Optional[Callable[[str, int], None]],
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        def send_progress(progress: int) -> None:
+            if progress_callback:
+                progress_callback(action.name, progress)
+
+        plugin = action.plugin or {}
+        plugin_path = os.path.join(self.plugins_dir, action.name)
+
+        if action.kind == "install":
+            # Stale or foreign checkouts are replaced by a clean clone, swapped
+            # in only once it is complete
+            success, used_tag = self.installer._install_git_plugin_with_progress(
+                plugin, send_progress, replace=True
+            )
+            if not success:
+                send_progress(0)
+                return False, None
+            entry = self.installer._build_lock_entry(plugin, used_tag)
+            send_progress(100)
+            return True, entry
+
+        if action.kind == "retag":
+            checkout = self._checkout(plugin_path, plugin["tag"], send_progress)
+            if checkout is None:
+                send_progress(0)
+                return False, None
+            tag, commit = checkout
+            send_progress(100)
+            return True, {
+                "tag": tag,
+                "constraint": plugin["tag"] if is_constraint(plugin["tag"]) else None,
+                "commit_hash": commit,
+            }
+
+        # remove
+        remove_plugin_tree(self.plugins_dir, action.name)
+        for key in plugin.get("env", {}):
+            subprocess.run(["tmux", "set-environment", "-gu", key], capture_output=True)
+        send_progress(100)
+        return True, None
+
+    def _resolve(
+        self, plugin_path: str, tag: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        if is_constraint(tag):
+            index = local_tag_index(plugin_path)
+            tag = (index.latest(tag) if index else None) or ""
+            if not tag:
+                return None, None
+        commit = resolve_commit(plugin_path, f"tags/{tag}") or run_git(
+            plugin_path, "rev-parse", "--verify", "-q", f"{tag}^{{commit}}"
+        )
+        return tag, commit or None
+
+    def _checkout(
+        self, plugin_path: str, tag: str, send_progress: Callable[[int], None]
+    ) -> Optional[Tuple[str, str]]:
+        """Check out a tag, or the newest tag in a range, as the active version."""
+        send_progress(10)
+        # Only hit the network when the tag isn't already in the clone
+        resolved, commit = self._resolve(plugin_path, tag)
+        if not commit:
+            if run_git(plugin_path, "fetch", "--tags", "origin") is None:
+                return None
+            resolved, commit = self._resolve(plugin_path, tag)
+        if not resolved or not commit:
+            return None
+        send_progress(60)
+        if not switch_version(self.plugins_dir, os.path.basename(plugin_path), commit):
+            return None
+        send_progress(90)
+        return resolved, commit
+
+    def _lock_fields(self, plugin: Dict[str, Any]) -> Dict[str, Any]:
+        plugin_path = os.path.join(self.plugins_dir, plugin["name"])
+        return {
+            "sources": [
+                os.path.join(plugin_path, source) for source in plugin.get("source", [])
+            ],
+            "env": plugin.get("env", {}),
+            "skip_auto_update": plugin.get("skip_auto_update", False),
+        }
+
+    def _commit_lock_file(
+        self,
+        actions: List[SyncAction],
+        results: Dict[SyncAction, Tuple[bool, Optional[Dict[str, Any]]]],
+    ) -> None:
+        lock_data = lfm.read_lock_file()
+        plugins: Dict[str, Dict[str, Any]] = {
+            p["name"]: p for p in lock_data.get("plugins", []) if p.get("name")
+        }
+        changed = False
+
+        for action in actions:
+            success, payload = results[action]
+            if not success:
+                continue
+            entry = plugins.get(action.name)
+            if action.kind == "install" and payload is not None:
+                plugins[action.name] = payload
+            elif action.kind == "remove":
+                plugins.pop(action.name, None)
+            elif entry is None:
+                continue
+            elif action.kind == "retag" and payload is not None:
+                git_info = entry.setdefault("git", {})
+                git_info.update(payload)
+                if git_info["constraint"] is None:
+                    del git_info["constraint"]
+                git_info["last_pull"] = self.installer._get_current_timestamp()
+            elif action.kind == "configure":
+                entry.update(self._lock_fields(action.plugin or {}))
+            elif action.kind in ("enable", "disable"):
+                entry["enabled"] = action.kind == "enable"
+            changed = True
+
+        if changed:
+            lock_data["plugins"] = list(plugins.values())
+            lfm.write_lock_file(lock_data)
@@ -2,15 +2,42 @@ import os
 import subprocess
 import threading
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, ContextManager, Dict, List, Optional
 
+from core import git_reader, git_utils
 from core import lock_file_manager as lfm
+from core import metrics
+from core.changelog import Changelog, read_changelog
+from core.generations import record_generation
+from core.jobScheduler import (
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    Job,
+    JobScheduler,
+    url_host,
+)
+from core.pluginPrefetcher import (
+    PREFETCH_HEAD_REF,
+    is_prefetched,
+    read_prefetch_state,
+)
+from core.tagIndex import (
+    TagIndex,
+    local_tag_commit,
+    local_tag_index,
+    remote_tag_index,
+)
+from core.worktrees import switch_version
 
 
 class PluginUpdater:
-    def __init__(self, plugins_dir: str) -> None:
+    def __init__(
+        self, plugins_dir: str, max_workers: int = git_utils.DEFAULT_GIT_JOBS
+    ) -> None:
         self.plugins_dir = plugins_dir
-        self._update_threads: Dict[str, threading.Thread] = {}
+        self.scheduler = JobScheduler(max_workers)
+        # Updates run concurrently but the lock file is read-modify-write
+        self._lock_file_lock = threading.Lock()
 
     def _safe_check_output(
         self, cmd: List[str], cwd: Optional[str] = None, default: Optional[Any] = None
@@ -23,7 +50,9 @@ class PluginUpdater:
     def _get_local_head_commit(
         self, plugin_path: str, short: bool = False
     ) -> Optional[str]:
-        out = self._safe_check_output(["git", "rev-parse", "HEAD"], cwd=plugin_path)
+        out = git_reader.read_head(plugin_path) or self._safe_check_output(
+            ["git", "rev-parse", "HEAD"], cwd=plugin_path
+        )
         if out and short:
             return out[:7]
 
@@ -31,8 +60,11 @@ class PluginUpdater:
 
     def _get_repo_size(self, plugin_path: str) -> str:
         try:
+            # Versioned plugins keep their objects in the shared repository
+            path = git_reader.git_dir(plugin_path)
+            git_path = git_reader.common_dir(path) if path else ".git"
             result = subprocess.run(
-                ["du", "-sh", ".git"], cwd=plugin_path, capture_output=True, text=True
+                ["du", "-sh", git_path], cwd=plugin_path, capture_output=True, text=True
             )
             if result.returncode == 0:
                 return result.stdout.strip().split()[0]
@@ -41,45 +73,42 @@ class PluginUpdater:
 
         return "Unknown"
 
-    def _get_time_since_tag(self, plugin_path: str, tag: Optional[str]) -> str:
-        if not tag:
-            return "Unknown"
-
-        try:
-            result = subprocess.run(
-                ["git", "log", "-1", "--format=%cr", f"tags/{tag}"],
-                cwd=plugin_path,
-                capture_output=True,
-                text=True,
-            )
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except Exception:
-            pass
-
-        return "Unknown"
-
-    def _get_remote_tags(self, repo_url: str) -> List[str]:
-        try:
-            result = subprocess.run(
-                ["git", "ls-remote", "--tags", repo_url],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if result.returncode != 0:
-                return []
-            tags: List[str] = []
-            for line in result.stdout.splitlines():
-                parts = line.split()
-                if len(parts) == 2 and "refs/tags/" in parts[1]:
-                    tag = parts[1].split("/")[-1]
-                    if tag.endswith("^{}"):
-                        tag = tag[:-3]
-                    tags.append(tag)
-            return sorted(set(tags), reverse=True)
-        except Exception:
-            return []
+    def _count_fetched(self, plugin_path: str) -> ContextManager[None]:
+        path = git_reader.git_dir(plugin_path) if metrics.enabled() else None
+        objects = os.path.join(git_reader.common_dir(path), "objects") if path else None
+        return metrics.count_growth(metrics.FETCHED_BYTES, objects, operation="update")
+
+    def get_changelog(self, update: Dict[str, Any]) -> Optional[Changelog]:
+        """Fetch the commits an update would bring in; meant to run on demand."""
+        internal = update["_internal"]
+        new_commit = internal.get("new_commit")
+        if not internal.get("update_available") or not new_commit:
+            return None
+        refspec = (
+            f"refs/tags/{internal['new_tag']}:refs/tags/{internal['new_tag']}"
+            if internal["type"] == "tag"
+            else f"+HEAD:{PREFETCH_HEAD_REF}"
+        )
+        return read_changelog(
+            internal["plugin_path"],
+            internal["repo_url"],
+            internal.get("old_commit"),
+            new_commit,
+            refspec,
+        )
+
+    def _get_tag_index(
+        self, plugin_path: str, repo_url: str, prefetched: bool
+    ) -> Optional[TagIndex]:
+        if prefetched:
+            return local_tag_index(plugin_path)
+        return remote_tag_index(repo_url)
+
+    def _get_prefetched_head(self, plugin_path: str) -> Optional[str]:
+        path = git_reader.git_dir(plugin_path)
+        if path is None:
+            return None
+        return git_reader.resolve_ref(path, PREFETCH_HEAD_REF)
 
     def _get_latest_commit(self, repo_url: str, branch: str = "HEAD") -> Optional[str]:
         try:
@@ -95,20 +124,6 @@ class PluginUpdater:
             pass
         return None
 
-    def _get_tag_commit_hash(self, repo_url: str, tag: str) -> Optional[str]:
-        try:
-            result = subprocess.run(
-                ["git", "ls-remote", repo_url, f"refs/tags/{tag}"],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if result.returncode == 0 and result.stdout:
-                return result.stdout.split()[0]
-        except Exception:
-            pass
-        return None
-
     def _write_lockfile_update(
         self,
         name: str,
@@ -116,17 +131,18 @@ class PluginUpdater:
         new_commit: Optional[str] = None,
     ) -> bool:
         try:
-            lock_data = lfm.read_lock_file()
-            for plugin in lock_data.get("plugins", []):
-                if plugin["name"] == name:
-                    git_info = plugin.setdefault("git", {})
-                    if new_commit:
-                        git_info["commit_hash"] = new_commit
-                    if new_tag is not None:
-                        git_info["tag"] = new_tag
-                    git_info["last_pull"] = datetime.utcnow().isoformat()
-                    break
-            lfm.write_lock_file(lock_data)
+            with self._lock_file_lock:
+                lock_data = lfm.read_lock_file()
+                for plugin in lock_data.get("plugins", []):
+                    if plugin["name"] == name:
+                        git_info = plugin.setdefault("git", {})
+                        if new_commit:
+                            git_info["commit_hash"] = new_commit
+                        if new_tag is not None:
+                            git_info["tag"] = new_tag
+                        git_info["last_pull"] = datetime.utcnow().isoformat()
+                        break
+                lfm.write_lock_file(lock_data)
             return True
         except Exception:
             return False
@@ -134,12 +150,13 @@ class PluginUpdater:
     def check_for_updates(self) -> List[Dict[str, Any]]:
         updates: List[Dict[str, Any]] = []
         lock_data = lfm.read_lock_file()
+        prefetch_state = read_prefetch_state()
         for plugin in lock_data.get("plugins", []):
             name = plugin["name"]
             plugin_path = os.path.join(self.plugins_dir, name)
             git_info = plugin.get("git", {})
             repo = git_info.get("repo")
-            repo_url = f"https://github.com/{repo}" if repo else None
+            repo_url = git_utils.repo_url(repo) if repo else None
 
             if not os.path.exists(plugin_path) or not repo_url:
                 updates.append(
@@ -164,14 +181,26 @@ class PluginUpdater:
             new_commit = None
             update_type = "commit"
 
+            # A recent prefetch already brought the remote's refs here
+            prefetched = is_prefetched(prefetch_state, name, repo_url)
+
             if current_tag:
-                remote_tags = self._get_remote_tags(repo_url)
-                if remote_tags:
-                    latest_tag = remote_tags[0]
+                index = self._get_tag_index(plugin_path, repo_url, prefetched)
+                latest_tag = index.latest(git_info.get("constraint")) if index else None
+                if index is not None and latest_tag:
                     new_tag = latest_tag
                     update_type = "tag"
-                    if current_tag != latest_tag:
-                        new_commit = self._get_tag_commit_hash(repo_url, latest_tag)
+                    # Never offer a tag that sorts below the installed one
+                    if current_tag != latest_tag and (
+                        current_tag not in index.ordered
+                        or index.ordered.index(latest_tag)
+                        < index.ordered.index(current_tag)
+                    ):
+                        new_commit = (
+                            local_tag_commit(plugin_path, latest_tag)
+                            if prefetched
+                            else index.commit(latest_tag)
+                        )
                         update_available = True
                     else:
                         new_tag = current_tag
@@ -180,7 +209,11 @@ class PluginUpdater:
                     new_tag = current_tag
                     new_commit = current_commit
             else:
-                latest_commit = self._get_latest_commit(repo_url)
+                latest_commit = (
+                    self._get_prefetched_head(plugin_path)
+                    if prefetched
+                    else self._get_latest_commit(repo_url)
+                )
                 if latest_commit:
                     new_commit = latest_commit
                     update_available = current_commit != latest_commit
@@ -198,14 +231,9 @@ class PluginUpdater:
                     "current_version": current_version,
                     "new_version": new_version,
                     "size": self._get_repo_size(plugin_path),
-                    "released": self._get_time_since_tag(
-                        plugin_path, new_tag or current_tag
-                    ),
-                    "changelog": (
-                        [f"Update available: {current_version} → {new_version}"]
-                        if update_available
-                        else ["Up-to-date"]
-                    ),
+                    # Filled in by get_changelog once someone looks at it
+                    "released": None,
+                    "changelog": None if update_available else ["Up-to-date"],
                     "marked": False,
                     "progress": 0,
                     "_internal": {
@@ -223,6 +251,7 @@ class PluginUpdater:
 
         return updates
 
+    @metrics.timed(metrics.UPDATE_SECONDS)
     def update_plugin(
         self,
         update_info: Dict[str, Any],
@@ -244,44 +273,45 @@ class PluginUpdater:
 
             if internal["type"] == "tag":
                 tag = internal["new_tag"]
-                subprocess.run(
-                    [
-                        "git",
-                        "fetch",
-                        "--depth=1",
-                        "origin",
-                        f"refs/tags/{tag}:refs/tags/{tag}",
-                    ],
-                    cwd=plugin_path,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
+                if not git_reader.resolve_commit(plugin_path, f"tags/{tag}"):
+                    with self._count_fetched(plugin_path):
+                        subprocess.run(
+                            [
+                                "git",
+                                "fetch",
+                                "--depth=1",
+                                "origin",
+                                f"refs/tags/{tag}:refs/tags/{tag}",
+                            ],
+                            cwd=plugin_path,
+                            check=True,
+                            capture_output=True,
+                            text=True,
+                        )
                 send_progress(50)
-                subprocess.run(
-                    ["git", "checkout", f"tags/{tag}"],
-                    cwd=plugin_path,
-                    check=True,
-                    capture_output=True,
-                    text=True,
+                commit = git_reader.resolve_commit(
+                    plugin_path, f"tags/{tag}"
+                ) or self._safe_check_output(
+                    ["git", "rev-parse", f"tags/{tag}^{{commit}}"], cwd=plugin_path
                 )
+                if not commit or not switch_version(self.plugins_dir, name, commit):
+                    send_progress(0)
+                    return False
             else:
                 commit = internal["new_commit"]
-                subprocess.run(
-                    ["git", "fetch", "origin", commit],
-                    cwd=plugin_path,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
+                if not git_reader.resolve_commit(plugin_path, commit):
+                    with self._count_fetched(plugin_path):
+                        subprocess.run(
+                            ["git", "fetch", "origin", commit],
+                            cwd=plugin_path,
+                            check=True,
+                            capture_output=True,
+                            text=True,
+                        )
                 send_progress(50)
-                subprocess.run(
-                    ["git", "checkout", commit],
-                    cwd=plugin_path,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
+                if not switch_version(self.plugins_dir, name, commit):
+                    send_progress(0)
+                    return False
 
             send_progress(90)
 
@@ -311,79 +341,103 @@ class PluginUpdater:
         self,
         update_info: Dict[str, Any],
         progress_callback: Optional[Callable[[str, int], None]] = None,
-    ) -> threading.Thread:
+        priority: int = PRIORITY_NORMAL,
+    ) -> Job:
+        """Queue an update on the scheduler; the job's result is the success flag."""
         name = update_info["name"]
 
-        def thread_fn() -> None:
-            try:
-                success = self.update_plugin(update_info, progress_callback)
-                if not success and progress_callback:
-                    progress_callback(name, 0)
-            except Exception:
-                if progress_callback:
-                    progress_callback(name, 0)
-            finally:
-                self._update_threads.pop(name, None)
-
-        thread = threading.Thread(target=thread_fn, daemon=True)
-        self._update_threads[name] = thread
-        thread.start()
-        return thread
+        def job_fn() -> bool:
+            success = self.update_plugin(update_info, progress_callback)
+            if not success and progress_callback:
+                progress_callback(name, 0)
+            return success
+
+        return self.scheduler.submit(
+            name,
+            job_fn,
+            host=url_host(update_info.get("_internal", {}).get("repo_url")),
+            priority=priority,
+        )
+
+    def update_plugins(
+        self,
+        updates: List[Dict[str, Any]],
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        first: Optional[str] = None,
+    ) -> List[Job]:
+        """Queue several updates; marked plugins and ``first`` run ahead."""
+        if updates:
+            # Every upgrade run can be undone with `coffee rollback`
+            record_generation("upgrade")
+        return [
+            self.update_plugin_async(
+                update,
+                progress_callback,
+                self._priority(update, first),
+            )
+            for update in updates
+        ]
+
+    def _priority(self, update: Dict[str, Any], first: Optional[str]) -> int:
+        if update["name"] == first:
+            return PRIORITY_HIGH
+        if update.get("marked", False):
+            return PRIORITY_HIGH + 1
+        return PRIORITY_NORMAL
 
     def update_marked_plugins(
         self,
         updates: List[Dict[str, Any]],
         progress_callback: Optional[Callable[[str, int], None]] = None,
-    ) -> List[threading.Thread]:
-        threads: List[threading.Thread] = []
-        for update in updates:
-            if update.get("marked", False):
-                thread = self.update_plugin_async(update, progress_callback)
-                threads.append(thread)
-        return threads
+    ) -> List[Job]:
+        return self.update_plugins(
+            [u for u in updates if u.get("marked", False)], progress_callback
+        )
 
     def update_all_plugins(
         self,
         updates: List[Dict[str, Any]],
         progress_callback: Optional[Callable[[str, int], None]] = None,
-    ) -> List[threading.Thread]:
-        threads: List[threading.Thread] = []
-        for update in updates:
-            if update.get("_internal", {}).get("update_available", False):
-                thread = self.update_plugin_async(update, progress_callback)
-                threads.append(thread)
-        return threads
+    ) -> List[Job]:
+        return self.update_plugins(
+            [
+                u
+                for u in updates
+                if u.get("_internal", {}).get("update_available", False)
+            ],
+            progress_callback,
+        )
 
     def auto_update_all(self) -> None:
         updates = self.check_for_updates()
         lock_data = lfm.read_lock_file()
+        skipped = {
+            p["name"]
+            for p in lock_data.get("plugins", [])
+            if p.get("skip_auto_update", False)
+        }
         available_updates = [
-            u for u in updates if u.get("_internal", {}).get("update_available", False)
+            u
+            for u in updates
+            if u.get("_internal", {}).get("update_available", False)
+            and u["name"] not in skipped
         ]
 
         if not available_updates:
             return
 
+        record_generation("auto update", lock_data)
         for update in available_updates:
             name = update["name"]
-            plugin_info = next(
-                (p for p in lock_data.get("plugins", []) if p["name"] == name), None
-            )
-
-            if plugin_info and plugin_info.get("skip_auto_update", False):
-                continue
-
             success = self.update_plugin(update)
             if success:
                 print(f"{name} updated successfully")
             else:
                 print(f"Failed to update {name}")
 
-    def get_update_status(self, plugin_name: str) -> Optional[threading.Thread]:
-        return self._update_threads.get(plugin_name)
+    def get_update_status(self, plugin_name: str) -> Optional[Job]:
+        return self.scheduler.get(plugin_name)
 
     def cancel_update(self, plugin_name: str) -> bool:
-        thread = self._update_threads.get(plugin_name)
-        if thread and thread.is_alive():
-            return False
-        return True
+        job = self.scheduler.get(plugin_name)
+        return job.cancel() if job else True
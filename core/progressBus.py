@@ -0,0 +1,52 @@
+import threading
+import time
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class ProgressBus(Generic[K]):
+    """
+    Coalesces progress reports from worker threads.
+
+    Only the latest progress per key is kept, and ``on_flush`` is called with
+    the pending batch at most ``max_rate`` times per second.
+    """
+
+    def __init__(
+        self,
+        on_flush: Callable[[Dict[K, int]], None],
+        max_rate: float = 10.0,
+    ) -> None:
+        self.on_flush = on_flush
+        self.interval: float = 1.0 / max_rate if max_rate > 0 else 0.0
+        self._pending: Dict[K, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._last_flush: float = 0.0
+
+    def publish(self, key: K, progress: int) -> None:
+        with self._lock:
+            self._pending[key] = progress
+            if self._timer is not None:
+                return
+            delay = self._last_flush + self.interval - time.monotonic()
+            if delay > 0:
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        # Flushes are serialized so batches are always delivered in order
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = self._pending, {}
+                self._last_flush = time.monotonic()
+            if pending:
+                self.on_flush(pending)
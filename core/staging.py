@@ -0,0 +1,91 @@
+import os
+import shutil
+import uuid
+
+from core.worktrees import versions_dir
+
+STAGING_DIRNAME: str = ".staging"
+
+
+def staging_path(plugins_dir: str, name: str) -> str:
+    """
+    Return a fresh staging path for ``name`` inside the plugins directory.
+
+    Staging lives on the same filesystem as the plugins so a finished tree can
+    be moved into place with a single rename. The owning pid is part of the
+    name so a later scan can tell abandoned trees from ones still in use.
+    """
+    staging_dir = os.path.join(plugins_dir, STAGING_DIRNAME)
+    os.makedirs(staging_dir, exist_ok=True)
+    return os.path.join(staging_dir, f"{name}.{os.getpid()}.{uuid.uuid4().hex[:8]}")
+
+
+def commit_staged(path: str, plugin_path: str, replace: bool = False) -> bool:
+    """
+    Move a finished staging tree to ``plugin_path``.
+
+    With ``replace`` an existing tree is moved aside, and only deleted once
+    the new one is in place; if the swap fails it is moved back. Returns
+    False if the tree could not be moved in, e.g. because another install
+    got there first and ``replace`` is not set; the staging tree is
+    discarded either way.
+    """
+    old_path = None
+    try:
+        if replace and os.path.lexists(plugin_path):
+            old_path = staging_path(os.path.dirname(plugin_path), "replaced")
+            os.rename(plugin_path, old_path)
+        os.rename(path, plugin_path)
+    except OSError:
+        if old_path is not None and not os.path.lexists(plugin_path):
+            try:
+                os.rename(old_path, plugin_path)
+                old_path = None
+            except OSError:
+                pass
+        return False
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    if old_path is not None:
+        if os.path.islink(old_path):
+            os.remove(old_path)
+        else:
+            shutil.rmtree(old_path, ignore_errors=True)
+        # Worktrees of a versioned plugin go with it
+        plugins_dir = os.path.dirname(plugin_path)
+        name = os.path.basename(plugin_path)
+        shutil.rmtree(versions_dir(plugins_dir, name), ignore_errors=True)
+    return True
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def clean_staging(plugins_dir: str) -> int:
+    """Remove staging trees left behind by processes that no longer run."""
+    staging_dir = os.path.join(plugins_dir, STAGING_DIRNAME)
+    try:
+        entries = os.listdir(staging_dir)
+    except OSError:
+        return 0
+
+    removed = 0
+    for entry in entries:
+        parts = entry.rsplit(".", 2)
+        try:
+            pid = int(parts[1])
+        except (IndexError, ValueError):
+            pid = None
+        if pid is not None and (pid == os.getpid() or _pid_alive(pid)):
+            continue
+        shutil.rmtree(os.path.join(staging_dir, entry), ignore_errors=True)
+        removed += 1
+    return removed
@@ -0,0 +1,219 @@
+import re
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core import git_reader
+
+# Remote tag lists are reused for this long before ls-remote runs again
+REMOTE_TTL: float = 60.0
+
+_VERSION_RE = re.compile(
+    r"^(?:[A-Za-z][\w-]*?[-_])?[vV]?(\d+(?:\.\d+)*)"
+    r"(?:[-_.]?(dev|a|alpha|b|beta|pre|preview|c|rc)[-_.]?(\d*))?$"
+)
+_PRE_RANKS = {
+    "dev": 0,
+    "a": 1,
+    "alpha": 1,
+    "b": 2,
+    "beta": 2,
+    "pre": 3,
+    "preview": 3,
+    "c": 4,
+    "rc": 4,
+}
+_CONSTRAINT_RE = re.compile(r"^\s*(\^|~|>=|<=|>|<|==|=)?\s*[vV]?(\d+(?:\.\d+)*)\s*$")
+
+Release = Tuple[int, ...]
+VersionKey = Tuple[Release, Tuple[int, ...]]
+
+
+def _release(numbers: str) -> Release:
+    release = tuple(int(n) for n in numbers.split("."))
+    # 1.2 and 1.2.0 are the same version
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+    return release
+
+
+def parse_version(tag: str) -> Optional[VersionKey]:
+    """
+    Parse ``v1.2.3``, ``1.2``, ``2.0.0-rc1``, ``plugin-1.4`` and the like.
+
+    Returns a key that sorts like semver/PEP 440: numerically by release,
+    with pre-releases before the final release. None if the tag isn't a
+    version.
+    """
+    match = _VERSION_RE.match(tag)
+    if match is None:
+        return None
+    release = _release(match.group(1))
+    if match.group(2) is None:
+        return release, (len(_PRE_RANKS),)
+    return release, (_PRE_RANKS[match.group(2)], int(match.group(3) or 0))
+
+
+def is_prerelease(key: VersionKey) -> bool:
+    return key[1][0] < len(_PRE_RANKS)
+
+
+def is_constraint(tag: Optional[str]) -> bool:
+    """Whether a configured tag is a range like ``^1.2`` rather than a tag name."""
+    return tag is not None and tag.strip()[:1] in ("^", "~", ">", "<", "=")
+
+
+def parse_constraint(constraint: str) -> Optional[List[Tuple[str, Release]]]:
+    """
+    Turn ``^1.2``, ``~2.0`` or ``>=1.4, <2`` into (operator, release) bounds.
+
+    ``^`` allows changes that keep the leftmost non-zero part (``^1.2`` =
+    ``>=1.2, <2``, ``^0.3`` = ``>=0.3, <0.4``); ``~`` allows patch changes
+    when a minor is given (``~2.1`` = ``>=2.1, <2.2``) and minor changes
+    otherwise (``~2`` = ``>=2, <3``). Returns None for an invalid constraint.
+    """
+    bounds: List[Tuple[str, Release]] = []
+    for part in constraint.split(","):
+        match = _CONSTRAINT_RE.match(part)
+        if match is None:
+            return None
+        op = match.group(1) or "=="
+        numbers = [int(n) for n in match.group(2).split(".")]
+        lower = _release(match.group(2))
+        if op == "^":
+            pivot = next((i for i, n in enumerate(numbers) if n), len(numbers) - 1)
+            upper = numbers[:pivot] + [numbers[pivot] + 1]
+            bounds += [(">=", lower), ("<", _release(".".join(map(str, upper))))]
+        elif op == "~":
+            minor = min(len(numbers), 2) - 1
+            upper = numbers[:minor] + [numbers[minor] + 1]
+            bounds += [(">=", lower), ("<", _release(".".join(map(str, upper))))]
+        else:
+            bounds.append(("==" if op == "=" else op, lower))
+    return bounds
+
+
+def _satisfies(release: Release, bounds: List[Tuple[str, Release]]) -> bool:
+    def pad(r: Release, width: int) -> Release:
+        return r + (0,) * (width - len(r))
+
+    for op, bound in bounds:
+        width = max(len(release), len(bound))
+        a, b = pad(release, width), pad(bound, width)
+        if not {
+            ">=": a >= b,
+            "<=": a <= b,
+            ">": a > b,
+            "<": a < b,
+            "==": a == b,
+        }[op]:
+            return False
+    return True
+
+
+def _sort_key(tag: str) -> Tuple[int, VersionKey, str]:
+    key = parse_version(tag)
+    # Versions outrank anything else; other tags fall back to their names
+    return (1, key, tag) if key is not None else (0, ((), ()), tag)
+
+
+class TagIndex:
+    """
+    A repository's tags in version order, newest first.
+
+    Tags that parse as versions are ordered numerically, so ``v1.10.0``
+    outranks ``v1.9.0``; other tags come after them, by name.
+    """
+
+    def __init__(self, tags: Dict[str, Optional[str]]) -> None:
+        self.tags = tags
+        self.ordered: List[str] = sorted(tags, key=_sort_key, reverse=True)
+
+    def latest(self, constraint: Optional[str] = None) -> Optional[str]:
+        """The newest release, or the newest satisfying ``constraint``."""
+        if not constraint:
+            for tag in self.ordered:
+                key = parse_version(tag)
+                if key is None or not is_prerelease(key):
+                    return tag
+            # Pre-releases only win when there is nothing else
+            return self.ordered[0] if self.ordered else None
+        bounds = parse_constraint(constraint)
+        if bounds is None:
+            return None
+        for tag in self.ordered:
+            key = parse_version(tag)
+            if key is None:
+                break
+            # Ranges never pick pre-releases
+            if not is_prerelease(key) and _satisfies(key[0], bounds):
+                return tag
+        return None
+
+    def commit(self, tag: str) -> Optional[str]:
+        return self.tags.get(tag)
+
+
+_local: Dict[str, Tuple[Dict[str, str], TagIndex]] = {}
+_remote: Dict[str, Tuple[float, TagIndex]] = {}
+_cache_lock = threading.Lock()
+
+
+def local_tag_index(repo_path: str) -> Optional[TagIndex]:
+    """
+    Index the tags of a local repository without running git.
+
+    The index is rebuilt only when the repository's tag refs change. Commits
+    are not peeled up front; ``local_tag_commit`` does that per tag.
+    """
+    tags = git_reader.read_tags(repo_path)
+    if tags is None:
+        return None
+    with _cache_lock:
+        cached = _local.get(repo_path)
+        # The reader hands back the same dict until the refs change
+        if cached is not None and cached[0] is tags:
+            return cached[1]
+        index = TagIndex(dict.fromkeys(tags))
+        _local[repo_path] = (tags, index)
+        return index
+
+
+def local_tag_commit(repo_path: str, tag: str) -> Optional[str]:
+    return git_reader.resolve_commit(repo_path, f"tags/{tag}")
+
+
+def remote_tag_index(url: str) -> Optional[TagIndex]:
+    """Index a remote's tags with one ``ls-remote``; reused for ``REMOTE_TTL``."""
+    with _cache_lock:
+        cached = _remote.get(url)
+        if cached is not None and time.monotonic() - cached[0] < REMOTE_TTL:
+            return cached[1]
+    try:
+        result = subprocess.run(
+            ["git", "ls-remote", "--tags", url],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+
+    tags: Dict[str, Optional[str]] = {}
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) != 2 or not parts[1].startswith("refs/tags/"):
+            continue
+        name = parts[1][len("refs/tags/") :]
+        if name.endswith("^{}"):
+            # The peeled commit of an annotated tag
+            tags[name[:-3]] = parts[0]
+        else:
+            tags.setdefault(name, parts[0])
+    index = TagIndex(tags)
+    with _cache_lock:
+        _remote[url] = (time.monotonic(), index)
+    return index
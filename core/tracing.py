@@ -0,0 +1,200 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Deque, Dict, Iterator, List, Optional
+
+# Span categories
+SUBPROCESS = "subprocess"
+FILE = "file"
+
+# Spans kept in memory; older ones are dropped first
+MAX_SPANS: int = 10000
+
+_OriginalPopen = subprocess.Popen
+_spans: Deque["Span"] = deque(maxlen=MAX_SPANS)
+_spans_lock = threading.Lock()
+_enabled = False
+# Called with every finished span, whether or not spans are being kept
+_listeners: List[Callable[["Span"], None]] = []
+# Trace timestamps are microseconds since this module was imported
+_origin = time.perf_counter()
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start: float
+    duration: float = 0.0
+    thread: int = 0
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(max_spans: int = MAX_SPANS) -> None:
+    """
+    Start recording spans for file I/O and every subprocess.
+
+    Subprocesses are traced by swapping ``subprocess.Popen`` for a subclass,
+    which ``subprocess.run``, ``check_output`` and friends all go through.
+    """
+    global _enabled, _spans
+    with _spans_lock:
+        _spans = deque(_spans, maxlen=max_spans)
+    subprocess.Popen = _TracedPopen  # type: ignore[misc]
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    if not _listeners:
+        subprocess.Popen = _OriginalPopen  # type: ignore[misc]
+    _enabled = False
+
+
+def add_listener(listener: Callable[[Span], None]) -> None:
+    """Call ``listener`` with each finished span, even while not recording."""
+    subprocess.Popen = _TracedPopen  # type: ignore[misc]
+    _listeners.append(listener)
+
+
+def _record(span: Span) -> None:
+    if _enabled:
+        with _spans_lock:
+            _spans.append(span)
+    for listener in _listeners:
+        listener(span)
+
+
+def spans(last: Optional[int] = None) -> List[Span]:
+    """The recorded spans, oldest first; only the newest ``last`` if given."""
+    with _spans_lock:
+        recorded = list(_spans)
+    return recorded[-last:] if last else recorded
+
+
+@contextmanager
+def span(name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time the enclosed block as one span.
+
+    Yields the span's args so the block can add to them, e.g. ``bytes``.
+    Costs next to nothing while tracing is off.
+    """
+    if not _enabled and not _listeners:
+        yield args
+        return
+    current = Span(name, category, time.perf_counter(), args=args)
+    try:
+        yield current.args
+    except Exception as e:
+        current.args["error"] = str(e)
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.start
+        current.thread = threading.get_ident()
+        _record(current)
+
+
+@contextmanager
+def traced_open(path: str, mode: str = "r") -> Iterator[IO[Any]]:
+    """``open`` that records the time spent with the file and its size."""
+    kind = "read" if mode.startswith("r") and "+" not in mode else "write"
+    with span(f"{kind} {os.path.basename(path)}", FILE, path=path) as args:
+        with open(path, mode) as f:
+            yield f
+            try:
+                args["bytes"] = f.tell()
+            except (OSError, ValueError):
+                pass
+
+
+def _command_name(args: Any) -> str:
+    argv = [args] if isinstance(args, (str, bytes)) else list(args)
+    words = [os.path.basename(str(argv[0]))] if argv else []
+    # "git fetch", "tmux set-environment", ...: the subcommand tells more
+    words += [str(arg) for arg in argv[1:2] if not str(arg).startswith("-")]
+    return " ".join(words)
+
+
+class _TracedPopen(subprocess.Popen):  # type: ignore[type-arg]
+    def __init__(self, args: Any, *rest: Any, **kwargs: Any) -> None:
+        self._trace_span = Span(
+            _command_name(args),
+            SUBPROCESS,
+            time.perf_counter(),
+            thread=threading.get_ident(),
+            args={
+                "command": args if isinstance(args, str) else " ".join(map(str, args)),
+                "cwd": str(kwargs.get("cwd") or os.getcwd()),
+            },
+        )
+        self._trace_done = False
+        try:
+            super().__init__(args, *rest, **kwargs)
+        except Exception as e:
+            self._trace_span.args["error"] = str(e)
+            self._finish_span(None)
+            raise
+
+    def _finish_span(self, returncode: Optional[int]) -> None:
+        if self._trace_done:
+            return
+        self._trace_done = True
+        self._trace_span.duration = time.perf_counter() - self._trace_span.start
+        self._trace_span.args["exit_code"] = returncode
+        _record(self._trace_span)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        returncode = super().wait(timeout)
+        self._finish_span(returncode)
+        return returncode
+
+    def poll(self) -> Optional[int]:
+        returncode = super().poll()
+        if returncode is not None:
+            self._finish_span(returncode)
+        return returncode
+
+    def communicate(self, *args: Any, **kwargs: Any) -> Any:
+        out, err = super().communicate(*args, **kwargs)
+        # Output that wasn't captured isn't counted
+        self._trace_span.args["bytes"] = len(out or "") + len(err or "")
+        return out, err
+
+
+def to_chrome_trace(recorded: List[Span]) -> Dict[str, Any]:
+    """Chrome trace-event JSON (chrome://tracing, Perfetto) for the spans."""
+    pid = os.getpid()
+    return {
+        "displayTimeUnit": "ms",
+        "traceEvents": [
+            {
+                "name": current.name,
+                "cat": current.category,
+                "ph": "X",
+                "ts": round((current.start - _origin) * 1e6, 1),
+                "dur": round(current.duration * 1e6, 1),
+                "pid": pid,
+                "tid": current.thread,
+                "args": current.args,
+            }
+            for current in recorded
+        ],
+    }
+
+
+def write_chrome_trace(path: str) -> int:
+    """Write every recorded span to ``path``; returns how many were written."""
+    recorded = spans()
+    with open(path, "w") as f:
+        json.dump(to_chrome_trace(recorded), f)
+    return len(recorded)
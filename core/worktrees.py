@@ -0,0 +1,134 @@
+import os
+import shutil
+import uuid
+from typing import List
+
+from core.git_utils import run_git
+
+VERSIONS_DIRNAME: str = ".versions"
+# The active version plus the one before it, so a rollback is just a rename
+KEEP_VERSIONS: int = 2
+
+
+def versions_dir(plugins_dir: str, name: str) -> str:
+    return os.path.join(plugins_dir, VERSIONS_DIRNAME, name)
+
+
+def uses_versions(plugin_path: str) -> bool:
+    """Whether a plugin is laid out as versioned worktrees behind a symlink."""
+    return os.path.islink(plugin_path)
+
+
+def _repo_dir(plugins_dir: str, name: str) -> str:
+    return os.path.join(versions_dir(plugins_dir, name), "repo.git")
+
+
+def _adopt_checkout(plugins_dir: str, name: str) -> bool:
+    """Turn the repository of a plain checkout into the shared version repo."""
+    repo = _repo_dir(plugins_dir, name)
+    if os.path.isdir(repo):
+        return True
+    dot_git = os.path.join(plugins_dir, name, ".git")
+    if not os.path.isdir(dot_git):
+        return False
+    os.makedirs(os.path.dirname(repo), exist_ok=True)
+    # The old files stay in place and keep serving tmux until the switch
+    os.rename(dot_git, repo)
+    return run_git(repo, "config", "core.bare", "true") is not None
+
+
+def _version_paths(plugins_dir: str, name: str) -> List[str]:
+    base = versions_dir(plugins_dir, name)
+    try:
+        entries = os.listdir(base)
+    except OSError:
+        return []
+    return [
+        os.path.join(base, entry)
+        for entry in entries
+        if len(entry) == 40 and os.path.isdir(os.path.join(base, entry))
+    ]
+
+
+def switch_version(plugins_dir: str, name: str, commit: str) -> bool:
+    """
+    Make ``plugins/<name>`` point at a worktree checked out at ``commit``.
+
+    Each version is a detached worktree of one bare repository under
+    ``.versions/<name>``, and ``plugins/<name>`` is a symlink to the active
+    one. The switch is a single rename of that symlink, so the active tree
+    never changes underneath running plugin scripts. Plain checkouts are
+    converted on their first switch. The commit must already be local.
+    """
+    plugin_path = os.path.join(plugins_dir, name)
+    base = versions_dir(plugins_dir, name)
+    version_path = os.path.join(base, commit)
+
+    if not os.path.isdir(version_path):
+        if run_git(plugin_path, "cat-file", "-e", f"{commit}^{{commit}}") is None:
+            return False
+        if not _adopt_checkout(plugins_dir, name):
+            return False
+        repo = _repo_dir(plugins_dir, name)
+        run_git(repo, "worktree", "prune")
+        if (
+            run_git(repo, "worktree", "add", "-q", "--detach", version_path, commit)
+            is None
+        ):
+            shutil.rmtree(version_path, ignore_errors=True)
+            return False
+    # Newest switch first when deciding what to prune
+    os.utime(version_path)
+
+    tmp_link = os.path.join(base, f".link.{os.getpid()}.{uuid.uuid4().hex[:8]}")
+    os.symlink(os.path.relpath(version_path, plugins_dir), tmp_link)
+    try:
+        if os.path.isdir(plugin_path) and not os.path.islink(plugin_path):
+            # A converted plain checkout: a directory can't be replaced by a
+            # rename, so move it aside first
+            old_path = os.path.join(base, f".old.{os.getpid()}")
+            os.rename(plugin_path, old_path)
+            os.replace(tmp_link, plugin_path)
+            shutil.rmtree(old_path, ignore_errors=True)
+        else:
+            os.replace(tmp_link, plugin_path)
+    except OSError:
+        if os.path.lexists(tmp_link):
+            os.remove(tmp_link)
+        return False
+
+    prune_versions(plugins_dir, name)
+    return True
+
+
+def prune_versions(plugins_dir: str, name: str, keep: int = KEEP_VERSIONS) -> None:
+    """Remove all but the active version and the newest ``keep - 1`` others."""
+    plugin_path = os.path.join(plugins_dir, name)
+    current = os.path.realpath(plugin_path)
+    others = sorted(
+        (
+            path
+            for path in _version_paths(plugins_dir, name)
+            if os.path.realpath(path) != current
+        ),
+        key=lambda path: os.stat(path).st_mtime,
+        reverse=True,
+    )
+    stale = others[max(0, keep - 1) :]
+    if not stale:
+        return
+    repo = _repo_dir(plugins_dir, name)
+    for path in stale:
+        if run_git(repo, "worktree", "remove", "--force", path) is None:
+            shutil.rmtree(path, ignore_errors=True)
+    run_git(repo, "worktree", "prune")
+
+
+def remove_plugin_tree(plugins_dir: str, name: str) -> None:
+    """Delete a plugin's checkout, or its symlink and every stored version."""
+    plugin_path = os.path.join(plugins_dir, name)
+    if os.path.islink(plugin_path):
+        os.remove(plugin_path)
+    elif os.path.exists(plugin_path):
+        shutil.rmtree(plugin_path)
+    shutil.rmtree(versions_dir(plugins_dir, name), ignore_errors=True)
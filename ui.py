@@ -2,6 +2,7 @@
 """
 Coffee TUI entry point for tmux popup
 """
+
 import os
 import sys
 import threading
@@ -9,17 +10,22 @@ import threading
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-from core import PluginRemover, PluginUpdater
+from core import PluginPrefetcher, PluginRemover, PluginUpdater, metrics, tracing
+from core.pluginPrefetcher import prefetch_due
+from core.staging import clean_staging
 from ui.app import PluginManagerApp
-from ui.constants import PLUGINS_DIR
+from ui.constants import DEBUG_SPANS, PLUGINS_DIR
 
 
-def run_auto_update_in_background() -> None:
-    updater = PluginUpdater(PLUGINS_DIR)
+def run_prefetch_in_background() -> None:
+    # Only fetch; updates are applied from the Update tab or `coffee upgrade`
+    if not prefetch_due():
+        return
+    prefetcher = PluginPrefetcher(PLUGINS_DIR)
 
     def worker() -> None:
         try:
-            updater.auto_update_all()
+            prefetcher.prefetch_plugins()
         except Exception:
             pass
 
@@ -28,7 +34,12 @@ def run_auto_update_in_background() -> None:
 
 
 def main() -> None:
-    run_auto_update_in_background()
+    # Feeds the hidden debug panel (`D`)
+    tracing.enable(DEBUG_SPANS)
+    if metrics.METRICS_FORMAT:
+        metrics.enable(metrics.METRICS_FORMAT)
+    clean_staging(PLUGINS_DIR)
+    run_prefetch_in_background()
     plugin_remover = PluginRemover(PLUGINS_DIR)
     plugin_updater = PluginUpdater(PLUGINS_DIR)
     app = PluginManagerApp(plugin_updater, plugin_remover)
@@ -1,8 +1,8 @@
 import os
-from typing import Any, List
+from typing import Any, List, Optional
 
 from rich.console import Console
-from textual import work
+from textual import events, work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 
@@ -10,9 +10,6 @@ from core import PluginInstaller
 
 from .constants import PLUGINS_DIR, VISIBLE_ROWS
 from .state import AppState
-from .tabs.home import HomeTab
-from .tabs.install import InstallTab
-from .tabs.update import UpdateTab
 from .utils import toggle_plugin
 from .widgets.rich_display import RichDisplay
 
@@ -32,9 +29,17 @@ class PluginManagerApp(App):
         Binding("k", "move_up", "Up", show=False),
         Binding("down", "move_down", "Down", show=False),
         Binding("up", "move_up", "Up", show=False),
+        Binding("pagedown", "page_down", "Page Down", show=False),
+        Binding("pageup", "page_up", "Page Up", show=False),
+        Binding("g", "jump_top", "Top", show=False),
+        Binding("home", "jump_top", "Top", show=False),
+        Binding("G", "jump_bottom", "Bottom", show=False),
+        Binding("end", "jump_bottom", "Bottom", show=False),
         # Actions
         Binding("space", "toggle_plugin_or_mark", "Toggle/Mark", show=False),
         Binding("/", "enter_search_mode", "Search", show=False),
+        # Not listed anywhere: the last subprocess and file I/O spans
+        Binding("D", "toggle_debug", "Debug", show=False),
         Binding("escape", "exit_search_mode", "Exit Search", show=False),
         # Updates
         Binding("c", "check_updates", "Check Updates", show=False),
@@ -55,6 +60,7 @@ class PluginManagerApp(App):
         self.app_state = AppState(plugin_updater, plugin_remover)
         self.app_state.bind_app(self)
         self.rich_display: Any = None
+        self._debug_timer: Any = None
 
     def compose(self) -> ComposeResult:
         self.rich_display = RichDisplay(self.app_state)
@@ -67,10 +73,10 @@ class PluginManagerApp(App):
     def action_switch_to_install(self) -> None:
         self.app_state.current_tab = "Install"
         self.app_state.install_selected = 0
-        install_tab = InstallTab()
-        self.app_state.install_data = install_tab._get_installable_plugins(
-            self.app_state
+        self.app_state.install_data = (
+            self.rich_display.install_tab._get_installable_plugins(self.app_state)
         )
+        self.app_state.touch("Install")
         self.rich_display.refresh()
 
     def action_switch_to_update(self) -> None:
@@ -93,75 +99,105 @@ class PluginManagerApp(App):
             self.notify("Plugin list refreshed")
         self.rich_display.refresh()
 
-    def action_move_down(self) -> None:
-        if self.app_state.current_tab == "Home" and self.app_state.mode == "normal":
-            display_list = HomeTab().get_display_list()
-            if self.app_state.current_selection < len(display_list) - 1:
-                self.app_state.current_selection += 1
-                self._update_scroll_offset(display_list)
-        elif self.app_state.current_tab == "Install":
-            installable_plugins = getattr(self.app_state, "install_data", [])
-            if (
-                installable_plugins
-                and self.app_state.install_selected < len(installable_plugins) - 1
-            ):
-                self.app_state.install_selected += 1
-        elif self.app_state.current_tab == "Update":
-            updates_with_updates = UpdateTab()._get_updates_with_updates(self.app_state)
-            if (
-                updates_with_updates
-                and self.app_state.update_selected < len(updates_with_updates) - 1
-            ):
-                self.app_state.update_selected += 1
-        elif self.app_state.current_tab == "Remove":
-            if self.app_state.remove_selected < len(self.app_state.remove_data) - 1:
-                self.app_state.remove_selected += 1
+    def _get_visible_list(self) -> List[Any]:
+        tab = self.rich_display.tabs[self.app_state.current_tab]
+        if self.app_state.current_tab == "Home":
+            return tab.get_display_list(self.app_state)
+        return tab.get_visible_list(self.app_state)
+
+    def _get_list_length(self) -> int:
+        return len(self._get_visible_list())
+
+    def _select(self, index: int) -> None:
+        tab = self.app_state.current_tab
+        count = self._get_list_length()
+        if count:
+            self.app_state.set_selection(tab, index, count)
         self.rich_display.refresh()
 
+    def _move_selection(self, delta: int) -> None:
+        self._select(self.app_state.get_selection(self.app_state.current_tab) + delta)
+
+    def action_move_down(self) -> None:
+        self._move_selection(1)
+
     def action_move_up(self) -> None:
-        if self.app_state.current_tab == "Home" and self.app_state.mode == "normal":
-            if self.app_state.current_selection > 0:
-                self.app_state.current_selection -= 1
-                self._update_scroll_offset(HomeTab().get_display_list())
-        elif self.app_state.current_tab == "Install":
-            if self.app_state.install_selected > 0:
-                self.app_state.install_selected -= 1
-        elif self.app_state.current_tab == "Update":
-            if self.app_state.update_selected > 0:
-                self.app_state.update_selected -= 1
-        elif self.app_state.current_tab == "Remove":
-            if self.app_state.remove_selected > 0:
-                self.app_state.remove_selected -= 1
-        self.rich_display.refresh()
+        self._move_selection(-1)
+
+    def action_page_down(self) -> None:
+        self._move_selection(VISIBLE_ROWS)
+
+    def action_page_up(self) -> None:
+        self._move_selection(-VISIBLE_ROWS)
+
+    def action_jump_top(self) -> None:
+        self._select(0)
+
+    def action_jump_bottom(self) -> None:
+        self._select(self._get_list_length() - 1)
 
     def action_toggle_plugin_or_mark(self) -> None:
-        if self.app_state.current_tab == "Home":
-            toggle_plugin(self.app_state)
-        elif self.app_state.current_tab == "Install":
-            installable_plugins = getattr(self.app_state, "install_data", [])
-            if installable_plugins and 0 <= self.app_state.install_selected < len(
-                installable_plugins
-            ):
-                plugin = installable_plugins[self.app_state.install_selected]
-                plugin["marked"] = not plugin.get("marked", False)
-        elif self.app_state.current_tab == "Update":
-            updates_with_updates = UpdateTab()._get_updates_with_updates(self.app_state)
-            if updates_with_updates and 0 <= self.app_state.update_selected < len(
-                updates_with_updates
-            ):
-                plugin = updates_with_updates[self.app_state.update_selected]
-                plugin["marked"] = not plugin.get("marked", False)
-        elif self.app_state.current_tab == "Remove":
-            if 0 <= self.app_state.remove_selected < len(self.app_state.remove_data):
-                plugin_name = self.app_state.remove_data[
-                    self.app_state.remove_selected
-                ]["name"]
-                if plugin_name in self.app_state.marked_for_removal:
-                    self.app_state.marked_for_removal.remove(plugin_name)
+        tab = self.app_state.current_tab
+        visible_list = self._get_visible_list()
+        selected = self.app_state.get_selection(tab)
+        if tab == "Home":
+            toggle_plugin(self.app_state, visible_list)
+        elif 0 <= selected < len(visible_list):
+            plugin = visible_list[selected]
+            if tab == "Remove":
+                if plugin["name"] in self.app_state.marked_for_removal:
+                    self.app_state.marked_for_removal.remove(plugin["name"])
                 else:
-                    self.app_state.marked_for_removal.add(plugin_name)
+                    self.app_state.marked_for_removal.add(plugin["name"])
+            else:
+                plugin["marked"] = not plugin.get("marked", False)
+                if tab == "Install":
+                    self.app_state.touch("Install")
         self.rich_display.refresh()
 
+    def action_toggle_debug(self) -> None:
+        self.app_state.show_debug = not self.app_state.show_debug
+        if self.app_state.show_debug:
+            # Spans keep arriving from worker threads while the panel is open
+            self._debug_timer = self.set_interval(0.5, self.rich_display.refresh)
+        elif self._debug_timer is not None:
+            self._debug_timer.stop()
+            self._debug_timer = None
+        self.rich_display.refresh()
+
+    def action_enter_search_mode(self) -> None:
+        self.app_state.mode = "search"
+        self.rich_display.refresh()
+
+    def action_exit_search_mode(self) -> None:
+        if self.app_state.mode == "search" or self._get_search_query():
+            self.app_state.mode = "normal"
+            self._set_search_query("")
+
+    def _get_search_query(self) -> str:
+        return self.app_state.search_queries[self.app_state.current_tab]
+
+    def _set_search_query(self, query: str) -> None:
+        tab = self.app_state.current_tab
+        self.app_state.search_queries[tab] = query
+        self.app_state.set_selection(tab, 0, 1)
+        self.rich_display.refresh()
+
+    def on_key(self, event: events.Key) -> None:
+        if self.app_state.mode != "search" or event.key == "escape":
+            return
+        if event.key in ("up", "down", "pageup", "pagedown"):
+            return
+        event.prevent_default()
+        event.stop()
+        if event.key == "enter":
+            self.app_state.mode = "normal"
+            self.rich_display.refresh()
+        elif event.key == "backspace":
+            self._set_search_query(self._get_search_query()[:-1])
+        elif event.is_printable and event.character:
+            self._set_search_query(self._get_search_query() + event.character)
+
     def action_check_updates(self) -> None:
         if self.app_state.current_tab == "Update":
             if not self.app_state.checking_updates:
@@ -213,10 +249,13 @@ class PluginManagerApp(App):
                     for p in self.app_state.install_data
                     if p["name"] not in installed_plugins
                 ]
+                self.app_state.touch("Install")
+                self.app_state.touch("Home")
                 if self.app_state.install_selected >= len(self.app_state.install_data):
                     self.app_state.install_selected = max(
                         0, len(self.app_state.install_data) - 1
                     )
+            self.app_state.progress_bus.flush()
             self.call_from_thread(self.rich_display.refresh)
             console.log("[blue]Background installation worker completed[/blue]")
         except Exception as e:
@@ -257,21 +296,28 @@ class PluginManagerApp(App):
         self.rich_display.refresh()
 
     @work(exclusive=True, thread=True)
-    def update_plugins_in_background(self, plugins_to_update: List[dict]) -> None:
+    def update_plugins_in_background(
+        self, plugins_to_update: List[dict], first: Optional[str] = None
+    ) -> None:
         try:
-            for plugin in plugins_to_update:
+            # Marked plugins and the one under the cursor are queued first
+            jobs = self.plugin_updater.update_plugins(
+                plugins_to_update,
+                self.app_state.update_progress_callback,
+                first=first,
+            )
+            for plugin, job in zip(plugins_to_update, jobs):
+                job.join()
                 plugin_name = plugin["name"]
-                console.log(f"Starting update for {plugin_name}")
-                success = self.plugin_updater.update_plugin(
-                    plugin, progress_callback=self.app_state.update_progress_callback
-                )
-                if success:
+                if job.result:
                     console.log(f"Successfully updated {plugin_name}")
                     plugin["_internal"]["update_available"] = False
                     plugin["current_version"] = plugin["new_version"]
+                    self.app_state.touch("Update")
                 else:
                     console.log(f"Failed to update {plugin_name}")
                     self.app_state.update_progress_callback(plugin_name, 0)
+            self.app_state.progress_bus.flush()
             self.call_from_thread(self.rich_display.refresh)
         except Exception as e:
             console.log(f"Error in background update: {e}")
@@ -279,6 +325,11 @@ class PluginManagerApp(App):
                 lambda: self.notify(f"Update failed: {str(e)}", severity="error")
             )
 
+    def _selected_update_name(self) -> Optional[str]:
+        visible = self.rich_display.update_tab.get_visible_list(self.app_state)
+        selected = self.app_state.update_selected
+        return visible[selected]["name"] if selected < len(visible) else None
+
     def action_update_marked(self) -> None:
         if self.app_state.current_tab == "Update":
             marked_plugins = [
@@ -291,7 +342,9 @@ class PluginManagerApp(App):
                 for plugin in marked_plugins:
                     plugin["progress"] = 0
                     self.app_state.update_progress[plugin["name"]] = 0
-                self.update_plugins_in_background(marked_plugins)
+                self.update_plugins_in_background(
+                    marked_plugins, self._selected_update_name()
+                )
                 self.notify(f"Updating {len(marked_plugins)} marked plugin(s)...")
             else:
                 self.notify("No plugins marked for update.")
@@ -299,29 +352,22 @@ class PluginManagerApp(App):
 
     def action_update_all(self) -> None:
         if self.app_state.current_tab == "Update":
-            updates_with_updates = UpdateTab()._get_updates_with_updates(self.app_state)
+            updates_with_updates = (
+                self.rich_display.update_tab._get_updates_with_updates(self.app_state)
+            )
             if updates_with_updates:
                 for plugin in updates_with_updates:
                     plugin["progress"] = 0
                     self.app_state.update_progress[plugin["name"]] = 0
                     plugin["marked"] = True
-                self.update_plugins_in_background(updates_with_updates)
+                self.update_plugins_in_background(
+                    updates_with_updates, self._selected_update_name()
+                )
                 self.notify(f"Updating all {len(updates_with_updates)} plugin(s)...")
             else:
                 self.notify("No updates available.")
             self.rich_display.refresh()
 
-    def _update_scroll_offset(self, display_list: List[Any]) -> None:
-        if (
-            self.app_state.current_selection
-            >= self.app_state.scroll_offset + VISIBLE_ROWS
-        ):
-            self.app_state.scroll_offset = (
-                self.app_state.current_selection - VISIBLE_ROWS + 1
-            )
-        elif self.app_state.current_selection < self.app_state.scroll_offset:
-            self.app_state.scroll_offset = self.app_state.current_selection
-
     @work(exclusive=True, thread=True)
     def remove_plugins_in_background(self, plugins_to_remove: List[str]) -> None:
         try:
@@ -365,6 +411,7 @@ class PluginManagerApp(App):
                     self.app_state.remove_selected = len(self.app_state.remove_data) - 1
                 elif len(self.app_state.remove_data) == 0:
                     self.app_state.remove_selected = 0
+            self.app_state.progress_bus.flush()
             self.call_from_thread(self.rich_display.refresh)
             console.log("[blue]Background removal worker completed[/blue]")
         except Exception as e:
@@ -10,6 +10,9 @@ COFFEE_INSTALLED_PLUGINS_DIR = os.path.join(COFFEE_DIR, "plugins")
 LOCK_FILE_PATH = os.path.join(COFFEE_DIR, "caffeine-lock.json")
 
 VISIBLE_ROWS = 10
+PROGRESS_REFRESH_RATE = 10
+# Spans the TUI keeps for its debug panel
+DEBUG_SPANS = 200
 TABS = ["Home", "Install", "Update", "Remove"]
 
 ACCENT_COLOR = "#7aa2f7"
@@ -0,0 +1,113 @@
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+_UNSET = object()
+FUZZY_PENALTY = 1000
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _subsequence_score(query: str, text: str) -> Optional[int]:
+    """
+    Score a subsequence match of ``query`` in ``text`` by the span it covers.
+
+    Returns None when the characters of ``query`` don't appear in order.
+    """
+    start = -1
+    index = -1
+    for char in query:
+        index = text.find(char, index + 1)
+        if index == -1:
+            return None
+        if start == -1:
+            start = index
+    return index - start
+
+
+class SearchIndex:
+    """
+    Trigram and character index for incremental fuzzy search.
+
+    Candidates are narrowed with posting-set intersections before any string
+    matching happens, and a query that extends the previous one only rescans
+    the previous matches.
+    """
+
+    def __init__(self) -> None:
+        self.key: object = _UNSET
+        self._texts: List[str] = []
+        self._chars: Dict[str, Set[int]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._last_query: str = ""
+        self._last_matches: Optional[Set[int]] = None
+        self._last_result: List[int] = []
+
+    def build(self, key: Hashable, texts: List[str]) -> None:
+        self.key = key
+        self._texts = [text.lower() for text in texts]
+        self._chars = {}
+        self._trigrams = {}
+        for i, text in enumerate(self._texts):
+            for char in set(text):
+                self._chars.setdefault(char, set()).add(i)
+            for trigram in _trigrams(text):
+                self._trigrams.setdefault(trigram, set()).add(i)
+        self._last_query = ""
+        self._last_matches = None
+        self._last_result = list(range(len(self._texts)))
+
+    def search(self, query: str) -> List[int]:
+        """Return indices of matching texts, best matches first."""
+        query = query.lower().strip()
+        if not query:
+            return list(range(len(self._texts)))
+        if query == self._last_query and self._last_matches is not None:
+            return self._last_result
+
+        candidates = self._candidates(query)
+        if len(query) >= 3:
+            substring_hits = candidates & self._trigram_candidates(query)
+        else:
+            substring_hits = candidates
+
+        # Substring matches rank first (by position), then fuzzy matches by span
+        scored: List[Tuple[int, int, int]] = []
+        for i in candidates:
+            text = self._texts[i]
+            position = text.find(query) if i in substring_hits else -1
+            if position != -1:
+                scored.append((position, len(text), i))
+                continue
+            span = _subsequence_score(query, text)
+            if span is not None:
+                scored.append((FUZZY_PENALTY + span, len(text), i))
+        scored.sort()
+
+        self._last_query = query
+        self._last_matches = {i for _, _, i in scored}
+        self._last_result = [i for _, _, i in scored]
+        return self._last_result
+
+    def _candidates(self, query: str) -> Set[int]:
+        # Every match must contain every character of the query
+        postings = sorted(
+            (self._chars.get(char, set()) for char in set(query)), key=len
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+
+        if self._last_matches is not None and query.startswith(self._last_query):
+            candidates &= self._last_matches
+        return candidates
+
+    def _trigram_candidates(self, query: str) -> Set[int]:
+        # Only texts containing every trigram of the query can contain it
+        postings = sorted(
+            (self._trigrams.get(g, set()) for g in _trigrams(query)), key=len
+        )
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+        return result
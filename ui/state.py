@@ -1,8 +1,23 @@
 import threading
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from rich.console import Console
 
+from core import ProgressBus
+
+from .constants import PROGRESS_REFRESH_RATE, TABS
+from .widgets.virtual_list import clamp_scroll_offset
+
+# Tab name -> (selected index attribute, scroll offset attribute)
+LIST_STATE_ATTRS: Dict[str, Tuple[str, str]] = {
+    "Home": ("current_selection", "scroll_offset"),
+    "Install": ("install_selected", "install_scroll_offset"),
+    "Update": ("update_selected", "update_scroll_offset"),
+    "Remove": ("remove_selected", "remove_scroll_offset"),
+}
+# Progress is coalesced per ("update" | "install" | "remove", plugin name)
+ProgressKey = Tuple[str, str]
+
 console = Console()
 
 
@@ -12,31 +27,65 @@ class AppState:
         self.current_selection: int = 0
         self.current_tab: str = "Home"
         self.mode: str = "normal"
+        self.show_debug: bool = False
+        self.search_queries: Dict[str, str] = {tab: "" for tab in TABS}
         self.update_selected: int = 0
         self.update_data: List[Dict[str, Any]] = []
         self.update_progress: Dict[str, int] = {}
         self.checking_updates: bool = False
+        self.loading_changelogs: Set[str] = set()
         self.remove_selected: int = 0
         self.marked_for_removal: Set[str] = set()
         self.removing_progress: Dict[str, int] = {}
         self.remove_data: List[Dict[str, Any]] = []
         self._app_ref: Optional[Any] = None
         self.install_selected: int = 0
+        self.install_scroll_offset: int = 0
+        self.update_scroll_offset: int = 0
+        self.remove_scroll_offset: int = 0
         self.install_data: List[Dict[str, Any]] = []
         self.installing_progress: Dict[str, int] = {}
         self.plugin_remover = plugin_remover
         self.plugin_updater = plugin_updater
+        self.versions: Dict[str, int] = {tab: 0 for tab in TABS}
+        self.progress_bus: ProgressBus[ProgressKey] = ProgressBus(
+            self._on_progress_flush, max_rate=PROGRESS_REFRESH_RATE
+        )
+
+    def touch(self, tab: str) -> None:
+        """Mark the derived view of a tab as stale."""
+        self.versions[tab] += 1
+
+    def get_selection(self, tab: str) -> int:
+        return getattr(self, LIST_STATE_ATTRS[tab][0])
+
+    def get_scroll_offset(self, tab: str) -> int:
+        return getattr(self, LIST_STATE_ATTRS[tab][1])
+
+    def set_selection(self, tab: str, selected: int, count: int) -> None:
+        """Select an index in a tab's list and scroll it into view."""
+        selected = max(0, min(selected, count - 1))
+        selection_attr, offset_attr = LIST_STATE_ATTRS[tab]
+        setattr(self, selection_attr, selected)
+        setattr(
+            self,
+            offset_attr,
+            clamp_scroll_offset(selected, getattr(self, offset_attr), count),
+        )
 
     def refresh_updates(self) -> None:
         if not self.checking_updates:
             self.checking_updates = True
             self.update_data = []
             self.update_progress = {}
+            self.loading_changelogs = set()
+            self.touch("Update")
             thread = threading.Thread(target=self._check_updates_async, daemon=True)
             thread.start()
 
     def refresh_remove_data(self) -> None:
         self.remove_data = self.plugin_remover.get_installed_plugins()
+        self.touch("Remove")
 
     def remove_uninstalled_plugins_from_updates(
         self, uninstalled_plugin_names: List[str]
@@ -49,6 +98,8 @@ class AppState:
         ]
         for name in uninstalled_plugin_names:
             self.update_progress.pop(name, None)
+        self.touch("Update")
+        self.touch("Home")
         if self.update_selected >= len(self.update_data):
             self.update_selected = max(0, len(self.update_data) - 1)
 
@@ -61,31 +112,82 @@ class AppState:
             console.log(f"[ERROR] Error checking updates: {e}")
         finally:
             self.checking_updates = False
+            self.touch("Update")
             if self._app_ref:
                 self._app_ref.call_from_thread(self._app_ref.rich_display.refresh)
 
-    def update_progress_callback(self, plugin_name: str, progress: int) -> None:
-        self.update_progress[plugin_name] = progress
-        for plugin in self.update_data:
-            if plugin["name"] == plugin_name:
-                plugin["progress"] = progress
-                break
+    def load_changelog(self, plugin: Dict[str, Any]) -> None:
+        """Fetch a plugin's changelog in the background, once per check."""
+        if plugin["name"] in self.loading_changelogs:
+            return
+        self.loading_changelogs.add(plugin["name"])
+        thread = threading.Thread(
+            target=self._load_changelog_async, args=(plugin,), daemon=True
+        )
+        thread.start()
+
+    def _load_changelog_async(self, plugin: Dict[str, Any]) -> None:
+        try:
+            changelog = self.plugin_updater.get_changelog(plugin)
+        except Exception as e:
+            changelog = None
+            console.log(f"[ERROR] Error loading changelog: {e}")
+        if changelog is not None:
+            entries = changelog.entries + (["…"] if changelog.truncated else [])
+            plugin["released"] = changelog.released
+        else:
+            entries = [
+                f"Update available: {plugin['current_version']} → "
+                f"{plugin['new_version']}"
+            ]
+            plugin["released"] = "Unknown"
+        plugin["changelog"] = entries
+        self.loading_changelogs.discard(plugin["name"])
+        self.touch("Update")
         if self._app_ref:
             self._app_ref.call_from_thread(self._app_ref.rich_display.refresh)
 
+    def update_progress_callback(self, plugin_name: str, progress: int) -> None:
+        self.progress_bus.publish(("update", plugin_name), progress)
+
     def remove_progress_callback(self, plugin_name: str, progress: int) -> None:
-        self.removing_progress[plugin_name] = progress
-        if self._app_ref:
-            self._app_ref.call_from_thread(self._app_ref.rich_display.refresh)
+        self.progress_bus.publish(("remove", plugin_name), progress)
 
     def install_progress_callback(self, plugin_name: str, progress: int) -> None:
-        self.installing_progress[plugin_name] = progress
-        for plugin in self.install_data:
-            if plugin["name"] == plugin_name:
-                plugin["progress"] = progress
-                break
+        self.progress_bus.publish(("install", plugin_name), progress)
+
+    def _on_progress_flush(self, updates: Dict[ProgressKey, int]) -> None:
+        if self._app_ref is None:
+            self._apply_progress(updates)
+        elif threading.current_thread() is threading.main_thread():
+            self._apply_progress(updates)
+            self._app_ref.rich_display.refresh()
+        else:
+            self._app_ref.call_from_thread(self._apply_progress_and_refresh, updates)
+
+    def _apply_progress_and_refresh(self, updates: Dict[ProgressKey, int]) -> None:
+        self._apply_progress(updates)
         if self._app_ref:
-            self._app_ref.call_from_thread(self._app_ref.rich_display.refresh)
+            self._app_ref.rich_display.refresh()
+
+    def _apply_progress(self, updates: Dict[ProgressKey, int]) -> None:
+        progress_maps: Dict[str, Dict[str, int]] = {
+            "update": self.update_progress,
+            "install": self.installing_progress,
+            "remove": self.removing_progress,
+        }
+        indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for key, progress in updates.items():
+            kind, plugin_name = key
+            progress_maps[kind][plugin_name] = progress
+            if kind == "remove":
+                continue
+            if kind not in indexes:
+                data = self.update_data if kind == "update" else self.install_data
+                indexes[kind] = {p["name"]: p for p in data}
+            plugin = indexes[kind].get(plugin_name)
+            if plugin is not None:
+                plugin["progress"] = progress
 
     def bind_app(self, app: Any) -> None:
         self._app_ref = app
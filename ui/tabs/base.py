@@ -1,12 +1,17 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
 from rich.layout import Layout
 from rich.panel import Panel
 
 from ..constants import BACKGROUND_STYLE, TABS
+from ..search_index import SearchIndex
 
 
 class Tab:
     def __init__(self, name: str) -> None:
         self.name = name
+        self.search_index = SearchIndex()
+        self._search_result: Tuple[Any, List[Any]] = (None, [])
 
     def create_tab_bar(self, active_tab: str = "Home") -> Panel:
         tabs = ""
@@ -31,3 +36,29 @@ class Tab:
             Layout(name="body", ratio=2),
         )
         return layout
+
+    def get_search_text(self, item: Dict[str, Any]) -> str:
+        return str(item.get("name", ""))
+
+    def apply_search(
+        self, app_state: Any, items: List[Any], key: Hashable
+    ) -> List[Any]:
+        """Filter ``items`` by the tab's search query, best matches first."""
+        query = app_state.search_queries.get(self.name, "")
+        if not query:
+            return items
+        if self.search_index.key != key:
+            self.search_index.build(key, [self.get_search_text(i) for i in items])
+        result_key = (key, query)
+        if self._search_result[0] != result_key:
+            matches = [items[i] for i in self.search_index.search(query)]
+            self._search_result = (result_key, matches)
+        return self._search_result[1]
+
+    def search_subtitle(self, app_state: Any) -> Optional[str]:
+        query = app_state.search_queries.get(self.name, "")
+        if app_state.mode == "search" and app_state.current_tab == self.name:
+            return f"[bold white]/{query}█[/]"
+        if query:
+            return f"[dim white]/{query} (esc to clear)[/]"
+        return None
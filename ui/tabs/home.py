@@ -14,68 +14,100 @@ from ..constants import (
     HIGHLIGHT_COLOR,
     SECTION_COLOR,
     SELECTION_COLOR,
-    VISIBLE_ROWS,
 )
+from ..view_model import ViewModel
+from ..widgets.virtual_list import VirtualList, clamp_scroll_offset
 from .base import Tab
 
 
 class HomeTab(Tab):
     def __init__(self) -> None:
         super().__init__("Home")
+        self.view = ViewModel()
+        self.list = VirtualList()
 
-    def get_display_list(self) -> List[Dict[str, Any]]:
-        lock_file = lfm.read_lock_file()
-        plugins = lock_file.get("plugins", [])
-        active = sorted(
-            [p for p in plugins if p.get("enabled")], key=lambda x: x["name"].lower()
+    def get_display_list(self, app_state: Any) -> List[Dict[str, Any]]:
+        plugins = self.view.get_items(
+            (app_state.versions["Home"], lfm.get_lock_file_signature()),
+            lambda: lfm.read_lock_file().get("plugins", []),
         )
-        inactive = sorted(
-            [p for p in plugins if not p.get("enabled")],
-            key=lambda x: x["name"].lower(),
+        query = app_state.search_queries.get(self.name, "")
+        matches = self.apply_search(app_state, plugins, self.view.items_key)
+        return self.view.memo(
+            "display_list",
+            (self.view.items_key, query),
+            lambda: self._build_display_list(matches, sort=not query),
         )
+
+    def get_search_text(self, item: Dict[str, Any]) -> str:
+        git_info = item.get("git", {})
+        return (
+            f"{item['name']} {git_info.get('repo') or ''} {git_info.get('tag') or ''}"
+        )
+
+    def _build_display_list(
+        self, plugins: List[Dict[str, Any]], sort: bool = True
+    ) -> List[Dict[str, Any]]:
+        active = [p for p in plugins if p.get("enabled")]
+        inactive = [p for p in plugins if not p.get("enabled")]
+        if sort:
+            active.sort(key=lambda x: x["name"].lower())
+            inactive.sort(key=lambda x: x["name"].lower())
         display_list: List[Dict[str, Any]] = []
         if active:
-            display_list.append({"type": "header", "text": "Active Plugins"})
+            display_list.append(
+                {"type": "header", "text": "Active Plugins", "count": len(active)}
+            )
             display_list.extend([{"type": "plugin", "data": p} for p in active])
         if inactive:
-            display_list.append({"type": "header", "text": "Inactive Plugins"})
+            display_list.append(
+                {"type": "header", "text": "Inactive Plugins", "count": len(inactive)}
+            )
             display_list.extend([{"type": "plugin", "data": p} for p in inactive])
         return display_list
 
+    def _build_plugin_row(self, plugin: Dict[str, Any], is_selected: bool) -> Text:
+        circle_style = (
+            SECTION_COLOR
+            if is_selected
+            else (HIGHLIGHT_COLOR if plugin.get("enabled") else "grey50")
+        )
+        plugin_name_style = (
+            f"bold {SELECTION_COLOR}"
+            if is_selected
+            else ("white" if plugin.get("enabled") else "dim white")
+        )
+        return Text.assemble(
+            Text(" ● ", style=circle_style),
+            Text(plugin["name"], style=plugin_name_style),
+        )
+
+    def _build_row(self, app_state: Any, index: int, item: Dict[str, Any]) -> Text:
+        if item["type"] == "header":
+            return self.view.get_row(
+                ("header", item["text"]),
+                lambda: Text(item["text"], style=f"bold {SECTION_COLOR}"),
+            )
+        plugin = item["data"]
+        is_selected = index == app_state.current_selection
+        return self.view.get_row(
+            ("plugin", plugin["name"], is_selected),
+            lambda: self._build_plugin_row(plugin, is_selected),
+        )
+
     def display_installed_plugins(self, app_state: Any) -> Table:
-        display_list = self.get_display_list()
-        visible_items = display_list[
-            app_state.scroll_offset : app_state.scroll_offset + VISIBLE_ROWS
-        ]
-        table = Table.grid(expand=True, padding=(0, 1))
-        table.add_column("Plugin", ratio=1)
-        for i, item in enumerate(visible_items):
-            index = app_state.scroll_offset + i
-            is_selected = index == app_state.current_selection
-            if item["type"] == "header":
-                table.add_row(Text(item["text"], style=f"bold {SECTION_COLOR}"))
-            else:
-                plugin = item["data"]
-                circle_style = (
-                    SECTION_COLOR
-                    if is_selected
-                    else (HIGHLIGHT_COLOR if plugin.get("enabled") else "grey50")
-                )
-                plugin_name_style = (
-                    f"bold {SELECTION_COLOR}"
-                    if is_selected
-                    else ("white" if plugin.get("enabled") else "dim white")
-                )
-                table.add_row(
-                    Text.assemble(
-                        Text(" ● ", style=circle_style),
-                        Text(plugin["name"], style=plugin_name_style),
-                    )
-                )
-        return table
+        display_list = self.get_display_list(app_state)
+        app_state.scroll_offset = clamp_scroll_offset(
+            app_state.current_selection, app_state.scroll_offset, len(display_list)
+        )
+        return self.list.build_table(
+            display_list,
+            app_state.scroll_offset,
+            lambda index, item: self._build_row(app_state, index, item),
+        )
 
     def display_plugin_details(self, app_state: Any) -> Panel:
-        display_list = self.get_display_list()
+        display_list = self.get_display_list(app_state)
         if not display_list or app_state.current_selection >= len(display_list):
             return Panel(
                 Text("No plugin selected"),
@@ -87,13 +119,7 @@ class HomeTab(Tab):
         selected_item = display_list[app_state.current_selection]
         if selected_item["type"] == "header":
             header_text = selected_item["text"]
-            lock_file = lfm.read_lock_file()
-            plugins = lock_file.get("plugins", [])
-            count = (
-                len([p for p in plugins if p.get("enabled")])
-                if header_text == "Active Plugins"
-                else len([p for p in plugins if not p.get("enabled")])
-            )
+            count = selected_item["count"]
             info = Text()
             info.append(f"{header_text}\n", style="bold #e0af68")
             info.append("Total: ", style="#5F9EA0")
@@ -103,6 +129,8 @@ class HomeTab(Tab):
             info.append("- Move up / down\n")
             info.append(" SPACE    ", style="bold white")
             info.append("- Toggle\n")
+            info.append(" /        ", style="bold white")
+            info.append("- Search\n")
             info.append(" q        ", style="bold white")
             info.append("- Quit\n")
             return Panel(
@@ -138,10 +166,13 @@ class HomeTab(Tab):
                 style=BACKGROUND_STYLE,
             )
 
-    def create_home_panel(self, app_state: Any) -> Layout:
+    def build_panel(self, app_state: Any) -> Layout:
+        display_list = self.get_display_list(app_state)
         plugin_list_panel = Panel(
             self.display_installed_plugins(app_state),
-            title="Plugin List",
+            title="Plugin List"
+            + self.list.position_label(len(display_list), app_state.scroll_offset),
+            subtitle=self.search_subtitle(app_state),
             border_style=ACCENT_COLOR,
             box=ROUNDED,
             style=BACKGROUND_STYLE,
@@ -17,12 +17,16 @@ from ..constants import (
     SECTION_COLOR,
     SELECTION_COLOR,
 )
+from ..view_model import ViewModel
+from ..widgets.virtual_list import VirtualList, clamp_scroll_offset
 from .base import Tab
 
 
 class InstallTab(Tab):
     def __init__(self) -> None:
         super().__init__("Install")
+        self.view = ViewModel()
+        self.list = VirtualList()
 
     def _get_installable_plugins(self, app_state: Any) -> List[Dict[str, Any]]:
         plugin_loader = PluginLoader(COFFEE_PLUGINS_LIST_DIR)
@@ -46,55 +50,85 @@ class InstallTab(Tab):
                 installable.append(plugin_data)
         return installable
 
-    def build_install_list_panel(self, app_state: Any) -> Panel:
-        table = Table.grid(expand=True, padding=(0, 1))
-        table.add_column("Plugin", ratio=1)
+    def _build_install_row(self, plugin: Dict[str, Any], is_selected: bool) -> Text:
+        marked = plugin.get("marked", False)
+        mark_text = Text(
+            "[✓] " if marked else "[ ] ",
+            style=f"bold {SELECTION_COLOR}" if marked else "dim white",
+        )
+        tag_text = f" ({plugin['tag']})" if plugin["tag"] != "latest" else ""
+        name_text = Text(
+            f"{plugin['name']}{tag_text}",
+            style=f"bold {SELECTION_COLOR}" if is_selected else "white",
+        )
+        progress = plugin.get("progress", 0)
+        progress_text_obj = Text()
+        if 0 < progress < 100:
+            bar_len = 15
+            filled_len = int(progress / 100 * bar_len)
+            bar = "█" * filled_len + "░" * (bar_len - filled_len)
+            progress_text_obj = Text(f" {bar} {progress}%", style="yellow")
+        elif progress == 100:
+            progress_text_obj = Text(" ✔ Installed", style="green")
+        return Text.assemble(mark_text, name_text, progress_text_obj)
 
+    def get_visible_list(self, app_state: Any) -> List[Dict[str, Any]]:
+        install_data = getattr(app_state, "install_data", [])
+        items = self.view.get_items(
+            (app_state.versions["Install"], id(install_data)),
+            lambda: install_data,
+        )
+        return self.apply_search(app_state, items, self.view.items_key)
+
+    def get_search_text(self, item: Dict[str, Any]) -> str:
+        return f"{item['name']} {item['url']} {item['tag']}"
+
+    def build_install_list_panel(self, app_state: Any) -> Panel:
         if not hasattr(app_state, "install_data") or not app_state.install_data:
-            installable_plugins = self._get_installable_plugins(app_state)
-            app_state.install_data = installable_plugins
-        else:
-            installable_plugins = app_state.install_data
+            app_state.install_data = self._get_installable_plugins(app_state)
+            app_state.touch("Install")
+
+        installable_plugins = self.get_visible_list(app_state)
+        offset = app_state.install_scroll_offset = clamp_scroll_offset(
+            app_state.install_selected,
+            app_state.install_scroll_offset,
+            len(installable_plugins),
+        )
 
         if not installable_plugins:
+            table = Table.grid(expand=True, padding=(0, 1))
+            table.add_column("Plugin", ratio=1)
             table.add_row(
                 Text("✓ All configured plugins are installed", style="bold #9ece6a")
             )
         else:
-            for i, plugin in enumerate(installable_plugins):
-                is_selected = i == app_state.install_selected
-                marked = plugin.get("marked", False)
-                mark_text = Text(
-                    "[✓] " if marked else "[ ] ",
-                    style=f"bold {SELECTION_COLOR}" if marked else "dim white",
+
+            def build_row(index: int, plugin: Dict[str, Any]) -> Text:
+                is_selected = index == app_state.install_selected
+                row_key = (
+                    plugin["name"],
+                    is_selected,
+                    plugin.get("marked", False),
+                    plugin.get("progress", 0),
                 )
-                tag_text = f" ({plugin['tag']})" if plugin["tag"] != "latest" else ""
-                name_text = Text(
-                    f"{plugin['name']}{tag_text}",
-                    style=f"bold {SELECTION_COLOR}" if is_selected else "white",
+                return self.view.get_row(
+                    row_key, lambda: self._build_install_row(plugin, is_selected)
                 )
-                progress = plugin.get("progress", 0)
-                progress_text_obj = Text()
-                if 0 < progress < 100:
-                    bar_len = 15
-                    filled_len = int(progress / 100 * bar_len)
-                    bar = "█" * filled_len + "░" * (bar_len - filled_len)
-                    progress_text_obj = Text(f" {bar} {progress}%", style="yellow")
-                elif progress == 100:
-                    progress_text_obj = Text(" ✔ Installed", style="green")
-                row_text_obj = Text.assemble(mark_text, name_text, progress_text_obj)
-                table.add_row(row_text_obj)
+
+            table = self.list.build_table(installable_plugins, offset, build_row)
         title = f"Available for Install ({len(installable_plugins)})"
+        title += self.list.position_label(len(installable_plugins), offset)
         return Panel(
             table,
             title=title,
+            subtitle=self.search_subtitle(app_state),
             border_style=ACCENT_COLOR,
             box=ROUNDED,
             style=BACKGROUND_STYLE,
         )
 
     def build_install_details_panel(self, app_state: Any) -> Panel:
-        installable_plugins = getattr(app_state, "install_data", [])
+        installable_plugins = self.get_visible_list(app_state)
         if not installable_plugins or app_state.install_selected >= len(
             installable_plugins
         ):
@@ -137,8 +171,13 @@ class InstallTab(Tab):
         controls.append("[Space] Mark/Unmark ", style="#5F9EA0")
         controls.append("[i] Install Marked ", style="#5F9EA0")
         controls.append("[ctrl+a] Install All ", style="#5F9EA0")
+        controls.append("[/] Search ", style="#5F9EA0")
         installable_plugins = getattr(app_state, "install_data", [])
-        marked_count = len([p for p in installable_plugins if p.get("marked", False)])
+        marked_count = self.view.memo(
+            "marked_count",
+            (app_state.versions["Install"], id(installable_plugins)),
+            lambda: len([p for p in installable_plugins if p.get("marked", False)]),
+        )
         if marked_count > 0:
             controls.append(f"({marked_count} marked)", style="yellow")
         return Panel(
@@ -1,4 +1,4 @@
-from typing import Any, List, Set
+from typing import Any, Dict, List, Set
 
 from rich.box import ROUNDED
 from rich.layout import Layout
@@ -13,66 +13,94 @@ from ..constants import (
     SECTION_COLOR,
     SELECTION_COLOR,
 )
+from ..view_model import ViewModel
+from ..widgets.virtual_list import VirtualList, clamp_scroll_offset
 from .base import Tab
 
 
 class RemoveTab(Tab):
     def __init__(self) -> None:
         super().__init__("Remove")
+        self.view = ViewModel()
+        self.list = VirtualList()
+
+    def _build_remove_row(
+        self, plugin: Dict[str, Any], is_selected: bool, marked: bool, progress: int
+    ) -> Text:
+        mark_text = Text(
+            "[✓] " if marked else "[ ] ",
+            style=f"bold {SELECTION_COLOR}" if marked else "dim white",
+        )
+        version_text = f" ({plugin['version']})" if plugin["version"] != "N/A" else ""
+        name_text = Text(
+            f"{plugin['name']}{version_text}",
+            style=f"bold {SELECTION_COLOR}" if is_selected else "white",
+        )
+        progress_text_obj = Text()
+        if 0 < progress < 100:
+            bar_len = 15
+            filled_len = int(progress / 100 * bar_len)
+            bar = "█" * filled_len + "░" * (bar_len - filled_len)
+            progress_text_obj = Text(f" {bar} {progress}%", style="yellow")
+        elif progress == 100:
+            progress_text_obj = Text(" ✔ Removed", style="green")
+        return Text.assemble(mark_text, name_text, progress_text_obj)
+
+    def get_visible_list(self, app_state: Any) -> List[Dict[str, Any]]:
+        items = self.view.get_items(
+            (app_state.versions["Remove"], id(app_state.remove_data)),
+            lambda: app_state.remove_data,
+        )
+        return self.apply_search(app_state, items, self.view.items_key)
+
+    def get_search_text(self, item: Dict[str, Any]) -> str:
+        return f"{item['name']} {item.get('repo', '')} {item.get('version', '')}"
 
     def build_remove_list_panel(self, app_state: Any) -> Panel:
-        table = Table.grid(expand=True, padding=(0, 1))
-        table.add_column("Plugin", ratio=1)
+        remove_data = self.get_visible_list(app_state)
+        offset = app_state.remove_scroll_offset = clamp_scroll_offset(
+            app_state.remove_selected, app_state.remove_scroll_offset, len(remove_data)
+        )
 
-        if not app_state.remove_data:
+        if not remove_data:
+            table = Table.grid(expand=True, padding=(0, 1))
+            table.add_column("Plugin", ratio=1)
             table.add_row(Text("No plugins installed", style="bold #9ece6a"))
         else:
-            for i, plugin in enumerate(app_state.remove_data):
-                is_selected = i == app_state.remove_selected
-                marked = plugin["name"] in getattr(
-                    app_state, "marked_for_removal", set()
-                )
-                mark_text = Text(
-                    "[✓] " if marked else "[ ] ",
-                    style=f"bold {SELECTION_COLOR}" if marked else "dim white",
-                )
-                version_text = (
-                    f" ({plugin['version']})" if plugin["version"] != "N/A" else ""
-                )
-                name_text = Text(
-                    f"{plugin['name']}{version_text}",
-                    style=f"bold {SELECTION_COLOR}" if is_selected else "white",
-                )
+            marked_for_removal = app_state.marked_for_removal
+
+            def build_row(index: int, plugin: Dict[str, Any]) -> Text:
+                is_selected = index == app_state.remove_selected
+                marked = plugin["name"] in marked_for_removal
                 progress = app_state.removing_progress.get(plugin["name"], 0)
-                progress_text_obj = Text()
-                if 0 < progress < 100:
-                    bar_len = 15
-                    filled_len = int(progress / 100 * bar_len)
-                    bar = "█" * filled_len + "░" * (bar_len - filled_len)
-                    progress_text_obj = Text(f" {bar} {progress}%", style="yellow")
-                elif progress == 100:
-                    progress_text_obj = Text(" ✔ Removed", style="green")
-                row_text_obj = Text.assemble(mark_text, name_text, progress_text_obj)
-                table.add_row(row_text_obj)
+                return self.view.get_row(
+                    (plugin["name"], is_selected, marked, progress),
+                    lambda: self._build_remove_row(
+                        plugin, is_selected, marked, progress
+                    ),
+                )
+
+            table = self.list.build_table(remove_data, offset, build_row)
 
-        title = f"Installed Plugins ({len(app_state.remove_data) if app_state.remove_data else 0})"
+        title = f"Installed Plugins ({len(remove_data)})"
+        title += self.list.position_label(len(remove_data), offset)
         return Panel(
             table,
             title=title,
+            subtitle=self.search_subtitle(app_state),
             border_style=ACCENT_COLOR,
             box=ROUNDED,
             style=BACKGROUND_STYLE,
         )
 
     def build_remove_details_panel(self, app_state: Any) -> Panel:
-        if not app_state.remove_data or app_state.remove_selected >= len(
-            app_state.remove_data
-        ):
+        remove_data = self.get_visible_list(app_state)
+        if not remove_data or app_state.remove_selected >= len(remove_data):
             details = Text(
                 "No plugin selected or no plugins installed.\n\nPress 'R' to refresh the plugin list."
             )
         else:
-            plugin = app_state.remove_data[app_state.remove_selected]
+            plugin = remove_data[app_state.remove_selected]
             details = Text()
             details.append(f"● {plugin['name']}\n\n", style=f"bold {SECTION_COLOR}")
             details.append(f"{'Version':<18}: {plugin['version']}\n", style="white")
@@ -112,6 +140,7 @@ class RemoveTab(Tab):
         controls = Text()
         controls.append("[Space] Mark/Unmark ", style="#5F9EA0")
         controls.append("[r] Remove Marked ", style="#5F9EA0")
+        controls.append("[/] Search ", style="#5F9EA0")
         marked_count = len(getattr(app_state, "marked_for_removal", set()))
         if marked_count > 0:
             controls.append(f"({marked_count} marked)", style="yellow")
@@ -13,63 +13,105 @@ from ..constants import (
     SECTION_COLOR,
     SELECTION_COLOR,
 )
+from ..view_model import ViewModel
+from ..widgets.virtual_list import VirtualList, clamp_scroll_offset
 from .base import Tab
 
 
 class UpdateTab(Tab):
     def __init__(self) -> None:
         super().__init__("Update")
+        self.view = ViewModel()
+        self.list = VirtualList()
 
     def _get_updates_with_updates(self, app_state: Any) -> List[Dict[str, Any]]:
-        return [
-            p
-            for p in app_state.update_data
-            if p.get("_internal", {}).get("update_available", False)
-        ]
+        update_data = app_state.update_data
+        return self.view.get_items(
+            (app_state.versions["Update"], id(update_data)),
+            lambda: [
+                p
+                for p in update_data
+                if p.get("_internal", {}).get("update_available", False)
+            ],
+        )
 
-    def build_update_list_panel(self, app_state: Any) -> Panel:
-        table = Table.grid(expand=True, padding=(0, 1))
-        table.add_column("Plugin", ratio=1)
+    def get_visible_list(self, app_state: Any) -> List[Dict[str, Any]]:
         updates_with_updates = self._get_updates_with_updates(app_state)
-        if app_state.checking_updates:
-            table.add_row(Text("🔄 Checking for updates...", style="bold yellow"))
-        elif not updates_with_updates:
-            table.add_row(Text("✓ All plugins are up to date", style="bold #9ece6a"))
+        return self.apply_search(app_state, updates_with_updates, self.view.items_key)
+
+    def get_search_text(self, item: Dict[str, Any]) -> str:
+        internal = item.get("_internal", {})
+        return (
+            f"{item['name']} {internal.get('repo_url') or ''} "
+            f"{item.get('current_version', '')} {item.get('new_version', '')}"
+        )
+
+    def _build_update_row(self, plugin: Dict[str, Any], is_selected: bool) -> Text:
+        marked = plugin.get("marked", False)
+        mark_text = Text(
+            "[✓] " if marked else "[ ] ",
+            style=f"bold {SELECTION_COLOR}" if marked else "dim white",
+        )
+        version_text = f" → {plugin['new_version']}"
+        name_text = Text(
+            f"{plugin['name']}{version_text}",
+            style=f"bold {SELECTION_COLOR}" if is_selected else "white",
+        )
+        progress = plugin.get("progress", 0)
+        progress_text_obj = Text()
+        if 0 < progress < 100:
+            bar_len = 15
+            filled_len = int(progress / 100 * bar_len)
+            bar = "█" * filled_len + "░" * (bar_len - filled_len)
+            progress_text_obj = Text(f" {bar} {progress}%", style="yellow")
+        elif progress == 100:
+            progress_text_obj = Text(" ✔ Done", style="green")
+        return Text.assemble(mark_text, name_text, progress_text_obj)
+
+    def build_update_list_panel(self, app_state: Any) -> Panel:
+        updates_with_updates = self.get_visible_list(app_state)
+        offset = app_state.update_scroll_offset = clamp_scroll_offset(
+            app_state.update_selected,
+            app_state.update_scroll_offset,
+            len(updates_with_updates),
+        )
+        if app_state.checking_updates or not updates_with_updates:
+            table = Table.grid(expand=True, padding=(0, 1))
+            table.add_column("Plugin", ratio=1)
+            if app_state.checking_updates:
+                table.add_row(Text("🔄 Checking for updates...", style="bold yellow"))
+            else:
+                table.add_row(
+                    Text("✓ All plugins are up to date", style="bold #9ece6a")
+                )
         else:
-            for i, plugin in enumerate(updates_with_updates):
-                is_selected = i == app_state.update_selected
-                marked = plugin.get("marked", False)
-                mark_text = Text(
-                    "[✓] " if marked else "[ ] ",
-                    style=f"bold {SELECTION_COLOR}" if marked else "dim white",
+
+            def build_row(index: int, plugin: Dict[str, Any]) -> Text:
+                is_selected = index == app_state.update_selected
+                row_key = (
+                    plugin["name"],
+                    is_selected,
+                    plugin.get("marked", False),
+                    plugin.get("progress", 0),
                 )
-                version_text = f" → {plugin['new_version']}"
-                name_text = Text(
-                    f"{plugin['name']}{version_text}",
-                    style=f"bold {SELECTION_COLOR}" if is_selected else "white",
+                return self.view.get_row(
+                    row_key, lambda: self._build_update_row(plugin, is_selected)
                 )
-                progress = plugin.get("progress", 0)
-                progress_text_obj = Text()
-                if 0 < progress < 100:
-                    bar_len = 15
-                    filled_len = int(progress / 100 * bar_len)
-                    bar = "█" * filled_len + "░" * (bar_len - filled_len)
-                    progress_text_obj = Text(f" {bar} {progress}%", style="yellow")
-                elif progress == 100:
-                    progress_text_obj = Text(" ✔ Done", style="green")
-                row_text_obj = Text.assemble(mark_text, name_text, progress_text_obj)
-                table.add_row(row_text_obj)
+
+            table = self.list.build_table(updates_with_updates, offset, build_row)
         title = f"Available Updates ({len(updates_with_updates)})"
+        title += self.list.position_label(len(updates_with_updates), offset)
         return Panel(
             table,
             title=title,
+            subtitle=self.search_subtitle(app_state),
             border_style=ACCENT_COLOR,
             box=ROUNDED,
             style=BACKGROUND_STYLE,
         )
 
     def build_update_details_panel(self, app_state: Any) -> Panel:
-        updates_with_updates = self._get_updates_with_updates(app_state)
+        updates_with_updates = self.get_visible_list(app_state)
         if app_state.checking_updates:
             details = Text("🔄 Checking for updates...", style="yellow")
         elif not updates_with_updates or app_state.update_selected >= len(
@@ -88,10 +130,18 @@ class UpdateTab(Tab):
                 style="white",
             )
             details.append(f"{'Size':<18}: {plugin['size']}\n", style="white")
-            details.append(f"{'Released':<18}: {plugin['released']}\n\n", style="white")
+            changelog = plugin.get("changelog")
+            if changelog is None:
+                # Only fetched once the plugin is selected
+                app_state.load_changelog(plugin)
+            details.append(
+                f"{'Released':<18}: {plugin.get('released') or '…'}\n\n", style="white"
+            )
             if internal_info.get("update_available", False):
                 details.append("What's New:\n", style="#5F9EA0")
-                for line in plugin["changelog"][:5]:
+                if changelog is None:
+                    details.append(" Loading changelog...\n", style="yellow")
+                for line in changelog or []:
                     details.append(f" • {line}\n", style="white")
             else:
                 details.append("Status: Up to date\n", style=HIGHLIGHT_COLOR)
@@ -116,7 +166,8 @@ class UpdateTab(Tab):
         controls.append("[c] Check Updates ", style="#5F9EA0")
         controls.append("[Space] Mark/Unmark ", style="#5F9EA0")
         controls.append(f"[u] Update Marked ", style="#5F9EA0")
-        controls.append(f"[Ctrl+u] Update All", style="#5F9EA0")
+        controls.append(f"[Ctrl+u] Update All ", style="#5F9EA0")
+        controls.append("[/] Search", style="#5F9EA0")
         return Panel(
             controls,
             title="Controls",
@@ -0,0 +1,52 @@
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from rich.text import Text
+
+_UNSET = object()
+
+
+class ViewModel:
+    """
+    Per-tab cache of derived rows.
+
+    The item list is rebuilt only when its key (a version counter, a lock file
+    signature, ...) changes. Rendered rows are cached by a key describing
+    everything that affects how the row looks, so moving the cursor rebuilds
+    only the previously and newly selected rows.
+    """
+
+    def __init__(self) -> None:
+        self._items_key: Any = _UNSET
+        self._items: List[Any] = []
+        self._rows: Dict[Hashable, Text] = {}
+        self._memo: Dict[str, Tuple[Hashable, Any]] = {}
+
+    def get_items(self, key: Hashable, build: Callable[[], List[Any]]) -> List[Any]:
+        if self._items_key is _UNSET or key != self._items_key:
+            self._items = build()
+            self._items_key = key
+            self._rows.clear()
+        return self._items
+
+    @property
+    def items_key(self) -> Any:
+        return self._items_key
+
+    def get_row(self, key: Hashable, build: Callable[[], Text]) -> Text:
+        row = self._rows.get(key)
+        if row is None:
+            row = build()
+            self._rows[key] = row
+        return row
+
+    def memo(self, name: str, key: Hashable, build: Callable[[], Any]) -> Any:
+        cached = self._memo.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, build())
+            self._memo[name] = cached
+        return cached[1]
+
+    def invalidate(self) -> None:
+        self._items_key = _UNSET
+        self._rows.clear()
+        self._memo.clear()
@@ -0,0 +1,58 @@
+import os
+from typing import List
+
+from rich.box import ROUNDED
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from core.tracing import SUBPROCESS, Span
+
+from ..constants import ACCENT_COLOR, BACKGROUND_STYLE, SECTION_COLOR
+
+
+def _format_bytes(size: object) -> str:
+    if not isinstance(size, int):
+        return ""
+    for unit in ("B", "K", "M"):
+        if size < 1024:
+            return f"{size}{unit}"
+        size //= 1024
+    return f"{size}G"
+
+
+def _short_path(path: str) -> str:
+    home = os.path.expanduser("~")
+    return "~" + path[len(home) :] if path.startswith(home) else path
+
+
+def build_debug_panel(spans: List[Span]) -> Panel:
+    """The newest subprocess and file I/O spans, newest first."""
+    table = Table(expand=True, box=None, padding=(0, 1))
+    table.add_column("Span", style=f"bold {SECTION_COLOR}", no_wrap=True, ratio=2)
+    table.add_column("ms", justify="right", no_wrap=True)
+    table.add_column("Exit", justify="right", no_wrap=True)
+    table.add_column("Bytes", justify="right", no_wrap=True)
+    table.add_column("Where", style="dim white", no_wrap=True, ratio=3)
+    for span in reversed(spans):
+        args = span.args
+        if args.get("exit_code") is not None:
+            status = str(args["exit_code"])
+        else:
+            status = "err" if "error" in args else ""
+        where = args.get("cwd") if span.category == SUBPROCESS else args.get("path")
+        table.add_row(
+            span.name,
+            f"{span.duration * 1000:.1f}",
+            Text(status, style="red" if status not in ("", "0") else "white"),
+            _format_bytes(args.get("bytes")),
+            _short_path(where) if where else "",
+        )
+    return Panel(
+        table,
+        title=f"Debug: last {len(spans)} spans",
+        subtitle="[D] Close",
+        border_style=ACCENT_COLOR,
+        box=ROUNDED,
+        style=BACKGROUND_STYLE,
+    )
@@ -1,30 +1,46 @@
-from typing import Any
+from typing import Any, Dict
 
 from rich.console import RenderableType
+from rich.layout import Layout
 from textual.widgets import Static
 
+from core import tracing
+
+from ..constants import DEBUG_SPANS
 from ..tabs.base import Tab
 from ..tabs.home import HomeTab
 from ..tabs.install import InstallTab
 from ..tabs.remove import RemoveTab
 from ..tabs.update import UpdateTab
+from .debug_panel import build_debug_panel
 
 
 class RichDisplay(Static):
     def __init__(self, app_state: Any) -> None:
         super().__init__()
         self.app_state = app_state
+        self.base_tab = Tab("base")
+        self.home_tab = HomeTab()
+        self.install_tab = InstallTab()
+        self.update_tab = UpdateTab()
+        self.remove_tab = RemoveTab()
+        self.tabs: Dict[str, Any] = {
+            "Home": self.home_tab,
+            "Install": self.install_tab,
+            "Update": self.update_tab,
+            "Remove": self.remove_tab,
+        }
+        self._active_tab: str = app_state.current_tab
+        self._layout: Layout = self.base_tab.build_layout(self._active_tab)
 
     def render(self) -> RenderableType:
         tab = self.app_state.current_tab
-        layout = Tab("dummy").build_layout(tab)
-        if tab == "Home":
-            layout["body"].update(HomeTab().create_home_panel(self.app_state))
-        elif tab == "Install":
-            layout["body"].update(InstallTab().build_panel(self.app_state))
-        elif tab == "Update":
-            layout["body"].update(UpdateTab().build_panel(self.app_state))
-        elif tab == "Remove":
-            layout["body"].update(RemoveTab().build_panel(self.app_state))
-        layout["tab_bar"].update(Tab("dummy").create_tab_bar(tab))
-        return layout
+        if tab != self._active_tab:
+            self._layout["tab_bar"].update(self.base_tab.create_tab_bar(tab))
+            self._active_tab = tab
+        if self.app_state.show_debug:
+            body: RenderableType = build_debug_panel(tracing.spans(DEBUG_SPANS))
+        else:
+            body = self.tabs[tab].build_panel(self.app_state)
+        self._layout["body"].update(body)
+        return self._layout
@@ -0,0 +1,48 @@
+from typing import Any, Callable, Sequence
+
+from rich.table import Table
+from rich.text import Text
+
+from ..constants import VISIBLE_ROWS
+
+
+def clamp_scroll_offset(
+    selected: int, offset: int, count: int, visible_rows: int = VISIBLE_ROWS
+) -> int:
+    """Return the scroll offset that keeps ``selected`` inside the window."""
+    if selected >= offset + visible_rows:
+        offset = selected - visible_rows + 1
+    elif selected < offset:
+        offset = selected
+    return max(0, min(offset, count - visible_rows))
+
+
+class VirtualList:
+    """
+    Windowed list renderer.
+
+    Only the rows inside ``[offset, offset + visible_rows)`` are built, so the
+    render cost does not depend on the total number of items.
+    """
+
+    def __init__(self, visible_rows: int = VISIBLE_ROWS) -> None:
+        self.visible_rows = visible_rows
+
+    def build_table(
+        self,
+        items: Sequence[Any],
+        offset: int,
+        build_row: Callable[[int, Any], Text],
+    ) -> Table:
+        table = Table.grid(expand=True, padding=(0, 1))
+        table.add_column("Plugin", ratio=1)
+        end = min(len(items), offset + self.visible_rows)
+        for index in range(offset, end):
+            table.add_row(build_row(index, items[index]))
+        return table
+
+    def position_label(self, count: int, offset: int) -> str:
+        if count <= self.visible_rows:
+            return ""
+        end = min(count, offset + self.visible_rows)
+        return f" [{offset + 1}-{end}/{count}]"